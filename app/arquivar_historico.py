@@ -0,0 +1,33 @@
+# app/arquivar_historico.py
+"""
+Arquiva o histórico antigo das OS e apaga entradas órfãs sem abrir a interface.
+
+Uso (a partir de app/):
+    python arquivar_historico.py [--dias N]
+"""
+import argparse
+import sys
+
+from db import init_db
+from controllers.retencao_controller import RETENCAO_DIAS, RetencaoController
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dias", type=int, default=RETENCAO_DIAS,
+                        help=f"idade mínima para arquivar (padrão: {RETENCAO_DIAS}; 0 = só órfãos)")
+    args = parser.parse_args(argv)
+
+    init_db()
+
+    def progresso(feitas, total):
+        print(f"\r{feitas}/{total} entradas", end="", file=sys.stderr, flush=True)
+
+    resumo = RetencaoController(dias=args.dias).executar(progress_cb=progresso)
+    print(file=sys.stderr)
+    print(f"{resumo['arquivadas']} entradas arquivadas; {resumo['orfaos']} órfãs removidas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# app/benchmarks/bench_controllers.py
+"""
+Benchmarks dos métodos públicos de OSController e AuthController (e das
+consultas do painel) sobre o banco para o qual db.engine aponta, normalmente
+um gerado por benchmarks.gerador.
+
+As leituras rodam com o cache de referência vazio (medem o banco, não o
+cache); listar_clientes também é medido com o cache quente. As escritas
+criam e apagam os próprios registros, mas update_os altera OS existentes:
+use um banco descartável.
+"""
+import datetime
+import itertools
+import random
+
+from sqlalchemy import func, select
+
+import db
+from benchmarks.comum import medir
+from benchmarks.gerador import INICIO, SENHA
+from controllers.auth_controller import AuthController
+from controllers.cache import ref_cache
+from controllers.dashboard_controller import DashboardController
+from controllers.os_controller import OSController
+from models.models import Cliente, OrdemServico, OrdemServicoHistorico, User, Veiculo
+
+ADMIN = {"usuario": "admin", "role": "Administrador"}
+
+# período coberto pelos dados gerados
+ANO = (INICIO.date(), INICIO.date() + datetime.timedelta(days=366))
+
+
+def _amostras(rng):
+    with db.get_session() as s:
+        os_ids = s.exec(select(OrdemServico.id)).scalars().all()
+        cliente_ids = s.exec(select(Cliente.id)).scalars().all()
+        veiculo = s.exec(select(Veiculo).limit(1)).scalars().first()
+        # a OS com mais histórico é o pior caso do diálogo
+        os_historico = s.exec(
+            select(OrdemServicoHistorico.ordem_id)
+            .group_by(OrdemServicoHistorico.ordem_id)
+            .order_by(func.count().desc()).limit(1)
+        ).scalar()
+        admin = s.exec(select(User).where(User.username == "admin")).scalars().first()
+    return {
+        "os_ids": rng.sample(os_ids, min(len(os_ids), 200)),
+        "cliente_ids": rng.sample(cliente_ids, min(len(cliente_ids), 200)),
+        "veiculo": veiculo,
+        "os_historico": os_historico,
+        "admin": admin,
+    }
+
+
+def _cache_vazio():
+    """`preparar` de medir: esvazia o cache de referência fora da medição."""
+    ref_cache.clear()
+    return ()
+
+
+def rodar(repeticoes: int = 10, semente: int = 42) -> dict:
+    rng = random.Random(semente)
+    osc = OSController()
+    auth = AuthController()
+    dash = DashboardController()
+    a = _amostras(rng)
+    veiculo = a["veiculo"]
+    seq = itertools.count()
+    os_ids = itertools.cycle(a["os_ids"])
+    cliente_ids = itertools.cycle(a["cliente_ids"])
+    r = {}
+
+    # ---------------- OSController: leituras ----------------
+    r["os.listar_os"] = medir(osc.listar_os, max(repeticoes // 5, 1))
+    r["os.listar_os_grid.primeira_pagina"] = medir(lambda: osc.listar_os_grid(limit=200), repeticoes)
+    pagina = osc.listar_os_grid(limit=200, ordenar_por="valor")
+    chave = osc.chave_pagina_os(pagina[-1], "valor")
+    r["os.listar_os_grid.pagina_seguinte_por_valor"] = medir(
+        lambda: osc.listar_os_grid(after=chave, limit=200, ordenar_por="valor"), repeticoes)
+    r["os.listar_os_grid.filtrada"] = medir(
+        lambda: osc.listar_os_grid(limit=200, filtros={"status": "ABERTA", "valor_min": "1000"}),
+        repeticoes)
+    r["os.buscar_os"] = medir(lambda: osc.buscar_os("embreagem"), repeticoes)
+    r["os.get_os_by_id"] = medir(lambda: osc.get_os_by_id(next(os_ids)), repeticoes)
+    r["os.listar_historico_os"] = medir(lambda: osc.listar_historico_os(a["os_historico"]), repeticoes)
+    r["os.listar_historico_os.pagina"] = medir(
+        lambda: osc.listar_historico_os(a["os_historico"], limit=100), repeticoes)
+    r["os.filtros_escopo_os"] = medir(lambda: osc.filtros_escopo_os("Mecanico", "mecanico0"), repeticoes)
+    r["os.listar_clientes"] = medir(osc.listar_clientes, repeticoes, preparar=_cache_vazio)
+    r["os.listar_clientes.cache"] = medir(osc.listar_clientes, repeticoes)
+
+    def proximo_cliente():
+        ref_cache.clear()
+        return (next(cliente_ids),)
+
+    r["os.listar_veiculos_por_cliente"] = medir(
+        osc.listar_veiculos_por_cliente, repeticoes, preparar=proximo_cliente)
+    r["os.buscar_clientes.nome"] = medir(lambda: osc.buscar_clientes("joao s"), repeticoes)
+    r["os.buscar_clientes.documento"] = medir(lambda: osc.buscar_clientes("123"), repeticoes)
+    r["os.buscar_veiculos.placa"] = medir(lambda: osc.buscar_veiculos("ab"), repeticoes)
+    r["os.find_by_placa"] = medir(lambda: osc.find_by_placa(veiculo.placa.lower()), repeticoes)
+
+    # ---------------- OSController: escritas ----------------
+    r["os.criar_cliente"] = medir(lambda: osc.criar_cliente(f"Bench {next(seq)}"), repeticoes)
+    r["os.delete_cliente"] = medir(
+        lambda c: osc.delete_cliente(c.id), repeticoes,
+        preparar=lambda: (osc.criar_cliente(f"Bench {next(seq)}"),))
+    r["os.criar_veiculo"] = medir(
+        lambda: osc.criar_veiculo(veiculo.cliente_id, f"BEN{next(seq):04d}"), repeticoes)
+    r["os.delete_veiculo"] = medir(
+        lambda v: osc.delete_veiculo(v.id, role="Administrador"), repeticoes,
+        preparar=lambda: (osc.criar_veiculo(veiculo.cliente_id, f"BEN{next(seq):04d}"),))
+    r["os.criar_os"] = medir(
+        lambda: osc.criar_os(veiculo.cliente_id, veiculo.id, "Bench", valor=100, **ADMIN), repeticoes)
+    lote = [{"cliente_id": veiculo.cliente_id, "veiculo_id": veiculo.id, "descricao": "Bench lote"}] * 100
+    r["os.criar_os_batch.100"] = medir(lambda: osc.criar_os_batch(lote, **ADMIN), repeticoes)
+    status = itertools.cycle(["EM ANDAMENTO", "ABERTA"])
+    r["os.update_os"] = medir(
+        lambda: osc.update_os(next(os_ids), status=next(status), **ADMIN), repeticoes)
+    r["os.delete_os"] = medir(
+        lambda o: osc.delete_os(o.id, **ADMIN), repeticoes,
+        preparar=lambda: (osc.criar_os(veiculo.cliente_id, veiculo.id, "Bench", **ADMIN),))
+
+    # ---------------- AuthController ----------------
+    # argon2 é lento de propósito: poucas repetições bastam
+    lentas = max(repeticoes // 5, 1)
+    r["auth.verify_credentials"] = medir(lambda: auth.verify_credentials("admin", SENHA), lentas)
+    r["auth.authenticate"] = medir(lambda: auth.authenticate("admin", SENHA), lentas)
+    r["auth.rehash_password"] = medir(
+        lambda: auth.rehash_password(a["admin"].id, SENHA), lentas)
+    r["auth.register"] = medir(lambda: auth.register(f"bench{next(seq)}", "Bench", SENHA), lentas)
+    r["auth.delete_user"] = medir(
+        lambda u: auth.delete_user(u.id), lentas,
+        preparar=lambda: (auth.register(f"bench{next(seq)}", "Bench", SENHA),))
+    r["auth.list_users"] = medir(auth.list_users, repeticoes)
+    r["auth.list_mecanicos"] = medir(auth.list_mecanicos, repeticoes, preparar=_cache_vazio)
+
+    # ---------------- Painel ----------------
+    r["painel.totais_por_status"] = medir(dash.totais_por_status, repeticoes)
+    r["painel.faturamento_por_mecanico.ano"] = medir(
+        lambda: dash.faturamento_por_mecanico(ANO[0], ANO[1]), repeticoes)
+    return r
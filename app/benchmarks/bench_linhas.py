@@ -0,0 +1,98 @@
+# app/benchmarks/bench_linhas.py
+"""
+Compara, nas listagens, a leitura pelo ORM (select(Model): objetos SQLModel
+completos) com as projeções de models/linhas.py (namedtuple/__slots__
+montadas coluna a coluna): linhas por segundo e bytes por linha mantida
+em memória (tracemalloc).
+
+Uso (a partir de app/, com db.engine apontando para um banco gerado):
+    python -m benchmarks.bench_linhas banco.db [--repeticoes 10]
+Também roda dentro de benchmarks.rodar.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from sqlmodel import select
+
+import db
+from benchmarks.comum import imprimir, medir
+from models.linhas import (
+    ClienteLinha, HistoricoLinha, OSLinha, UsuarioLinha, VeiculoLinha, carregar, selecionar,
+)
+from models.models import Cliente, OrdemServico, OrdemServicoHistorico, User, Veiculo
+
+# lista -> (model, linha)
+LISTAS = {
+    "os": (OrdemServico, OSLinha),
+    "clientes": (Cliente, ClienteLinha),
+    "veiculos": (Veiculo, VeiculoLinha),
+    "usuarios": (User, UsuarioLinha),
+    "historico": (OrdemServicoHistorico, HistoricoLinha),
+}
+
+
+def _orm(model):
+    with db.get_session() as s:
+        return s.exec(select(model)).all()
+
+
+def _projecao(model, linha):
+    with db.get_session() as s:
+        return carregar(s, linha, selecionar(linha, model))
+
+
+def _bytes_por_linha(fn) -> float:
+    """Memória ainda alocada pelo resultado de `fn()` (por linha), depois da sessão fechada."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        linhas = fn()
+        gc.collect()
+        depois = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (depois - antes) / max(len(linhas), 1)
+
+
+def rodar(repeticoes: int = 10) -> dict:
+    r = {}
+    for nome, (model, linha) in LISTAS.items():
+        caminhos = {
+            "orm": lambda m=model: _orm(m),
+            "projecao": lambda m=model, l=linha: _projecao(m, l),
+        }
+        for caminho, fn in caminhos.items():
+            n = len(fn())
+            res = medir(fn, repeticoes)
+            res["linhas"] = n
+            res["linhas_por_s"] = n / (res["mediana_ms"] / 1000) if res["mediana_ms"] else 0.0
+            res["bytes_por_linha"] = _bytes_por_linha(fn)
+            r[f"linhas.{nome}.{caminho}"] = res
+    return r
+
+
+def imprimir_comparacao(resultados: dict):
+    print(f"{'lista':<12}{'orm linhas/s':>15}{'proj. linhas/s':>16}{'orm B/linha':>13}{'proj. B/linha':>15}")
+    for nome in LISTAS:
+        orm, proj = resultados[f"linhas.{nome}.orm"], resultados[f"linhas.{nome}.projecao"]
+        print(f"{nome:<12}{orm['linhas_por_s']:>15,.0f}{proj['linhas_por_s']:>16,.0f}"
+              f"{orm['bytes_por_linha']:>13,.0f}{proj['bytes_por_linha']:>15,.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("banco")
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    db.engine = db.build_engine(f"sqlite:///{args.banco}")
+    resultados = rodar(args.repeticoes)
+    imprimir(resultados)
+    print()
+    imprimir_comparacao(resultados)
+
+
+if __name__ == "__main__":
+    main()
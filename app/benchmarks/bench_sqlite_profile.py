@@ -0,0 +1,74 @@
+# app/benchmarks/bench_sqlite_profile.py
+"""
+Compara o SQLite "de fábrica" (journal DELETE, synchronous FULL, sem cache
+extra) com o perfil de db.SQLITE_PRAGMAS em criar_os (escrita, um commit por
+ordem) e listar_os (leitura).
+
+Uso (a partir de app/):
+    python -m benchmarks.bench_sqlite_profile [--ordens 500] [--leituras 20]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import db
+from controllers.os_controller import OSController
+
+PERFIS = {
+    "padrao": {},
+    "otimizado": db.SQLITE_PRAGMAS,
+}
+
+
+def _rodar_perfil(nome, pragmas, n_ordens, n_leituras, pasta):
+    path = os.path.join(pasta, f"bench_{nome}.db")
+    db.engine = db.build_engine(f"sqlite:///{path}", pragmas=pragmas)
+    db.init_db()
+
+    ctrl = OSController()
+    c = ctrl.criar_cliente("Cliente Benchmark")
+    v = ctrl.criar_veiculo(c.id, "BEN0001")
+
+    t0 = time.perf_counter()
+    for i in range(n_ordens):
+        ctrl.criar_os(c.id, v.id, f"Ordem {i}", valor=100.0,
+                      usuario="bench", role="Administrador")
+    escrita = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(n_leituras):
+        ctrl.listar_os()
+    leitura = time.perf_counter() - t0
+
+    db.engine.dispose()
+    return {
+        "perfil": nome,
+        "criar_os_por_s": n_ordens / escrita,
+        "listar_os_por_s": n_leituras / leitura,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ordens", type=int, default=500)
+    parser.add_argument("--leituras", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        resultados = [
+            _rodar_perfil(nome, pragmas, args.ordens, args.leituras, pasta)
+            for nome, pragmas in PERFIS.items()
+        ]
+
+    print(f"{'perfil':<12}{'criar_os/s':>14}{'listar_os/s':>14}")
+    for r in resultados:
+        print(f"{r['perfil']:<12}{r['criar_os_por_s']:>14.1f}{r['listar_os_por_s']:>14.1f}")
+    base, otim = resultados
+    print(f"\nescrita: {otim['criar_os_por_s'] / base['criar_os_por_s']:.1f}x  "
+          f"leitura: {otim['listar_os_por_s'] / base['listar_os_por_s']:.1f}x")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
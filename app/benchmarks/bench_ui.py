@@ -0,0 +1,137 @@
+# app/benchmarks/bench_ui.py
+"""
+Benchmarks da interface sem tela (QT_QPA_PLATFORM=offscreen): MainWindow
+e OSHistoryDialog sobre o banco para o qual db.engine aponta, e o
+OSTableModel com uma grade de 100 mil linhas.
+
+Os carregamentos rodam no QThreadPool (views/workers.py); cada medição vai
+da chamada até o runner da janela ficar ocioso com os dados já na view.
+"""
+import itertools
+import os
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+from sqlalchemy import func, select
+
+import db
+from benchmarks.comum import medir
+from controllers.cache import ref_cache
+from models.models import OrdemServicoHistorico, User
+from views.main_window import MainWindow
+from views.os_history_dialog import OSHistoryDialog
+from views.table_models import OSTableModel
+
+# linhas da grade grande (as do banco repetidas com ids novos)
+LINHAS_GRADE = 100_000
+
+
+def _esperar(app, runner, timeout: float = 120.0):
+    """Processa eventos até `runner` não ter tarefas (resultados entregues)."""
+    limite = time.perf_counter() + timeout
+    app.processEvents()
+    while runner.busy:
+        if time.perf_counter() > limite:
+            raise TimeoutError("tarefa da interface não terminou")
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def rodar(repeticoes: int = 10) -> dict:
+    app = QApplication.instance() or QApplication([])
+    with db.get_session() as s:
+        admin = s.exec(select(User).where(User.username == "admin")).scalars().first()
+        os_historico = s.exec(
+            select(OrdemServicoHistorico.ordem_id)
+            .group_by(OrdemServicoHistorico.ordem_id)
+            .order_by(func.count().desc()).limit(1)
+        ).scalar()
+
+    # a retenção do histórico não deve disparar no meio das medições
+    MainWindow.RETENCAO_ATRASO_MS = 24 * 3600 * 1000
+    r = {}
+    janelas = []
+
+    def abrir():
+        ref_cache.clear()
+        janela = MainWindow(user=admin)
+        _esperar(app, janela.runner)
+        janelas.append(janela)
+
+    r["main_window.abrir"] = medir(abrir, max(repeticoes // 5, 1))
+    janela = janelas[-1]
+
+    def load_os_list():
+        # força a carga do zero em vez do refresh incremental
+        janela._os_consulta = None
+        janela.load_os_list()
+        _esperar(app, janela.runner)
+
+    def refresh_os_list():
+        janela.load_os_list()
+        _esperar(app, janela.runner)
+
+    def load_vehicles_list():
+        ref_cache.clear()
+        janela.load_vehicles_list()
+        _esperar(app, janela.runner)
+
+    r["main_window.load_os_list"] = medir(load_os_list, repeticoes)
+    r["main_window.load_os_list.refresh"] = medir(refresh_os_list, repeticoes)
+    r["main_window.load_vehicles_list"] = medir(load_vehicles_list, repeticoes)
+
+    # o que export_os faz depois do diálogo de arquivo (que não abre sem tela)
+    with tempfile.TemporaryDirectory() as pasta:
+        destino = os.path.join(pasta, "ordens.csv")
+        r["main_window.export_os.csv"] = medir(
+            lambda: janela.export_controller.exportar_os(destino, "csv"), max(repeticoes // 5, 1))
+
+    def historico():
+        dlg = OSHistoryDialog(os_historico)
+        _esperar(app, dlg.runner)
+        dlg.done(0)
+        dlg.deleteLater()
+
+    r["os_history_dialog.abrir"] = medir(historico, repeticoes)
+
+    # model da grade com muitas linhas: carga e uma tela de células pintadas
+    base = janela.controller.listar_os_grid(limit=1000)
+    linhas = [{**row, "id": n} for n, row in
+              enumerate(itertools.islice(itertools.cycle(base), LINHAS_GRADE))]
+    r["os_table_model.set_rows.100k"] = medir(
+        lambda: OSTableModel().set_rows(linhas), max(repeticoes // 5, 1))
+    model = OSTableModel()
+    model.set_rows(linhas)
+    tela = [model.index(row, col) for row in range(LINHAS_GRADE // 2, LINHAS_GRADE // 2 + 40)
+            for col in range(model.columnCount())]
+    papeis = [int(p) for p in (Qt.DisplayRole, Qt.FontRole, Qt.ForegroundRole,
+                               Qt.BackgroundRole, Qt.TextAlignmentRole, Qt.DecorationRole)]
+
+    def pintar_tela():
+        for idx in tela:
+            for papel in papeis:
+                model.data(idx, papel)
+
+    r["os_table_model.data.tela"] = medir(pintar_tela, repeticoes)
+
+    # a mesma carga na grade visível (OSTableView no modo de tabela grande)
+    janela.show()
+    _esperar(app, janela.runner)
+
+    def grade_visivel():
+        janela.os_model.set_rows([])
+        app.processEvents()
+        janela.os_model.set_rows(linhas)
+        app.processEvents()
+
+    r["main_window.os_table.set_rows.100k"] = medir(grade_visivel, max(repeticoes // 5, 1))
+
+    for j in janelas:
+        j.close()
+        j.deleteLater()
+    app.processEvents()
+    return r
@@ -0,0 +1,49 @@
+# app/benchmarks/comparar.py
+"""
+Compara dois resultados de benchmarks.rodar pela mediana de cada benchmark.
+
+Uso (a partir de app/):
+    python -m benchmarks.comparar antes.json depois.json [--limite 1.2]
+Sai com código 1 se algum benchmark ficou mais lento que `limite` vezes o anterior.
+"""
+import argparse
+import sys
+
+from benchmarks.comum import carregar
+
+
+def comparar(antes: dict, depois: dict, limite: float = 1.2) -> list[str]:
+    """Imprime a tabela e devolve os nomes que pioraram além de `limite`."""
+    a, d = antes["resultados"], depois["resultados"]
+    nomes = [n for n in a if n in d]
+    largura = max((len(n) for n in nomes), default=10)
+    print(f"{'benchmark':<{largura}}{'antes ms':>12}{'depois ms':>12}{'razão':>9}")
+    piores = []
+    for n in nomes:
+        ma, md = a[n]["mediana_ms"], d[n]["mediana_ms"]
+        razao = md / ma if ma else float("inf") if md else 1.0
+        marca = ""
+        if razao > limite:
+            marca = "  <-- mais lento"
+            piores.append(n)
+        elif razao < 1 / limite:
+            marca = "  mais rápido"
+        print(f"{n:<{largura}}{ma:>12.2f}{md:>12.2f}{razao:>8.2f}x{marca}")
+    for n in sorted(set(a) ^ set(d)):
+        print(f"{n}: só em {'antes' if n in a else 'depois'}")
+    return piores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("antes")
+    parser.add_argument("depois")
+    parser.add_argument("--limite", type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    piores = comparar(carregar(args.antes), carregar(args.depois), args.limite)
+    return 1 if piores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# app/benchmarks/comum.py
+"""Medição e gravação dos resultados dos benchmarks (JSON comparável entre execuções)."""
+import datetime
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+
+def medir(fn, repeticoes: int = 10, preparar=None, aquecer: bool = True) -> dict:
+    """
+    Executa `fn(*preparar())` `repeticoes` vezes e devolve as estatísticas em
+    ms. `preparar` (fora da medição) monta os argumentos de cada chamada;
+    com `aquecer`, uma chamada extra antes não entra na conta.
+    """
+    if aquecer:
+        fn(*(preparar() if preparar else ()))
+    tempos = []
+    for _ in range(repeticoes):
+        args = preparar() if preparar else ()
+        t0 = time.perf_counter()
+        fn(*args)
+        tempos.append((time.perf_counter() - t0) * 1000)
+    return {
+        "n": repeticoes,
+        "min_ms": min(tempos),
+        "mediana_ms": statistics.median(tempos),
+        "media_ms": statistics.fmean(tempos),
+        "max_ms": max(tempos),
+    }
+
+
+def _commit_git() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadados(**parametros) -> dict:
+    return {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_git(),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "parametros": parametros,
+    }
+
+
+def salvar(path: str, meta: dict, resultados: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "resultados": resultados}, f, ensure_ascii=False, indent=2)
+
+
+def carregar(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def imprimir(resultados: dict):
+    largura = max((len(nome) for nome in resultados), default=10)
+    print(f"{'benchmark':<{largura}}{'mediana ms':>12}{'min ms':>10}{'max ms':>10}")
+    for nome, r in resultados.items():
+        print(f"{nome:<{largura}}{r['mediana_ms']:>12.2f}{r['min_ms']:>10.2f}{r['max_ms']:>10.2f}")
@@ -0,0 +1,200 @@
+# app/benchmarks/gerador.py
+"""
+Gerador de bancos sintéticos para os benchmarks.
+
+Com a mesma semente e os mesmos tamanhos, gera sempre os mesmos dados:
+usuários, clientes, veículos, OS e histórico (CRIACAO com a foto completa e
+ATUALIZACAO com deltas, como OSController grava). Tudo entra pelos models de
+models/models.py com INSERTs em lote, então os gatilhos (FTS, resumo_os)
+rodam como em produção.
+
+Uso (a partir de app/):
+    python -m benchmarks.gerador destino.db [--tamanho medio] [--semente 42]
+"""
+import argparse
+import datetime
+import os
+import random
+
+from sqlalchemy import insert, select, update
+
+import db
+from controllers.auth_controller import pwd_context
+from controllers.normalizacao import chave_busca
+from models.models import (
+    Cliente, OrdemServico, OrdemServicoHistorico, Sequencia, User, Veiculo,
+)
+
+TAMANHOS = {
+    "pequeno": {"clientes": 200, "veiculos_por_cliente": 2, "ordens": 2_000,
+                "edicoes_por_ordem": 3, "mecanicos": 5},
+    "medio": {"clientes": 2_000, "veiculos_por_cliente": 2, "ordens": 20_000,
+              "edicoes_por_ordem": 4, "mecanicos": 15},
+    "grande": {"clientes": 20_000, "veiculos_por_cliente": 2, "ordens": 200_000,
+               "edicoes_por_ordem": 5, "mecanicos": 40},
+}
+
+# senha de todos os usuários gerados
+SENHA = "bench"
+
+# as datas partem daqui (e não de "agora") para a base ser reproduzível
+INICIO = datetime.datetime(2024, 1, 1, 8, 0)
+
+# os mesmos da interface (combos de status da janela principal e de EditOSDialog)
+STATUS = ["ABERTA", "EM ANDAMENTO", "CONCLUIDA"]
+PRIORIDADES = ["BAIXA", "MEDIA", "ALTA"]
+SERVICOS = [
+    "Troca de óleo e filtro", "Revisão dos freios", "Alinhamento e balanceamento",
+    "Troca da embreagem", "Diagnóstico de injeção eletrônica", "Troca de pastilhas",
+    "Revisão da suspensão", "Recarga do ar-condicionado", "Troca da correia dentada",
+]
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Hugo", "Íris", "João"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Costa", "Ribeiro"]
+MODELOS = [("Fiat", "Uno"), ("VW", "Gol"), ("Chevrolet", "Onix"), ("Toyota", "Corolla"),
+           ("Honda", "Civic"), ("Renault", "Sandero"), ("Hyundai", "HB20")]
+
+# linhas por executemany
+LOTE = 5_000
+
+
+def _cpf(rng) -> str:
+    base = [rng.randrange(10) for _ in range(9)]
+    for n in (10, 11):
+        resto = sum(d * p for d, p in zip(base, range(n, 1, -1))) % 11
+        base.append(0 if resto < 2 else 11 - resto)
+    return "".join(map(str, base))
+
+
+def _placa(i: int) -> str:
+    # ABC1D23 (Mercosul), única por i
+    letras = ""
+    for _ in range(4):
+        i, r = divmod(i, 26)
+        letras += chr(ord("A") + r)
+    return f"{letras[:3]}{i % 10}{letras[3]}{(i // 10) % 100:02d}"
+
+
+def _inserir(s, model, linhas, chave=None):
+    """
+    INSERTs em lote (executemany, sem RETURNING: com sort_by_parameter_order
+    o SQLite faria um INSERT por linha). Com `chave` (coluna única), devolve
+    os ids na ordem de `linhas`, lidos de volta por essa coluna.
+    """
+    ids = []
+    for n in range(0, len(linhas), LOTE):
+        parte = linhas[n:n + LOTE]
+        s.exec(insert(model), params=parte)
+        if chave is not None:
+            valores = [l[chave.key] for l in parte]
+            por_chave = dict(s.exec(select(chave, model.id).where(chave.in_(valores))).all())
+            ids += [por_chave[v] for v in valores]
+    return ids
+
+
+def gerar_base(url: str, clientes: int, veiculos_por_cliente: int, ordens: int,
+               edicoes_por_ordem: int, mecanicos: int, semente: int = 42) -> dict:
+    """
+    Cria o banco em `url` (que deve estar vazio) e o preenche. Troca
+    db.engine pelo do banco gerado. Retorna as quantidades inseridas.
+    """
+    rng = random.Random(semente)
+    db.engine = db.build_engine(url)
+    db.init_db()
+
+    # um hash só: argon2 é lento de propósito
+    hash_senha = pwd_context.hash(SENHA)
+    usuarios = [{"username": "admin", "nome": "Administrador", "password_hash": hash_senha,
+                 "role": "Administrador"},
+                {"username": "gerente", "nome": "Gerente", "password_hash": hash_senha,
+                 "role": "Gerente"}]
+    usuarios += [{"username": f"mecanico{i}", "nome": f"Mecânico {i}",
+                  "password_hash": hash_senha, "role": "Mecanico"} for i in range(mecanicos)]
+    nomes_mecanicos = [u["username"] for u in usuarios[2:]]
+
+    with db.get_session() as s:
+        _inserir(s, User, usuarios)
+
+        linhas, documentos = [], set()
+        for i in range(clientes):
+            # mesma ordem de sorteios de sempre: bancos de uma semente não mudam
+            nome = f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {i}"
+            documento = _cpf(rng)
+            # Cliente.documento_norm é único: sorteia de novo só se repetir
+            while documento in documentos:
+                documento = _cpf(rng)
+            documentos.add(documento)
+            linhas.append({"nome": nome, "nome_busca": chave_busca(nome), "documento": documento,
+                           "documento_norm": documento,
+                           "telefone": f"11{rng.randrange(10**8, 10**9)}",
+                           "email": f"cliente{i}@exemplo.com"})
+        cliente_ids = _inserir(s, Cliente, linhas, chave=Cliente.documento_norm)
+
+        veiculos = []
+        for cliente_id in cliente_ids:
+            for _ in range(veiculos_por_cliente):
+                marca, modelo = rng.choice(MODELOS)
+                placa = _placa(len(veiculos))
+                veiculos.append({"placa": placa, "placa_norm": placa, "marca": marca, "modelo": modelo,
+                                 "ano": rng.randrange(2000, 2025), "cliente_id": cliente_id})
+        veiculo_ids = _inserir(s, Veiculo, veiculos, chave=Veiculo.placa_norm)
+        dono = {vid: v["cliente_id"] for vid, v in zip(veiculo_ids, veiculos)}
+
+        # cada OS nasce com um estado e recebe deltas de status/valor, como
+        # em update_os; a OS é gravada já com o estado final
+        linhas_os, historicos = [], []
+        for i in range(ordens):
+            veiculo_id = rng.choice(veiculo_ids)
+            inicial = {
+                "status": "ABERTA",
+                "prioridade": rng.choice(PRIORIDADES),
+                "mecanico": rng.choice(nomes_mecanicos) if nomes_mecanicos and rng.random() < 0.9 else None,
+                "valor_centavos": rng.randrange(5_000, 500_000),
+                "descricao": f"{rng.choice(SERVICOS)} — {rng.choice(SERVICOS).lower()}",
+            }
+            data = INICIO + datetime.timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+            entradas = [{"usuario": "admin", "acao": "CRIACAO", "data": data,
+                         "alteracoes": None, **inicial}]
+            atual = dict(inicial)
+            for _ in range(rng.randrange(0, edicoes_por_ordem + 1)):
+                data += datetime.timedelta(hours=rng.randrange(1, 72))
+                novo = rng.choice([st for st in STATUS if st != atual["status"]])
+                alteracoes = {"status": [atual["status"], novo]}
+                if rng.random() < 0.3:
+                    valor = max(atual["valor_centavos"] + rng.randrange(-2_000, 10_000), 0)
+                    alteracoes["valor_centavos"] = [atual["valor_centavos"], valor]
+                for campo, (_, valor) in alteracoes.items():
+                    atual[campo] = valor
+                entradas.append({"usuario": "admin", "acao": "ATUALIZACAO", "data": data,
+                                 "alteracoes": alteracoes, **dict.fromkeys(inicial)})
+            linhas_os.append({"codigo": f"OS-{i + 1:06d}", "aberta_em": entradas[0]["data"],
+                              "cliente_id": dono[veiculo_id], "veiculo_id": veiculo_id, **atual})
+            historicos.append(entradas)
+        os_ids = _inserir(s, OrdemServico, linhas_os, chave=OrdemServico.codigo)
+
+        historico = [{"ordem_id": os_id, **e}
+                     for os_id, entradas in zip(os_ids, historicos) for e in entradas]
+        _inserir(s, OrdemServicoHistorico, historico)
+
+        s.exec(update(Sequencia).where(Sequencia.nome == "os_codigo").values(valor=ordens))
+        s.commit()
+
+    return {"usuarios": len(usuarios), "clientes": len(cliente_ids), "veiculos": len(veiculo_ids),
+            "ordens": len(os_ids), "historico": len(historico)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("destino", help="arquivo .db (não pode existir)")
+    parser.add_argument("--tamanho", choices=TAMANHOS, default="medio")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args(argv)
+    if os.path.exists(args.destino):
+        parser.error(f"{args.destino} já existe")
+
+    contagem = gerar_base(f"sqlite:///{args.destino}", semente=args.semente, **TAMANHOS[args.tamanho])
+    print(", ".join(f"{v} {k}" for k, v in contagem.items()))
+    return contagem
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# app/benchmarks/rodar.py
+"""
+Roda a suíte de benchmarks e grava os resultados em JSON.
+
+Gera um banco sintético (benchmarks.gerador) em uma pasta temporária, ou usa
+uma cópia de --base, mede os controllers, as listagens (ORM x projeções,
+benchmarks.bench_linhas) e, se o PySide6 estiver disponível, a interface
+sem tela. Compare duas execuções com
+benchmarks.comparar.
+
+Uso (a partir de app/):
+    python -m benchmarks.rodar [--tamanho medio] [--semente 42] [--repeticoes 10]
+                               [--base banco.db] [--sem-ui] [--saida resultados.json]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import db
+from benchmarks import bench_controllers, bench_linhas
+from benchmarks.comum import imprimir, metadados, salvar
+from benchmarks.gerador import TAMANHOS, gerar_base
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanho", choices=TAMANHOS, default="medio")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--base", help="banco já gerado (é copiado; o original não muda)")
+    parser.add_argument("--sem-ui", action="store_true", help="só os controllers")
+    parser.add_argument("--saida", default="resultados_benchmark.json")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        path = os.path.join(pasta, "bench.db")
+        if args.base:
+            shutil.copyfile(args.base, path)
+            db.engine = db.build_engine(f"sqlite:///{path}")
+            db.init_db()
+            contagem = None
+        else:
+            contagem = gerar_base(f"sqlite:///{path}", semente=args.semente, **TAMANHOS[args.tamanho])
+
+        resultados = bench_controllers.rodar(args.repeticoes, args.semente)
+        resultados.update(bench_linhas.rodar(args.repeticoes))
+        if not args.sem_ui:
+            try:
+                from benchmarks import bench_ui
+            except ImportError as ex:
+                print(f"Interface não medida: {ex}")
+            else:
+                resultados.update(bench_ui.rodar(args.repeticoes))
+        db.engine.dispose()
+
+    meta = metadados(tamanho=None if args.base else args.tamanho, base=args.base,
+                     semente=args.semente, repeticoes=args.repeticoes, contagem=contagem)
+    salvar(args.saida, meta, resultados)
+    imprimir(resultados)
+    print()
+    bench_linhas.imprimir_comparacao(resultados)
+    print(f"\nResultados em {args.saida}")
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# app/benchmarks/verificar_consultas.py
+"""
+Verifica o número de comandos SQL e os planos de consulta dos controllers e
+das cargas da interface.
+
+Cada verificação roda uma chamada sobre um banco sintético
+(benchmarks.gerador) com o cache de referência vazio. Ela falha se:
+  - a chamada emitir mais comandos que o limite; uma consulta por linha
+    (N+1) estoura o limite em qualquer tamanho de banco;
+  - em uma consulta quente, o EXPLAIN QUERY PLAN de algum SELECT mostrar
+    SCAN sem índice em uma tabela grande.
+
+Uso (a partir de app/):
+    python -m benchmarks.verificar_consultas [--tamanho pequeno] [--semente 42]
+                                             [--base banco.db] [--sem-ui]
+Sai com código 1 se alguma verificação falhar.
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+from sqlalchemy import func, select
+
+import db
+from benchmarks.gerador import INICIO, SENHA, TAMANHOS, gerar_base
+from controllers.auth_controller import AuthController
+from controllers.cache import ref_cache
+from controllers.dashboard_controller import DashboardController
+from controllers.export_controller import ExportController
+from controllers.os_controller import OSController
+from instrumentacao import capturar, normalizar_sql
+from models.models import Cliente, OrdemServico, OrdemServicoHistorico, User, Veiculo
+
+# tabelas que crescem com o uso; SCAN nelas (sem índice) é regressão
+TABELAS_GRANDES = {"ordemservico", "ordemservicohistorico", "veiculo", "cliente"}
+
+_SCAN = re.compile(r"^SCAN (\w+)(.*)$")
+
+ADMIN = {"usuario": "admin", "role": "Administrador"}
+
+
+def plano(sql: str, parametros) -> list[str]:
+    """Linhas de detalhe do EXPLAIN QUERY PLAN de `sql`."""
+    with db.engine.connect() as conn:
+        linhas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parametros).all()
+    return [r[-1] for r in linhas]
+
+
+def varreduras(detalhes: list[str]) -> list[str]:
+    """Os passos do plano que percorrem uma tabela grande inteira sem índice."""
+    ruins = []
+    for d in detalhes:
+        m = _SCAN.match(d)
+        if m and m.group(1) in TABELAS_GRANDES and "USING" not in m.group(2):
+            ruins.append(d)
+    return ruins
+
+
+def verificar(nome: str, fn, limite: int, checar_plano: bool = False) -> list[str]:
+    """Roda `fn` e devolve as falhas encontradas (vazia se passou)."""
+    ref_cache.clear()
+    with capturar(db.engine) as comandos:
+        fn()
+    falhas = []
+    if len(comandos) > limite:
+        falhas.append(f"{len(comandos)} comandos (limite {limite})")
+    if checar_plano:
+        vistos = set()
+        for sql, parametros in comandos:
+            if not sql.lstrip().upper().startswith("SELECT") or sql in vistos:
+                continue
+            vistos.add(sql)
+            for passo in varreduras(plano(sql, parametros)):
+                falhas.append(f"{passo}: {normalizar_sql(sql)[:120]}")
+    status = "ok" if not falhas else "FALHOU"
+    print(f"{nome:<45}{len(comandos):>4}/{limite:<4} {status}")
+    for f in falhas:
+        print(f"    {f}")
+    return falhas
+
+
+def verificacoes_controllers() -> list[tuple]:
+    """(nome, fn, limite de comandos, checar plano)"""
+    osc = OSController()
+    auth = AuthController()
+    dash = DashboardController()
+    with db.get_session() as s:
+        ordem = s.exec(
+            select(OrdemServicoHistorico.ordem_id)
+            .group_by(OrdemServicoHistorico.ordem_id)
+            .order_by(func.count().desc()).limit(1)
+        ).scalar()
+        osr = s.get(OrdemServico, ordem)
+        mecanico = s.exec(
+            select(User.username).where(User.role == "Mecanico").limit(1)
+        ).scalar()
+        placa = s.get(Veiculo, osr.veiculo_id).placa
+        documento = s.get(Cliente, osr.cliente_id).documento
+    cliente_id, veiculo_id = osr.cliente_id, osr.veiculo_id
+    pagina = osc.listar_historico_os(ordem, limit=5)
+    chave_historico = osc.chave_pagina_historico(pagina[-1])
+    lote = [{"cliente_id": cliente_id, "veiculo_id": veiculo_id, "descricao": "Verificação"}] * 50
+    ano = (INICIO, INICIO.replace(year=INICIO.year + 1))
+
+    def exportar():
+        with tempfile.TemporaryDirectory() as pasta:
+            ExportController().exportar_os(os.path.join(pasta, "ordens.csv"))
+
+    return [
+        ("os.listar_os_grid", lambda: osc.listar_os_grid(limit=200), 1, True),
+        ("os.listar_os_grid.por_cliente",
+         lambda: osc.listar_os_grid(limit=200, filtros={"cliente_id": cliente_id}), 1, True),
+        ("os.listar_os_grid.por_nome_cliente",
+         lambda: osc.listar_os_grid(limit=200, filtros={"cliente": "João"}), 1, True),
+        ("os.listar_os_grid.por_mecanico",
+         lambda: osc.listar_os_grid(limit=200, filtros={"mecanico": mecanico}), 1, True),
+        ("os.listar_os_grid.por_status",
+         lambda: osc.listar_os_grid(limit=200, filtros={"status": "ABERTA"}), 1, True),
+        ("os.buscar_os", lambda: osc.buscar_os("embreagem"), 1, True),
+        ("os.get_os_by_id", lambda: osc.get_os_by_id(ordem), 1, True),
+        ("os.listar_historico_os", lambda: osc.listar_historico_os(ordem), 2, True),
+        ("os.listar_historico_os.primeira_pagina",
+         lambda: osc.listar_historico_os(ordem, limit=100), 2, True),
+        ("os.listar_historico_os.pagina_seguinte",
+         lambda: osc.listar_historico_os(ordem, after=chave_historico, limit=100), 1, True),
+        ("os.listar_clientes", osc.listar_clientes, 1),
+        ("os.listar_veiculos_por_cliente", lambda: osc.listar_veiculos_por_cliente(cliente_id), 1, True),
+        ("os.listar_veiculos", osc.listar_veiculos, 1),
+        ("os.buscar_clientes.nome", lambda: osc.buscar_clientes("joao s"), 1, True),
+        ("os.buscar_clientes.documento", lambda: osc.buscar_clientes("123.4"), 1, True),
+        ("os.buscar_clientes.placa", lambda: osc.buscar_clientes("ab"), 1, True),
+        ("os.buscar_veiculos.placa", lambda: osc.buscar_veiculos("ab"), 1, True),
+        ("os.buscar_veiculos.do_cliente", lambda: osc.buscar_veiculos(cliente_id=cliente_id), 1, True),
+        ("os.find_by_placa", lambda: osc.find_by_placa(placa.lower()), 1, True),
+        ("os.find_by_documento", lambda: osc.find_by_documento(documento), 1, True),
+        ("os.update_os", lambda: osc.update_os(ordem, prioridade="ALTA", **ADMIN), 4),
+        ("os.criar_os_batch.50", lambda: osc.criar_os_batch(lote, **ADMIN), 4),
+        ("export.exportar_os.csv", exportar, 2),
+        ("painel.totais_por_status", dash.totais_por_status, 1),
+        ("painel.faturamento_por_mecanico", lambda: dash.faturamento_por_mecanico(*ano), 1),
+        ("auth.verify_credentials", lambda: auth.verify_credentials("admin", SENHA), 1),
+        ("auth.list_mecanicos", auth.list_mecanicos, 1, True),
+    ]
+
+
+def verificacoes_ui() -> list[tuple]:
+    """Cargas da interface sem tela: da chamada até o runner da janela ficar ocioso."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from benchmarks.bench_ui import _esperar
+    from views.main_window import MainWindow
+    from views.os_history_dialog import OSHistoryDialog
+
+    app = QApplication.instance() or QApplication([])
+    with db.get_session() as s:
+        admin = s.exec(select(User).where(User.username == "admin")).scalars().first()
+        ordem = s.exec(select(func.max(OrdemServicoHistorico.ordem_id))).scalar()
+    MainWindow.RETENCAO_ATRASO_MS = 24 * 3600 * 1000
+    janela = MainWindow(user=admin)
+    _esperar(app, janela.runner)
+
+    def load_os_list():
+        janela._os_consulta = None
+        janela.load_os_list()
+        _esperar(app, janela.runner)
+
+    def load_vehicles_list():
+        janela.load_vehicles_list()
+        _esperar(app, janela.runner)
+
+    def historico():
+        dlg = OSHistoryDialog(ordem)
+        _esperar(app, dlg.runner)
+        dlg.done(0)
+        dlg.deleteLater()
+
+    return [
+        ("main_window.load_os_list", load_os_list, 1, True),
+        ("main_window.load_vehicles_list", load_vehicles_list, 1),
+        ("os_history_dialog.abrir", historico, 2, True),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanho", choices=TAMANHOS, default="pequeno")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--base", help="banco já gerado (é copiado; o original não muda)")
+    parser.add_argument("--sem-ui", action="store_true", help="só os controllers")
+    args = parser.parse_args(argv)
+
+    falhas = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        path = os.path.join(pasta, "verificacao.db")
+        if args.base:
+            shutil.copyfile(args.base, path)
+            db.engine = db.build_engine(f"sqlite:///{path}")
+            db.init_db()
+        else:
+            gerar_base(f"sqlite:///{path}", semente=args.semente, **TAMANHOS[args.tamanho])
+
+        verificacoes = verificacoes_controllers()
+        if not args.sem_ui:
+            try:
+                verificacoes += verificacoes_ui()
+            except ImportError as ex:
+                print(f"Interface não verificada: {ex}")
+        for nome, fn, limite, *plano_ in verificacoes:
+            falhas += bool(verificar(nome, fn, limite, *plano_))
+        db.engine.dispose()
+
+    print(f"\n{falhas} verificações falharam" if falhas else "\nTodas as verificações passaram")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
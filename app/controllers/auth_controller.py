@@ -1,9 +1,14 @@
+from collections import namedtuple
+
 from sqlmodel import select
 from passlib.context import CryptContext
 from passlib.exc import UnknownHashError
 from passlib.hash import bcrypt, bcrypt_sha256
 from db import get_session
+from instrumentacao import instrumentar
+from controllers.cache import ref_cache
 from models.models import User
+from models.linhas import UsuarioLinha, carregar, selecionar
 
 # Permite autenticar hashes antigos e gerar novos seguros
 pwd_context = CryptContext(
@@ -14,7 +19,11 @@ pwd_context = CryptContext(
     argon2__parallelism=4
 )
 
+# o que os combos precisam de um mecânico (sem o hash da senha)
+Mecanico = namedtuple("Mecanico", "id username nome")
+
 
+@instrumentar
 class AuthController:
     def __init__(self):
         pass
@@ -37,6 +46,7 @@ class AuthController:
             s.add(user)
             s.commit()
             s.refresh(user)
+            ref_cache.invalidate("mecanicos")
             return user
 
     # ----------------------------------------------
@@ -44,16 +54,27 @@ class AuthController:
     # ----------------------------------------------
     def authenticate(self, username: str, password: str):
         """
-        Tenta autenticar o usuário:
-        1) tenta verificar com pwd_context (padrão: bcrypt_sha256/bcrypt)
+        Autentica e, se necessário, já regrava o hash (ver verify_credentials
+        e rehash_password). Quem não quer esperar pelo re-hash (ex.: a tela de
+        login) deve chamar os dois passos separadamente.
+        """
+        user, needs_rehash = self.verify_credentials(username, password)
+        if user is not None and needs_rehash:
+            self.rehash_password(user.id, password, user.password_hash)
+        return user
+
+    def verify_credentials(self, username: str, password: str):
+        """
+        Verifica a senha sem gravar nada no banco:
+        1) tenta verificar com pwd_context (padrão: argon2)
         2) se UnknownHashError, tenta bcrypt_sha256 e bcrypt explicitamente
         3) como último recurso, compara plaintext (apenas para recuperação)
-        Em caso de sucesso, re-hash com pwd_context e atualiza o DB.
+        Retorna (user, precisa_rehash) em caso de sucesso ou (None, False).
         """
         with get_session() as s:
             user = s.exec(select(User).where(User.username == username)).first()
             if not user:
-                return None
+                return None, False
 
             ph = getattr(user, "password_hash", None) or ""
 
@@ -61,54 +82,73 @@ class AuthController:
             try:
                 if pwd_context.verify(password, ph):
                     # re-hash se necessário (upgrade de esquema)
-                    if pwd_context.needs_update(ph):
-                        user.password_hash = pwd_context.hash(password)
-                        s.add(user); s.commit()
-                    return user
+                    return user, pwd_context.needs_update(ph)
             except UnknownHashError:
                 # hash não reconhecido pelo pwd_context -> tentar fallbacks
                 pass
             except Exception:
                 # qualquer outro erro de verificação, falha com None
-                return None
+                return None, False
 
             # 2) tentativas explícitas de schemes conhecidos (fallback)
+            #    -> precisam ser re-hashed com o contexto padrão
             try:
                 if bcrypt_sha256.verify(password, ph):
-                    # re-hash com o contexto padrão
-                    user.password_hash = pwd_context.hash(password)
-                    s.add(user); s.commit()
-                    return user
+                    return user, True
             except Exception:
                 pass
 
             try:
                 if bcrypt.verify(password, ph):
-                    user.password_hash = pwd_context.hash(password)
-                    s.add(user); s.commit()
-                    return user
+                    return user, True
             except Exception:
                 pass
 
             # 3) fallback temporário: se o password_hash for exatamente a senha (texto puro)
-            #    use isso APENAS para recuperar o acesso — será re-hashed em seguida.
-            try:
-                if ph == password:
-                    user.password_hash = pwd_context.hash(password)
-                    s.add(user); s.commit()
-                    return user
-            except Exception:
-                pass
+            #    use isso APENAS para recuperar o acesso — deve ser re-hashed em seguida.
+            if ph == password:
+                return user, True
 
             # nada bateu -> autenticação falha
-            return None
+            return None, False
+
+    def rehash_password(self, user_id: int, password: str, old_hash: str | None = None) -> bool:
+        """
+        Regrava o hash da senha com o esquema padrão do pwd_context.
+        Se `old_hash` for informado, só grava se o hash no banco ainda for
+        esse (evita sobrescrever uma troca de senha feita no meio tempo).
+        """
+        new_hash = pwd_context.hash(password)
+        with get_session() as s:
+            user = s.get(User, user_id)
+            if not user:
+                return False
+            if old_hash is not None and user.password_hash != old_hash:
+                return False
+            user.password_hash = new_hash
+            s.add(user)
+            s.commit()
+            return True
 
     # ----------------------------------------------
     # LISTAR USUÁRIOS
     # ----------------------------------------------
     def list_users(self):
+        """Todos os usuários, como UsuarioLinha (sem o hash da senha)."""
         with get_session() as s:
-            return s.exec(select(User)).all()
+            return carregar(s, UsuarioLinha, selecionar(UsuarioLinha, User))
+
+    def list_mecanicos(self):
+        """
+        Usuários com papel Mecanico, como tuplas Mecanico(id, username, nome),
+        servidos do cache de referência.
+        """
+        def carregar():
+            with get_session() as s:
+                rows = s.exec(select(User.id, User.username, User.nome, User.role)).all()
+            return tuple(Mecanico(uid, username, nome) for uid, username, nome, role in rows
+                         if (role or "").strip().lower() == "mecanico")
+        return list(ref_cache.get_or_load(("mecanicos",), carregar))
 
     # ----------------------------------------------
     # EXCLUIR USUÁRIO
@@ -124,5 +164,6 @@ class AuthController:
                 return False
             s.delete(user)
             s.commit()
+            ref_cache.invalidate("mecanicos")
             return True
 
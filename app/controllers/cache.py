@@ -0,0 +1,77 @@
+# app/controllers/cache.py
+"""
+Cache em memória dos dados de referência (clientes, veículos por cliente,
+mecânicos) que alimentam combos e diálogos.
+
+As chaves são tuplas cujo primeiro item é o "grupo" (ex.: ("veiculos", 3));
+escritas nos controllers invalidam o grupo inteiro. Cada entrada expira após
+`ttl` segundos (limita a defasagem quando outra instância do programa escreve
+no mesmo banco) e o total de entradas é limitado a `maxsize` (LRU).
+
+Configuração via variáveis de ambiente:
+    AUTOMANAGER_CACHE_TTL       segundos (padrão 300; 0 desliga o cache)
+    AUTOMANAGER_CACHE_MAXSIZE   entradas (padrão 256)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class RefCache:
+    """Cache com TTL e tamanho máximo, seguro para as threads do QThreadPool."""
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 256, clock=time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data = OrderedDict()   # chave -> (expira_em, valor)
+        # incrementado a cada invalidação: uma carga que começou antes dela
+        # não grava o resultado (já pode estar desatualizado)
+        self._versions = {}
+        self._epoch = 0              # idem, para clear()
+
+    def get_or_load(self, key: tuple, loader):
+        """Valor em cache para `key` ou, se ausente/expirado, `loader()`."""
+        if self.ttl <= 0:
+            return loader()
+        now = self._clock()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and hit[0] > now:
+                self._data.move_to_end(key)
+                return hit[1]
+            version = (self._epoch, self._versions.get(key[0], 0))
+
+        # a consulta roda fora do lock; duas threads podem carregar a mesma
+        # chave ao mesmo tempo, o que só custa uma consulta a mais
+        value = loader()
+
+        with self._lock:
+            if (self._epoch, self._versions.get(key[0], 0)) == version:
+                self._data[key] = (self._clock() + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, *groups: str):
+        """Descarta todas as entradas dos grupos informados."""
+        with self._lock:
+            for group in groups:
+                self._versions[group] = self._versions.get(group, 0) + 1
+            for key in [k for k in self._data if k[0] in groups]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._data.clear()
+
+
+# instância compartilhada por todos os controllers do processo
+ref_cache = RefCache(
+    ttl=float(os.environ.get("AUTOMANAGER_CACHE_TTL") or 300),
+    maxsize=int(os.environ.get("AUTOMANAGER_CACHE_MAXSIZE") or 256),
+)
@@ -0,0 +1,91 @@
+# app/controllers/dashboard_controller.py
+"""
+Consultas do painel gerencial (faturamento e volume de OS).
+
+Tudo sai da tabela resumo_os (dia × status × mecânico, ver db._ensure_resumo),
+que os gatilhos mantêm em dia a cada escrita em ordemservico: o custo das
+consultas depende do número de dias no período, não do número de ordens.
+Valores em centavos (inteiros), então as somas são exatas.
+"""
+import datetime
+
+from sqlalchemy import func, select
+
+import db
+from db import get_session
+from instrumentacao import instrumentar
+from models.models import OrdemServico, ResumoOS
+
+
+@instrumentar
+class DashboardController:
+
+    def _fonte(self):
+        """resumo_os, ou a mesma agregação feita direto nas OS sem os gatilhos."""
+        if db.resumo_enabled:
+            return ResumoOS.__table__
+        return (
+            select(
+                func.date(OrdemServico.aberta_em).label("dia"),
+                OrdemServico.status,
+                func.coalesce(OrdemServico.mecanico, "").label("mecanico"),
+                func.count().label("quantidade"),
+                func.sum(OrdemServico.valor_centavos).label("total_centavos"),
+            )
+            .group_by(func.date(OrdemServico.aberta_em), OrdemServico.status,
+                      func.coalesce(OrdemServico.mecanico, ""))
+            .subquery()
+        )
+
+    def _agrupar(self, coluna: str, desde: datetime.date | None = None,
+                 ate: datetime.date | None = None, status: str | None = None):
+        """
+        Quantidade e total por `coluna` ("status", "mecanico" ou "dia"),
+        com o dia de abertura em [desde, ate) e, opcionalmente, só um status.
+        """
+        t = self._fonte()
+        chave = t.c[coluna]
+        stmt = (
+            select(
+                chave.label("chave"),
+                func.sum(t.c.quantidade).label("quantidade"),
+                func.sum(t.c.total_centavos).label("total_centavos"),
+            )
+            .group_by(chave)
+            .order_by(chave)
+        )
+        if desde is not None:
+            stmt = stmt.where(t.c.dia >= desde)
+        if ate is not None:
+            stmt = stmt.where(t.c.dia < ate)
+        if status:
+            stmt = stmt.where(t.c.status == status)
+        with get_session() as s:
+            rows = s.execute(stmt).all()
+        return [
+            {coluna: r.chave, "quantidade": int(r.quantidade or 0),
+             "total_centavos": int(r.total_centavos or 0)}
+            for r in rows
+        ]
+
+    def totais_por_status(self, desde=None, ate=None):
+        """[{"status", "quantidade", "total_centavos"}]; sem período = todas as OS."""
+        return self._agrupar("status", desde, ate)
+
+    def faturamento_por_mecanico(self, desde=None, ate=None, status: str | None = None):
+        """[{"mecanico", "quantidade", "total_centavos"}], maior faturamento primeiro."""
+        linhas = self._agrupar("mecanico", desde, ate, status)
+        linhas.sort(key=lambda r: r["total_centavos"], reverse=True)
+        return linhas
+
+    def faturamento_por_dia(self, desde=None, ate=None, status: str | None = None):
+        """[{"dia", "quantidade", "total_centavos"}] em ordem de data."""
+        return self._agrupar("dia", desde, ate, status)
+
+    @staticmethod
+    def periodo_do_mes(hoje: datetime.date | None = None):
+        """(primeiro dia do mês, primeiro dia do mês seguinte)."""
+        hoje = hoje or datetime.date.today()
+        inicio = hoje.replace(day=1)
+        fim = (inicio + datetime.timedelta(days=32)).replace(day=1)
+        return inicio, fim
@@ -0,0 +1,159 @@
+# app/controllers/export_controller.py
+"""
+Exportação das ordens de serviço em CSV, JSON Lines ou XLSX.
+
+Os dados vêm de um único SELECT com JOIN (o mesmo da grade), lido em lotes
+com `yield_per`: só um lote de linhas (tuplas, não objetos ORM) fica em
+memória por vez, e cada linha vai direto para o arquivo. O arquivo é escrito
+em `<destino>.part` e só renomeado no fim, então um cancelamento ou erro não
+deixa um export pela metade no lugar do definitivo.
+"""
+import csv
+import datetime
+import json
+import os
+
+from sqlalchemy import func, select
+
+from db import get_session
+from instrumentacao import instrumentar
+from controllers.os_controller import OSController
+from models.models import OrdemServico
+
+# colunas do arquivo -> chave da linha da grade
+CAMPOS_OS = [
+    ("id", "id"),
+    ("codigo", "codigo"),
+    ("descricao", "descricao"),
+    ("status", "status"),
+    ("prioridade", "prioridade"),
+    ("cliente", "cliente_nome"),
+    ("veiculo", "veiculo_placa"),
+    ("mecanico", "mecanico"),
+    ("valor", "valor"),
+    ("aberta_em", "aberta_em"),
+]
+
+
+class _CsvWriter:
+    def __init__(self, path):
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._w = csv.writer(self._f)
+
+    def header(self, names):
+        self._w.writerow(names)
+
+    def row(self, rec):
+        rec["valor"] = f"{(rec['valor'] or 0.0):.2f}"
+        self._w.writerow(["" if v is None else v for v in rec.values()])
+
+    def close(self, ok=True):
+        self._f.close()
+
+
+class _JsonlWriter:
+    def __init__(self, path):
+        self._f = open(path, "w", encoding="utf-8")
+
+    def header(self, names):
+        pass
+
+    def row(self, rec):
+        if isinstance(rec["aberta_em"], datetime.datetime):
+            rec["aberta_em"] = rec["aberta_em"].isoformat()
+        self._f.write(json.dumps(rec, ensure_ascii=False))
+        self._f.write("\n")
+
+    def close(self, ok=True):
+        self._f.close()
+
+
+class _XlsxWriter:
+    def __init__(self, path):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise RuntimeError("Exportar XLSX requer o pacote openpyxl (pip install openpyxl).") from None
+        # write_only: as linhas vão para o arquivo sem manter a planilha em memória
+        self._path = path
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("Ordens de Serviço")
+
+    def header(self, names):
+        self._ws.append(names)
+
+    def row(self, rec):
+        self._ws.append(list(rec.values()))
+
+    def close(self, ok=True):
+        if ok:
+            self._wb.save(self._path)
+
+
+_WRITERS = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "xlsx": _XlsxWriter}
+
+
+@instrumentar
+class ExportController:
+    FORMATOS = tuple(_WRITERS)
+
+    # linhas lidas do banco por vez
+    LOTE = 1000
+
+    def __init__(self):
+        self._os = OSController()
+
+    @classmethod
+    def formato_por_caminho(cls, path: str) -> str:
+        ext = os.path.splitext(path)[1].lower().lstrip(".")
+        if ext not in cls.FORMATOS:
+            raise ValueError(f"Formato de exportação não suportado: {ext or path!r}")
+        return ext
+
+    def contar_os(self, filtros: dict | None = None) -> int:
+        stmt = self._os._filtrar_os(self._os._grid_select(), filtros)
+        with get_session() as s:
+            return s.scalar(select(func.count()).select_from(stmt.subquery()))
+
+    def exportar_os(self, path: str, formato: str | None = None, filtros: dict | None = None,
+                    progress_cb=None, is_cancelled=None):
+        """
+        Exporta as OS (com `filtros` como em listar_os_grid) para `path`.
+        `formato` é deduzido da extensão quando omitido. Chama
+        `progress_cb(feitas, total)` a cada lote e para assim que
+        `is_cancelled()` for verdadeiro (nesse caso retorna None e não deixa
+        arquivo). Retorna a quantidade de ordens exportadas.
+        """
+        formato = (formato or self.formato_por_caminho(path)).lower()
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de exportação não suportado: {formato!r}")
+
+        total = self.contar_os(filtros)
+        stmt = (
+            self._os._filtrar_os(self._os._grid_select(), filtros)
+            .order_by(OrdemServico.id)
+            .execution_options(yield_per=self.LOTE)
+        )
+        tmp = path + ".part"
+        writer = _WRITERS[formato](tmp)
+        feitas = 0
+        ok = False
+        try:
+            writer.header([nome for nome, _ in CAMPOS_OS])
+            with get_session() as s:
+                for lote in s.execute(stmt).partitions():
+                    if is_cancelled and is_cancelled():
+                        return None
+                    for r in lote:
+                        m = r._mapping
+                        writer.row({nome: m[chave] for nome, chave in CAMPOS_OS})
+                    feitas += len(lote)
+                    if progress_cb:
+                        progress_cb(feitas, total)
+            ok = True
+        finally:
+            writer.close(ok)
+            if not ok and os.path.exists(tmp):
+                os.remove(tmp)
+        os.replace(tmp, path)
+        return feitas
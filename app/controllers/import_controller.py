@@ -0,0 +1,224 @@
+# app/controllers/import_controller.py
+"""
+Importação em massa de clientes e veículos a partir de CSV.
+
+Colunas (cabeçalho obrigatório, separador "," ou ";"):
+    nome, documento, telefone, email, placa, marca, modelo, ano
+Cada linha é um cliente e, se tiver placa, um veículo dele. Linhas com o
+mesmo documento (ou com o documento de um cliente já cadastrado) apontam
+para o mesmo cliente, então o arquivo pode repetir o cliente em uma linha
+por veículo.
+
+O arquivo é lido em lotes (nunca inteiro em memória). A validação e a
+normalização (controllers/normalizacao.py) rodam em processos separados
+quando o arquivo é grande. Cada lote é gravado em uma transação com
+INSERTs em lote (executemany). Linhas recusadas vão para um relatório CSV
+com o número da linha e o motivo.
+"""
+import csv
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import insert, select
+
+from db import get_session
+from instrumentacao import instrumentar
+from controllers.cache import ref_cache
+from controllers.normalizacao import chave_busca, validar_lote_importacao
+from models.models import Cliente, Veiculo
+
+
+@instrumentar
+class ImportController:
+    # linhas por lote (validação e transação)
+    LOTE = 500
+
+    # abaixo disso, validar no próprio processo sai mais barato que subir workers
+    MIN_LINHAS_PROCESSOS = 5000
+
+    def importar_clientes_veiculos(self, path: str, relatorio: str | None = None,
+                                   processos: int | None = None,
+                                   progress_cb=None, is_cancelled=None) -> dict:
+        """
+        Importa o CSV em `path`. `processos` = nº de processos de validação
+        (0 valida no processo atual; None decide pelo tamanho do arquivo).
+        Recusas vão para `relatorio` (padrão: <arquivo>.rejeitados.csv),
+        criado só se houver alguma.
+
+        Chama `progress_cb(linhas, total)` a cada lote. Se `is_cancelled()`
+        ficar verdadeiro, para entre lotes; os lotes já gravados permanecem.
+        Retorna {"linhas", "clientes", "veiculos", "rejeitadas", "relatorio",
+        "cancelado"}.
+        """
+        total = self._contar_linhas(path)
+        if processos is None:
+            processos = (os.cpu_count() or 2) if total >= self.MIN_LINHAS_PROCESSOS else 0
+        if relatorio is None:
+            relatorio = os.path.splitext(path)[0] + ".rejeitados.csv"
+
+        resumo = {"linhas": 0, "clientes": 0, "veiculos": 0, "rejeitadas": 0,
+                  "relatorio": None, "cancelado": False}
+        clientes, placas = self._chaves_existentes()
+        rel_file = rel_writer = None
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f, dialect=self._dialeto(f))
+                reader.fieldnames = [(c or "").strip().lower() for c in reader.fieldnames or []]
+                faltando = {"nome", "documento"} - set(reader.fieldnames)
+                if faltando:
+                    raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(sorted(faltando))}")
+
+                for lote in self._validar(self._lotes(reader), processos):
+                    if is_cancelled and is_cancelled():
+                        resumo["cancelado"] = True
+                        break
+                    rejeitadas = self._gravar_lote(lote, clientes, placas, resumo)
+                    if rejeitadas:
+                        if rel_writer is None:
+                            rel_file = open(relatorio, "w", newline="", encoding="utf-8")
+                            rel_writer = csv.writer(rel_file)
+                            rel_writer.writerow(["linha", "motivo", *reader.fieldnames])
+                            resumo["relatorio"] = relatorio
+                        for numero, linha, motivo in rejeitadas:
+                            rel_writer.writerow([numero, motivo, *(linha.get(c, "") for c in reader.fieldnames)])
+                    resumo["linhas"] += len(lote)
+                    resumo["rejeitadas"] += len(rejeitadas)
+                    if progress_cb:
+                        progress_cb(resumo["linhas"], total)
+        finally:
+            if rel_file is not None:
+                rel_file.close()
+            if resumo["clientes"] or resumo["veiculos"]:
+                ref_cache.invalidate("clientes", "veiculos")
+        return resumo
+
+    # ---------------------------
+    # Leitura
+    # ---------------------------
+    @staticmethod
+    def _contar_linhas(path) -> int:
+        """
+        Linhas de dados (sem o cabeçalho), contando quebras em blocos de 1 MB.
+        Aproximado se houver campos com quebra de linha; serve ao progresso.
+        """
+        n, ultimo = 0, b"\n"
+        with open(path, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                n += bloco.count(b"\n")
+                ultimo = bloco[-1:]
+        if ultimo != b"\n":
+            n += 1  # última linha sem quebra
+        return max(n - 1, 0)
+
+    @staticmethod
+    def _dialeto(f):
+        amostra = f.read(8192)
+        f.seek(0)
+        try:
+            return csv.Sniffer().sniff(amostra, delimiters=",;")
+        except csv.Error:
+            return csv.excel
+
+    def _lotes(self, reader):
+        lote = []
+        for linha in reader:
+            # colunas a mais na linha (chave None) são descartadas
+            lote.append((reader.line_num, {k: v for k, v in linha.items() if k is not None}))
+            if len(lote) >= self.LOTE:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+    def _validar(self, lotes, processos):
+        """Valida os lotes em ordem; com processos, alguns lotes ficam em voo."""
+        if not processos:
+            for lote in lotes:
+                yield validar_lote_importacao(lote)
+            return
+
+        # "spawn": fork a partir de um processo com threads (Qt, QThreadPool) não é seguro
+        ctx = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=processos, mp_context=ctx)
+        try:
+            pendentes = deque()
+            for lote in lotes:
+                pendentes.append(executor.submit(validar_lote_importacao, lote))
+                # janela limitada: a leitura não corre muito à frente da gravação
+                if len(pendentes) >= processos * 2:
+                    yield pendentes.popleft().result()
+            while pendentes:
+                yield pendentes.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # ---------------------------
+    # Gravação
+    # ---------------------------
+    @staticmethod
+    def _chaves_existentes():
+        """Documento -> id dos clientes e placas dos veículos já cadastrados (chaves normalizadas)."""
+        with get_session() as s:
+            clientes = dict(s.exec(
+                select(Cliente.documento_norm, Cliente.id).where(Cliente.documento_norm.is_not(None))
+            ).all())
+            placas = set(s.exec(
+                select(Veiculo.placa_norm).where(Veiculo.placa_norm.is_not(None))
+            ).scalars())
+        return clientes, placas
+
+    def _gravar_lote(self, lote, clientes: dict, placas: set, resumo: dict):
+        """
+        Grava um lote validado em uma transação. `clientes` e `placas` são
+        atualizados com o que foi inserido. Retorna as recusas
+        [(nº da linha, linha, motivo)].
+        """
+        rejeitadas = []
+        novos_clientes = {}   # documento -> registro
+        veiculos = []         # (documento, registro)
+        for numero, linha, reg, motivo in lote:
+            if reg is None:
+                rejeitadas.append((numero, linha, motivo))
+                continue
+            if reg["placa"]:
+                if reg["placa"] in placas:
+                    rejeitadas.append((numero, linha, f"Placa já cadastrada: {reg['placa']}"))
+                    continue
+                placas.add(reg["placa"])
+                veiculos.append((reg["documento"], reg))
+            if reg["documento"] not in clientes:
+                novos_clientes.setdefault(reg["documento"], reg)
+
+        if not novos_clientes and not veiculos:
+            return rejeitadas
+
+        with get_session() as s:
+            if novos_clientes:
+                linhas = [
+                    {"nome": r["nome"], "nome_busca": chave_busca(r["nome"]), "documento": doc,
+                     "documento_norm": doc, "telefone": r["telefone"], "email": r["email"]}
+                    for doc, r in novos_clientes.items()
+                ]
+                # sem RETURNING: com sort_by_parameter_order o SQLite faria um
+                # INSERT por linha; os ids voltam pelo documento (único)
+                s.exec(insert(Cliente), params=linhas)
+                novos = dict(s.exec(
+                    select(Cliente.documento_norm, Cliente.id)
+                    .where(Cliente.documento_norm.in_(list(novos_clientes)))
+                ).all())
+            else:
+                novos = {}
+            if veiculos:
+                s.exec(insert(Veiculo), params=[
+                    {"placa": r["placa"], "placa_norm": r["placa"], "marca": r["marca"],
+                     "modelo": r["modelo"], "ano": r["ano"], "cliente_id": novos.get(doc) or clientes[doc]}
+                    for doc, r in veiculos
+                ])
+            s.commit()
+
+        clientes.update(novos)
+        resumo["clientes"] += len(novos)
+        resumo["veiculos"] += len(veiculos)
+        return rejeitadas
@@ -0,0 +1,185 @@
+# app/controllers/normalizacao.py
+"""
+Normalização e validação de documento (CPF/CNPJ), telefone, placa, valores
+em dinheiro e chaves de busca.
+
+Funções puras, sem banco nem Qt, para poderem rodar também nos processos de
+trabalho do importador (ver controllers/import_controller.py).
+"""
+import datetime
+import re
+import unicodedata
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+_NAO_DIGITO = re.compile(r"\D")
+_NAO_ALFANUM = re.compile(r"[^A-Z0-9]")
+# ABC1234 (antiga) ou ABC1D23 (Mercosul)
+_PLACA = re.compile(r"^[A-Z]{3}[0-9][A-Z0-9][0-9]{2}$")
+
+
+def so_digitos(valor) -> str:
+    return _NAO_DIGITO.sub("", str(valor or ""))
+
+
+def _digito_verificador(digitos: str, pesos) -> str:
+    resto = sum(int(d) * p for d, p in zip(digitos, pesos)) % 11
+    return "0" if resto < 2 else str(11 - resto)
+
+
+def _cpf_valido(cpf: str) -> bool:
+    if len(set(cpf)) == 1:
+        return False
+    d1 = _digito_verificador(cpf[:9], range(10, 1, -1))
+    d2 = _digito_verificador(cpf[:10], range(11, 1, -1))
+    return cpf[9:] == d1 + d2
+
+
+def _cnpj_valido(cnpj: str) -> bool:
+    if len(set(cnpj)) == 1:
+        return False
+    pesos = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    d1 = _digito_verificador(cnpj[:12], pesos[1:])
+    d2 = _digito_verificador(cnpj[:13], pesos)
+    return cnpj[12:] == d1 + d2
+
+
+def normalizar_documento(valor) -> str | None:
+    """
+    CPF ou CNPJ só com dígitos ("123.456.789-09" -> "12345678909").
+    None se vazio; ValueError se o tamanho ou os dígitos verificadores
+    não conferirem.
+    """
+    doc = so_digitos(valor)
+    if not doc:
+        return None
+    if len(doc) == 11 and _cpf_valido(doc):
+        return doc
+    if len(doc) == 14 and _cnpj_valido(doc):
+        return doc
+    raise ValueError(f"Documento inválido: {valor}")
+
+
+def normalizar_telefone(valor) -> str | None:
+    """DDD + número, só dígitos (10 ou 11); aceita e remove o prefixo 55."""
+    tel = so_digitos(valor)
+    if not tel:
+        return None
+    if len(tel) in (12, 13) and tel.startswith("55"):
+        tel = tel[2:]
+    if len(tel) not in (10, 11):
+        raise ValueError(f"Telefone inválido: {valor}")
+    return tel
+
+
+def normalizar_placa(valor) -> str | None:
+    """Placa em maiúsculas, sem hífen nem espaços ("abc-1234" -> "ABC1234")."""
+    placa = _NAO_ALFANUM.sub("", str(valor or "").upper())
+    if not placa:
+        return None
+    if not _PLACA.match(placa):
+        raise ValueError(f"Placa inválida: {valor}")
+    return placa
+
+
+def chave_busca(valor) -> str:
+    """
+    Texto sem acentos, em minúsculas e com espaços simples, para buscas por
+    prefixo: "  José  da SILVA" -> "jose da silva".
+    """
+    texto = unicodedata.normalize("NFKD", str(valor or ""))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.casefold().split())
+
+
+def prefixo_placa(valor) -> str:
+    """Início de placa digitado em uma busca, como as placas são gravadas: "abc-1" -> "ABC1"."""
+    return _NAO_ALFANUM.sub("", str(valor or "").upper())
+
+
+def chave_documento(valor) -> str | None:
+    """
+    Chave única do documento (Cliente.documento_norm): só os dígitos, sem
+    validar, para valer também para documentos antigos fora do padrão.
+    """
+    return so_digitos(valor) or None
+
+
+def chave_placa(valor) -> str | None:
+    """Chave única da placa (Veiculo.placa_norm): como prefixo_placa, sem validar o formato."""
+    return prefixo_placa(valor) or None
+
+
+def para_centavos(valor) -> int:
+    """
+    Valor em reais (número ou texto, com "," ou ".") em centavos inteiros,
+    arredondando meio centavo para cima: "150,5" -> 15050. Vazio -> 0.
+    """
+    if valor is None or valor == "":
+        return 0
+    try:
+        reais = Decimal(str(valor).strip().replace(",", "."))
+    except InvalidOperation:
+        raise ValueError(f"Valor inválido: {valor}") from None
+    if not reais.is_finite():
+        raise ValueError(f"Valor inválido: {valor}")
+    return int((reais * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+# ---------------------------
+# Linhas do importador
+# ---------------------------
+COLUNAS_IMPORTACAO = ("nome", "documento", "telefone", "email",
+                      "placa", "marca", "modelo", "ano")
+
+
+def validar_linha_importacao(linha: dict) -> dict:
+    """
+    Valida e normaliza uma linha do CSV de clientes/veículos.
+    Retorna o registro normalizado ou levanta ValueError com o motivo.
+    """
+    campos = {k: (linha.get(k) or "").strip() for k in COLUNAS_IMPORTACAO}
+    if not campos["nome"]:
+        raise ValueError("Nome obrigatório")
+    documento = normalizar_documento(campos["documento"])
+    if not documento:
+        raise ValueError("Documento obrigatório")
+    if campos["email"] and "@" not in campos["email"]:
+        raise ValueError(f"E-mail inválido: {campos['email']}")
+
+    ano = None
+    if campos["ano"]:
+        try:
+            ano = int(campos["ano"])
+        except ValueError:
+            raise ValueError(f"Ano inválido: {campos['ano']}") from None
+        if not 1900 <= ano <= datetime.date.today().year + 1:
+            raise ValueError(f"Ano inválido: {campos['ano']}")
+
+    placa = normalizar_placa(campos["placa"])
+    if not placa and (campos["marca"] or campos["modelo"] or ano):
+        raise ValueError("Veículo sem placa")
+
+    return {
+        "nome": campos["nome"],
+        "documento": documento,
+        "telefone": normalizar_telefone(campos["telefone"]),
+        "email": campos["email"] or None,
+        "placa": placa,
+        "marca": campos["marca"] or None,
+        "modelo": campos["modelo"] or None,
+        "ano": ano,
+    }
+
+
+def validar_lote_importacao(lote):
+    """
+    Valida um lote [(nº da linha, linha)] e devolve
+    [(nº da linha, linha, registro ou None, motivo ou None)].
+    """
+    saida = []
+    for numero, linha in lote:
+        try:
+            saida.append((numero, linha, validar_linha_importacao(linha), None))
+        except ValueError as ex:
+            saida.append((numero, linha, None, str(ex)))
+    return saida
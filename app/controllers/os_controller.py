@@ -1,10 +1,54 @@
 # app/controllers/os_controller.py
+import db
 from db import get_session
-from models.models import Cliente, Veiculo, OrdemServico, OrdemServicoHistorico
+from instrumentacao import instrumentar
+from controllers.cache import ref_cache
+from controllers.normalizacao import (
+    chave_busca, chave_documento, chave_placa, normalizar_documento, normalizar_placa,
+    para_centavos, prefixo_placa, so_digitos,
+)
+from controllers.retencao_controller import apagar_orfaos_expostos, ler_arquivo
+from models.models import (
+    Cliente, Veiculo, OrdemServico, OrdemServicoHistorico, OrdemServicoHistoricoArquivo, Sequencia,
+)
+from models.linhas import ClienteLinha, HistoricoLinha, OSLinha, VeiculoLinha, carregar, selecionar
 from sqlmodel import select
+from sqlalchemy import and_, column, delete, func, insert, or_, table, text, tuple_, union, update
+from sqlalchemy.exc import IntegrityError
 import datetime
+import re
 
+
+def _violou_unico(ex: IntegrityError, coluna: str) -> bool:
+    """Se `ex` é a violação do índice único de `coluna` (e não FK, NOT NULL...)."""
+    # SQLite: "UNIQUE constraint failed: veiculo.placa_norm"; outros bancos citam o índice
+    msg = str(ex.orig).lower()
+    return "unique" in msg and coluna in msg
+
+@instrumentar
 class OSController:
+    # colunas da grade que podem ir para ORDER BY (chave da linha -> expressão)
+    ORDENACAO_OS = {
+        "id": OrdemServico.id,
+        "codigo": OrdemServico.codigo,
+        "descricao": OrdemServico.descricao,
+        "status": OrdemServico.status,
+        "prioridade": OrdemServico.prioridade,
+        "cliente_nome": func.coalesce(Cliente.nome, ""),
+        "veiculo_placa": func.coalesce(Veiculo.placa, ""),
+        "mecanico": func.coalesce(OrdemServico.mecanico, ""),
+        "valor": OrdemServico.valor_centavos,
+        "aberta_em": OrdemServico.aberta_em,
+    }
+
+    # chave da linha usada em `after` quando difere da coluna exibida
+    CHAVES_PAGINA_OS = {"valor": "valor_centavos"}
+
+    FILTROS_OS = {
+        "status", "prioridade", "mecanico", "cliente_id", "veiculo_id",
+        "cliente", "desde", "ate", "valor_min", "valor_max",
+    }
+
     def __init__(self):
         pass
     
@@ -28,20 +72,34 @@ class OSController:
 
             s.delete(v)
             s.commit()
+            ref_cache.invalidate("veiculos")
             return True
 
 
-    def _registrar_historico(self, s, osr: OrdemServico, acao: str, usuario: str | None = None):
-        h = OrdemServicoHistorico(
-            ordem_id=osr.id,
-            usuario=usuario,
-            acao=acao,
-            status=osr.status,
-            prioridade=osr.prioridade,
-            mecanico=osr.mecanico,
-            valor=osr.valor,
-            descricao=osr.descricao,
-        )
+    # colunas da OS guardadas no histórico (foto na CRIACAO, deltas depois)
+    CAMPOS_HISTORICO = ("status", "prioridade", "mecanico", "valor_centavos", "descricao")
+
+    def _registrar_historico(self, s, osr: OrdemServico, acao: str, usuario: str | None = None,
+                             alteracoes: dict | None = None):
+        """
+        Sem `alteracoes`, grava a foto completa da OS (CRIACAO). Com elas
+        ({campo: (antigo, novo)}), grava só os campos que mudaram; as fotos
+        são remontadas em listar_historico_os.
+        """
+        if alteracoes is None:
+            h = OrdemServicoHistorico(
+                ordem_id=osr.id,
+                usuario=usuario,
+                acao=acao,
+                **{c: getattr(osr, c) for c in self.CAMPOS_HISTORICO},
+            )
+        else:
+            h = OrdemServicoHistorico(
+                ordem_id=osr.id,
+                usuario=usuario,
+                acao=acao,
+                alteracoes={c: list(v) for c, v in alteracoes.items()},
+            )
         s.add(h)
 
 
@@ -58,39 +116,44 @@ class OSController:
             self._check_os_permission(osr, role=role, username=usuario, action="update")
 
             r = self._normalize_role(role)
-            user = (usuario or "").strip()
 
-            changed = False
+            # campo -> (valor antigo, valor novo)
+            changed = {}
+
+            def alterar(campo, novo):
+                antigo = getattr(osr, campo)
+                if novo != antigo:
+                    setattr(osr, campo, novo)
+                    changed[campo] = (antigo, novo)
 
             # Regras por papel:
 
             # 1) Administrador ou Gerente: podem alterar tudo
             if r in ("administrador", "gerente"):
-                if descricao is not None and descricao.strip() != osr.descricao:
-                    osr.descricao = descricao.strip(); changed = True
-                if status is not None and status != osr.status:
-                    osr.status = status; changed = True
-                if prioridade is not None and prioridade != osr.prioridade:
-                    osr.prioridade = prioridade; changed = True
-                if mecanico is not None and mecanico != osr.mecanico:
-                    osr.mecanico = mecanico; changed = True
-                if veiculo_id is not None and veiculo_id != osr.veiculo_id:
-                    osr.veiculo_id = veiculo_id; changed = True
+                if descricao is not None:
+                    alterar("descricao", descricao.strip())
+                if status is not None:
+                    alterar("status", status)
+                if prioridade is not None:
+                    alterar("prioridade", prioridade)
+                if mecanico is not None:
+                    alterar("mecanico", mecanico)
+                if veiculo_id is not None:
+                    alterar("veiculo_id", veiculo_id)
                 if valor is not None:
                     try:
-                        v = float(valor)
-                    except Exception:
-                        v = 0.0
-                    if v != osr.valor:
-                        osr.valor = v; changed = True
+                        v = para_centavos(valor)
+                    except ValueError:
+                        v = 0
+                    alterar("valor_centavos", v)
 
             # 2) Mecânico: só pode alterar descrição e status da própria OS
             elif r == "mecanico":
                 # aqui _check_os_permission já garantiu que osr.mecanico == user
-                if status is not None and status != osr.status:
-                    osr.status = status; changed = True
-                if descricao is not None and descricao.strip() != osr.descricao:
-                    osr.descricao = descricao.strip(); changed = True
+                if status is not None:
+                    alterar("status", status)
+                if descricao is not None:
+                    alterar("descricao", descricao.strip())
                 # qualquer tentativa de mudar outros campos é ignorada para esse papel
 
             else:
@@ -99,36 +162,187 @@ class OSController:
 
             if changed:
                 s.add(osr)
+                # histórico (só os campos alterados) no mesmo commit da OS
+                self._registrar_historico(s, osr, acao="ATUALIZACAO", usuario=usuario,
+                                          alteracoes=changed)
                 s.commit()
                 s.refresh(osr)
 
-                # histórico
-                try:
-                    self._registrar_historico(s, osr, acao="ATUALIZACAO", usuario=usuario)
-                    s.commit()
-                except Exception:
-                    pass
-
             return osr
 
 
-    def listar_historico_os(self, ordem_id: int):
+    def listar_historico_os(self, ordem_id: int, after: tuple | None = None,
+                            limit: int | None = None, incluir_arquivo: bool = False):
+        """
+        Histórico da OS, do mais recente para o mais antigo, com as fotos
+        completas remontadas (ver _remontar_historico). Com `incluir_arquivo`,
+        as entradas já movidas pela retenção vêm depois das demais.
+
+        Para paginar, passe em `after` a chave da última entrada recebida
+        (ver `chave_pagina_historico`) e o tamanho da página em `limit`: a
+        busca segue o índice (ordem_id, data), sem OFFSET.
+        """
+        H = OrdemServicoHistorico
+        stmt = (
+            selecionar(HistoricoLinha, H)
+            .where(H.ordem_id == ordem_id)
+            .order_by(H.data.desc(), H.id.desc())
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(H.data, H.id) < tuple_(after[0], after[1]))
+        if limit is not None:
+            # uma entrada a mais: a mais antiga da página precisa da anterior
+            # para calcular o que mudou quando é uma foto completa
+            stmt = stmt.limit(limit + 1)
         with get_session() as s:
-            stmt = select(OrdemServicoHistorico).where(
-                OrdemServicoHistorico.ordem_id == ordem_id
-            ).order_by(OrdemServicoHistorico.data.desc())
-            return s.exec(stmt).all()
+            historico = carregar(s, HistoricoLinha, stmt)
+            if after is None:
+                osr = s.get(OrdemServico, ordem_id)
+                estado = {c: getattr(osr, c, None) for c in self.CAMPOS_HISTORICO}
+            else:
+                estado = dict(after[2])
+
+        if incluir_arquivo and (limit is None or len(historico) <= limit):
+            # o arquivo só recebe entradas mais antigas que as que ficaram
+            arquivo = [HistoricoLinha(**e) for e in ler_arquivo(ordem_id)]
+            if after is not None:
+                arquivo = [h for h in arquivo if (h.data, h.id) < (after[0], after[1])]
+            historico += arquivo
+        if limit is not None:
+            historico = historico[:limit + 1]
+
+        self._remontar_historico(estado, historico)
+        return historico if limit is None else historico[:limit]
+
+    @classmethod
+    def chave_pagina_historico(cls, h) -> tuple:
+        """
+        Chave de uma entrada do histórico usada em `after`: (data, id, foto
+        da OS antes desta entrada), para a próxima página continuar a remontagem.
+        """
+        estado = {c: getattr(h, c) for c in cls.CAMPOS_HISTORICO}
+        for c, (antigo, _) in (h.alteracoes or {}).items():
+            if c in estado:
+                estado[c] = antigo
+        return (h.data, h.id, estado)
+
+    def _remontar_historico(self, estado: dict, historico):
+        """
+        Preenche as fotos das entradas com deltas, em `historico` (do mais
+        recente para o mais antigo), partindo de `estado` (a OS depois da
+        entrada mais recente) e desfazendo cada delta. Entradas com foto
+        completa (CRIACAO e as gravadas antes dos deltas) servem de ponto de
+        partida para as mais antigas e ganham em `alteracoes` a diferença
+        para a foto anterior. Os objetos estão fora da sessão: nada disso
+        volta para o banco.
+        """
+        for h in historico:
+            if h.alteracoes is None:
+                estado = {c: getattr(h, c) for c in self.CAMPOS_HISTORICO}
+                continue
+            for c, (_, novo) in h.alteracoes.items():
+                if c in estado:
+                    estado[c] = novo
+            for c in self.CAMPOS_HISTORICO:
+                setattr(h, c, estado[c])
+            for c, (antigo, _) in h.alteracoes.items():
+                if c in estado:
+                    estado[c] = antigo
+
+        anterior = None
+        for h in reversed(historico):
+            foto = {c: getattr(h, c) for c in self.CAMPOS_HISTORICO}
+            if h.alteracoes is None and anterior is not None:
+                h.alteracoes = {c: [anterior[c], foto[c]] for c in foto if foto[c] != anterior[c]}
+            anterior = foto
 
 
     def criar_cliente(self, nome, documento=None, telefone=None, email=None):
+        """
+        Cadastra um cliente com o documento só com dígitos. ValueError se o
+        CPF/CNPJ for inválido ou já for de outro cliente.
+        """
+        documento = normalizar_documento(documento)
         with get_session() as s:
-            c = Cliente(nome=nome, documento=documento, telefone=telefone, email=email)
-            s.add(c); s.commit(); s.refresh(c)
+            c = Cliente(nome=nome, nome_busca=chave_busca(nome), documento=documento,
+                        documento_norm=documento, telefone=telefone, email=email)
+            s.add(c)
+            try:
+                s.commit()
+            except IntegrityError as ex:
+                if not _violou_unico(ex, "documento_norm"):
+                    raise
+                raise ValueError(f"Já existe um cliente com o documento {documento}.") from None
+            s.refresh(c)
+            ref_cache.invalidate("clientes")
             return c
 
     def listar_clientes(self):
+        """Todos os clientes, como ClienteLinha (do cache de referência quando possível)."""
+        def carregar_clientes():
+            with get_session() as s:
+                return tuple(carregar(s, ClienteLinha, selecionar(ClienteLinha, Cliente)))
+        return list(ref_cache.get_or_load(("clientes",), carregar_clientes))
+
+    @staticmethod
+    def _com_prefixo(col, prefixo: str):
+        # faixa [prefixo, prefixo + maior caractere): usa o índice de `col`,
+        # o que o LIKE 'prefixo%' do SQLite só faz com case_sensitive_like
+        return and_(col >= prefixo, col < prefixo + "\U0010ffff")
+
+    def buscar_clientes(self, termo: str, limit: int = 20) -> list:
+        """
+        Clientes cujo nome (sem acentos nem maiúsculas), documento, telefone
+        ou placa de um dos veículos começa com `termo`, como ClienteLinha em
+        ordem de nome; no máximo `limit`. Termos sem letras também casam
+        documento e telefone só pelos dígitos ("123.4" acha "12345678909").
+        Cada critério é uma faixa em uma coluna indexada e traz no máximo
+        `limit` ids, então o custo não cresce com o cadastro. Termo vazio -> [].
+        """
+        nome = chave_busca(termo)
+        if not nome:
+            return []
+        criterios = [
+            select(Cliente.id).where(self._com_prefixo(Cliente.nome_busca, nome))
+            .order_by(Cliente.nome_busca)
+        ]
+        digitos = so_digitos(termo)
+        # com letras, o termo é nome ou placa; os dígitos dele não são documento
+        if digitos and not any(c.isalpha() for c in termo):
+            prefixos = [(Cliente.documento_norm, digitos), (Cliente.telefone, digitos)]
+            if termo.strip() != digitos:
+                prefixos.append((Cliente.telefone, termo.strip()))
+            for col, prefixo in prefixos:
+                criterios.append(select(Cliente.id).where(self._com_prefixo(col, prefixo)).order_by(col))
+        placa = prefixo_placa(termo)
+        if 0 < len(placa) <= 7:
+            criterios.append(
+                select(Veiculo.cliente_id.label("id"))
+                .where(self._com_prefixo(Veiculo.placa_norm, placa)).order_by(Veiculo.placa_norm)
+            )
+        ids = union(*(c.limit(limit).subquery().select() for c in criterios)).subquery()
+        stmt = (
+            selecionar(ClienteLinha, Cliente)
+            .where(Cliente.id.in_(select(ids.c.id)))
+            .order_by(Cliente.nome_busca, Cliente.id)
+            .limit(limit)
+        )
+        with get_session() as s:
+            return carregar(s, ClienteLinha, stmt)
+
+    def find_by_documento(self, documento):
+        """
+        Cliente do CPF/CNPJ em qualquer grafia ("123.456.789-09" ou
+        "12345678909"), como ClienteLinha; None se não houver. Uma busca
+        no índice único de Cliente.documento_norm.
+        """
+        chave = chave_documento(documento)
+        if chave is None:
+            return None
         with get_session() as s:
-            return s.exec(select(Cliente)).all()
+            linhas = carregar(s, ClienteLinha,
+                              selecionar(ClienteLinha, Cliente).where(Cliente.documento_norm == chave))
+        return linhas[0] if linhas else None
 
     def delete_cliente(self, cliente_id: int):
         """
@@ -143,29 +357,104 @@ class OSController:
                 return False
 
             # Verificar se há veículos vinculados
-            veiculos = s.exec(select(Veiculo).where(Veiculo.cliente_id == cliente_id)).all()
+            veiculos = s.exec(select(Veiculo).where(Veiculo.cliente_id == cliente_id)).first()
             if veiculos:
                 raise ValueError("Não é possível excluir: o cliente possui veículos cadastrados.")
 
             # Verificar se há OS vinculadas
-            ordens = s.exec(select(OrdemServico).where(OrdemServico.cliente_id == cliente_id)).all()
+            ordens = s.exec(select(OrdemServico).where(OrdemServico.cliente_id == cliente_id)).first()
             if ordens:
                 raise ValueError("Não é possível excluir: o cliente possui Ordens de Serviço vinculadas.")
 
             s.delete(cliente)
             s.commit()
+            ref_cache.invalidate("clientes", "veiculos")
             return True
 
 
     def criar_veiculo(self, cliente_id, placa, marca=None, modelo=None, ano=None):
+        """
+        Cadastra um veículo com a placa normalizada ("abc-1234" -> "ABC1234").
+        ValueError se a placa for inválida ou já estiver cadastrada.
+        """
+        placa = normalizar_placa(placa)
+        if placa is None:
+            raise ValueError("Placa obrigatória.")
         with get_session() as s:
-            v = Veiculo(placa=placa, marca=marca, modelo=modelo, ano=ano, cliente_id=cliente_id)
-            s.add(v); s.commit(); s.refresh(v)
+            v = Veiculo(placa=placa, placa_norm=placa, marca=marca, modelo=modelo, ano=ano,
+                        cliente_id=cliente_id)
+            s.add(v)
+            try:
+                s.commit()
+            except IntegrityError as ex:
+                # outras violações (ex.: cliente inexistente na FK) seguem como estão
+                if not _violou_unico(ex, "placa_norm"):
+                    raise
+                raise ValueError(f"Placa já cadastrada: {placa}.") from None
+            s.refresh(v)
+            ref_cache.invalidate("veiculos")
             return v
 
     def listar_veiculos_por_cliente(self, cliente_id):
+        """Veículos do cliente, como VeiculoLinha (do cache de referência quando possível)."""
+        def carregar_veiculos():
+            with get_session() as s:
+                stmt = selecionar(VeiculoLinha, Veiculo).where(Veiculo.cliente_id == cliente_id)
+                return tuple(carregar(s, VeiculoLinha, stmt))
+        return list(ref_cache.get_or_load(("veiculos", cliente_id), carregar_veiculos))
+
+    def listar_veiculos(self):
+        """
+        Todos os veículos com o nome do dono, em um único SELECT com JOIN
+        (em vez de listar_veiculos_por_cliente para cada cliente). Retorna
+        tuplas (id, placa, modelo, cliente_nome), do cache quando possível.
+        """
+        def carregar_todos():
+            with get_session() as s:
+                return tuple(s.exec(
+                    select(Veiculo.id, Veiculo.placa, Veiculo.modelo, Cliente.nome.label("cliente_nome"))
+                    .join(Cliente, Cliente.id == Veiculo.cliente_id)
+                    .order_by(Cliente.id, Veiculo.id)
+                ).all())
+        return list(ref_cache.get_or_load(("veiculos", "todos"), carregar_todos))
+
+    def buscar_veiculos(self, termo: str = "", cliente_id: int | None = None, limit: int = 20) -> list:
+        """
+        Veículos cuja placa começa com `termo` ("abc-1" acha "ABC1234"), em
+        ordem de placa, como tuplas (id, placa, modelo, cliente_id,
+        cliente_nome); no máximo `limit`. Com `cliente_id`, só os veículos
+        do cliente (todos eles se o termo for vazio); sem ele, termo vazio -> [].
+        """
+        placa = prefixo_placa(termo)
+        stmt = self._veiculos_com_dono()
+        if cliente_id is not None:
+            stmt = stmt.where(Veiculo.cliente_id == cliente_id)
+        elif not placa:
+            return []
+        if placa:
+            stmt = stmt.where(self._com_prefixo(Veiculo.placa_norm, placa))
+        with get_session() as s:
+            return s.exec(stmt.order_by(Veiculo.placa_norm, Veiculo.id).limit(limit)).all()
+
+    def find_by_placa(self, placa):
+        """
+        Veículo da placa em qualquer grafia ("abc-1234", "ABC 1234"), no
+        formato de buscar_veiculos; None se não houver. Uma busca no índice
+        único de Veiculo.placa_norm.
+        """
+        chave = chave_placa(placa)
+        if chave is None:
+            return None
         with get_session() as s:
-            return s.exec(select(Veiculo).where(Veiculo.cliente_id == cliente_id)).all()
+            return s.exec(self._veiculos_com_dono().where(Veiculo.placa_norm == chave)).first()
+
+    @staticmethod
+    def _veiculos_com_dono():
+        return (
+            select(Veiculo.id, Veiculo.placa, Veiculo.modelo, Veiculo.cliente_id,
+                   Cliente.nome.label("cliente_nome"))
+            .join(Cliente, Cliente.id == Veiculo.cliente_id)
+        )
 
     def criar_os(self, cliente_id, veiculo_id, descricao,
              prioridade="MEDIA", mecanico=None, valor: float = 0.0,
@@ -174,7 +463,7 @@ class OSController:
             # permissão de criação
             self._check_os_permission(osr=None, role=role, username=usuario, action="create")
 
-            codigo = f"OS-{datetime.datetime.utcnow():%Y%m%d%H%M%S}"
+            codigo = self._proximos_codigos(s)[0]
             osr = OrdemServico(
                 codigo=codigo,
                 descricao=descricao,
@@ -182,7 +471,7 @@ class OSController:
                 veiculo_id=veiculo_id,
                 prioridade=prioridade,
                 mecanico=mecanico,
-                valor=float(valor or 0.0)
+                valor_centavos=para_centavos(valor)
             )
 
             # adiciona a OS e garante que o ID seja gerado
@@ -204,9 +493,238 @@ class OSController:
 
             return osr
 
+    # campos aceitos por ordem em criar_os_batch (além dos obrigatórios)
+    CAMPOS_OS_BATCH = {"prioridade", "mecanico", "valor", "status", "aberta_em"}
+
+    def criar_os_batch(self, ordens: list[dict], usuario: str | None = None,
+                       role: str | None = None) -> list[str]:
+        """
+        Cria várias OS de uma vez (ex.: lançar o atraso de ordens em papel).
+
+        Cada item de `ordens` é um dict com cliente_id, veiculo_id e
+        descricao, e opcionalmente prioridade, mecanico, valor, status e
+        aberta_em. As ordens e seus históricos de CRIACAO entram com dois
+        INSERTs em lote (executemany) e um único commit: ou todas são
+        criadas, ou nenhuma.
+        Retorna os códigos gerados, na ordem de `ordens`.
+        """
+        self._check_os_permission(osr=None, role=role, username=usuario, action="create")
+        if not ordens:
+            return []
+
+        agora = datetime.datetime.utcnow()
+        linhas = []
+        for n, o in enumerate(ordens):
+            faltando = {"cliente_id", "veiculo_id", "descricao"} - set(o)
+            if faltando:
+                raise ValueError(f"Ordem {n}: faltam {', '.join(sorted(faltando))}")
+            extras = set(o) - {"cliente_id", "veiculo_id", "descricao"} - self.CAMPOS_OS_BATCH
+            if extras:
+                raise ValueError(f"Ordem {n}: campos desconhecidos {', '.join(sorted(extras))}")
+            linhas.append({
+                "cliente_id": o["cliente_id"],
+                "veiculo_id": o["veiculo_id"],
+                "descricao": o["descricao"],
+                "status": o.get("status") or "ABERTA",
+                "prioridade": o.get("prioridade") or "MEDIA",
+                "mecanico": o.get("mecanico"),
+                "valor_centavos": para_centavos(o.get("valor")),
+                "aberta_em": o.get("aberta_em") or agora,
+            })
+
+        with get_session() as s:
+            for linha, codigo in zip(linhas, self._proximos_codigos(s, len(linhas))):
+                linha["codigo"] = codigo
+            # executemany sem RETURNING (com sort_by_parameter_order, o SQLite
+            # faria um INSERT por linha); o código (único) liga cada id à sua linha
+            s.exec(insert(OrdemServico), params=linhas)
+            codigos = [l["codigo"] for l in linhas]
+            por_codigo = dict(s.exec(
+                select(OrdemServico.codigo, OrdemServico.id).where(OrdemServico.codigo.in_(codigos))
+            ).all())
+            ids = [por_codigo[c] for c in codigos]
+            s.exec(insert(OrdemServicoHistorico), params=[
+                {
+                    "ordem_id": os_id, "usuario": usuario, "acao": "CRIACAO", "data": agora,
+                    "status": l["status"], "prioridade": l["prioridade"],
+                    "mecanico": l["mecanico"], "valor_centavos": l["valor_centavos"],
+                    "descricao": l["descricao"],
+                }
+                for os_id, l in zip(ids, linhas)
+            ])
+            s.commit()
+        return [l["codigo"] for l in linhas]
+
+    def _proximos_codigos(self, s, n: int = 1) -> list[str]:
+        """
+        Reserva `n` números da sequência de OS na transação de `s` e devolve
+        os códigos (OS-000001, ...). O UPDATE segura o lock de escrita até o
+        commit, então duas estações nunca recebem o mesmo número.
+        """
+        fim = s.exec(
+            update(Sequencia)
+            .where(Sequencia.nome == "os_codigo")
+            .values(valor=Sequencia.valor + n)
+            .returning(Sequencia.valor)
+        ).scalar_one()
+        return [f"OS-{i:06d}" for i in range(fim - n + 1, fim + 1)]
+
     def listar_os(self):
+        """Todas as OS, como OSLinha (somente leitura; para alterar use get_os_by_id)."""
         with get_session() as s:
-            return s.exec(select(OrdemServico)).all()
+            return carregar(s, OSLinha, selecionar(OSLinha, OrdemServico))
+
+    def _grid_select(self):
+        """SELECT base das linhas da grade de OS (com cliente e placa)."""
+        return (
+            select(
+                OrdemServico.id,
+                OrdemServico.codigo,
+                OrdemServico.descricao,
+                OrdemServico.status,
+                OrdemServico.prioridade,
+                OrdemServico.cliente_id,
+                OrdemServico.veiculo_id,
+                Cliente.nome.label("cliente_nome"),
+                Veiculo.placa.label("veiculo_placa"),
+                OrdemServico.mecanico,
+                (OrdemServico.valor_centavos / 100.0).label("valor"),
+                OrdemServico.valor_centavos,
+                OrdemServico.aberta_em,
+            )
+            .select_from(OrdemServico)
+            .outerjoin(Cliente, Cliente.id == OrdemServico.cliente_id)
+            .outerjoin(Veiculo, Veiculo.id == OrdemServico.veiculo_id)
+        )
+
+    def _grid_rows(self, stmt):
+        with get_session() as s:
+            rows = s.exec(stmt).all()
+        return [
+            {**r._asdict(),
+             "cliente_nome": r.cliente_nome or "",
+             "veiculo_placa": r.veiculo_placa or ""}
+            for r in rows
+        ]
+
+    def listar_os_grid(self, after: tuple | None = None, limit: int | None = None,
+                       filtros: dict | None = None, ordenar_por: str = "aberta_em",
+                       decrescente: bool = True):
+        """
+        Linhas prontas para a grade de OS (nome do cliente e placa inclusos),
+        obtidas com um único SELECT com JOIN em vez de uma consulta por ordem.
+
+        `filtros` vira WHERE (ver `_filtrar_os`) e `ordenar_por` (uma chave de
+        ORDENACAO_OS) vira ORDER BY, sempre desempatado por id. Para paginar,
+        passe em `after` a chave da última linha recebida (ver
+        `chave_pagina_os`) e o tamanho da página em `limit` (paginação por
+        chave, sem OFFSET). Retorna uma lista de dicts.
+        """
+        try:
+            col = self.ORDENACAO_OS[ordenar_por]
+        except KeyError:
+            raise ValueError(f"Coluna de ordenação inválida: {ordenar_por}")
+
+        stmt = self._filtrar_os(self._grid_select(), filtros)
+        if decrescente:
+            stmt = stmt.order_by(col.desc(), OrdemServico.id.desc())
+        else:
+            stmt = stmt.order_by(col.asc(), OrdemServico.id.asc())
+        if after is not None:
+            chave = tuple_(col, OrdemServico.id)
+            stmt = stmt.where(chave < tuple_(*after) if decrescente else chave > tuple_(*after))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return self._grid_rows(stmt)
+
+    def _filtrar_os(self, stmt, filtros: dict | None):
+        """
+        Aplica os filtros da grade. Chaves aceitas:
+            status, prioridade, mecanico, cliente_id, veiculo_id -> igualdade
+            cliente                -> prefixo do nome do cliente (sem acentos nem maiúsculas)
+            desde / ate            -> aberta_em >= desde e < ate (datetime)
+            valor_min / valor_max  -> faixa de valor em reais (inclusiva)
+        Valores None ou "" são ignorados.
+        """
+        f = {k: v for k, v in (filtros or {}).items() if v is not None and v != ""}
+        desconhecidos = set(f) - self.FILTROS_OS
+        if desconhecidos:
+            raise ValueError(f"Filtro desconhecido: {', '.join(sorted(desconhecidos))}")
+
+        for campo in ("status", "prioridade", "mecanico", "cliente_id", "veiculo_id"):
+            if campo in f:
+                stmt = stmt.where(getattr(OrdemServico, campo) == f[campo])
+        if "cliente" in f:
+            # mesma chave (e índice) de buscar_clientes; % e _ do texto não são curingas
+            nome = chave_busca(f["cliente"])
+            if nome:
+                stmt = stmt.where(self._com_prefixo(Cliente.nome_busca, nome))
+        if "desde" in f:
+            stmt = stmt.where(OrdemServico.aberta_em >= f["desde"])
+        if "ate" in f:
+            stmt = stmt.where(OrdemServico.aberta_em < f["ate"])
+        if "valor_min" in f:
+            stmt = stmt.where(OrdemServico.valor_centavos >= para_centavos(f["valor_min"]))
+        if "valor_max" in f:
+            stmt = stmt.where(OrdemServico.valor_centavos <= para_centavos(f["valor_max"]))
+        return stmt
+
+    def filtros_escopo_os(self, role: str | None, usuario: str | None) -> dict:
+        """
+        Filtro padrão da grade para o papel: o mecânico vê apenas as ordens
+        atribuídas a ele (as mesmas que _check_os_permission o deixa alterar).
+        """
+        if self._normalize_role(role) == "mecanico":
+            return {"mecanico": (usuario or "").strip()}
+        return {}
+
+    def buscar_os(self, termo: str, limit: int = 100, filtros: dict | None = None):
+        """
+        Busca textual nas OS (descrição, código, nome do cliente e placa),
+        ignorando acentos e maiúsculas. Cada palavra é tratada como prefixo
+        e todas precisam aparecer ("embreag joao"). Resultados mais
+        relevantes primeiro, no mesmo formato de listar_os_grid; `filtros`
+        funciona como em listar_os_grid.
+        """
+        palavras = re.findall(r"\w+", termo or "")
+        if not palavras:
+            return []
+
+        if not db.fts_enabled:
+            return self._buscar_os_like(palavras, limit, filtros)
+
+        # cada palavra vira um prefixo entre aspas: "palavra"*
+        match = " ".join('"' + p.replace('"', '""') + '"*' for p in palavras)
+        fts = table("ordemservico_fts", column("rowid"), column("rank"))
+        stmt = (
+            self._filtrar_os(self._grid_select(), filtros)
+            .join(fts, fts.c.rowid == OrdemServico.id)
+            .where(text("ordemservico_fts MATCH :match").bindparams(match=match))
+            .order_by(fts.c.rank)
+            .limit(limit)
+        )
+        return self._grid_rows(stmt)
+
+    def _buscar_os_like(self, palavras, limit, filtros=None):
+        # fallback para SQLite sem FTS5 (sem ranking nem acentos)
+        stmt = self._filtrar_os(self._grid_select(), filtros)
+        for p in palavras:
+            padrao = f"%{p}%"
+            stmt = stmt.where(or_(
+                OrdemServico.descricao.ilike(padrao),
+                OrdemServico.codigo.ilike(padrao),
+                Cliente.nome.ilike(padrao),
+                Veiculo.placa.ilike(padrao),
+            ))
+        stmt = stmt.order_by(OrdemServico.aberta_em.desc(), OrdemServico.id.desc()).limit(limit)
+        return self._grid_rows(stmt)
+
+    @staticmethod
+    def chave_pagina_os(row, ordenar_por: str = "aberta_em") -> tuple:
+        """Chave (coluna de ordenação, id) de uma linha da grade, usada em `after`."""
+        valor = row[OSController.CHAVES_PAGINA_OS.get(ordenar_por, ordenar_por)]
+        # colunas anuláveis são ordenadas com COALESCE(col, '')
+        return ("" if valor is None else valor, row["id"])
 
     def get_os_by_id(self, os_id):
         with get_session() as s:
@@ -221,7 +739,13 @@ class OSController:
             # checa permissão
             self._check_os_permission(osr, role=role, username=usuario, action="delete")
 
+            # com foreign_keys=ON o histórico (e o arquivado) precisa sair antes da ordem
+            s.exec(delete(OrdemServicoHistorico).where(OrdemServicoHistorico.ordem_id == os_id))
+            s.exec(delete(OrdemServicoHistoricoArquivo).where(OrdemServicoHistoricoArquivo.ordem_id == os_id))
             s.delete(osr)
+            s.flush()
+            # órfãos antigos acima do novo maior id seriam herdados pela próxima OS
+            apagar_orfaos_expostos(s)
             s.commit()
 
             # se quiser, registrar histórico de exclusão:
@@ -0,0 +1,188 @@
+# app/controllers/retencao_controller.py
+"""
+Retenção do histórico das OS.
+
+Entradas de OrdemServicoHistorico mais antigas que `dias` saem da tabela
+quente e vão para OrdemServicoHistoricoArquivo: JSON comprimido com zlib,
+uma linha por OS a cada lote, que continua consultável sob demanda
+(`ler_arquivo`, `OSController.listar_historico_os(..., incluir_arquivo=True)`).
+Entradas órfãs (de OS que já não existem, deixadas por versões antigas do
+delete_os) são apagadas. As que uma OS nova herdaria (ver
+`apagar_orfaos_expostos`) não esperam por este trabalho: saem no init_db e
+a cada exclusão de OS.
+
+O trabalho é feito em lotes de LOTE linhas, cada um em uma transação curta,
+com uma pausa entre eles: as escritas da interface esperam no máximo um lote
+pelo lock, nunca a limpeza inteira.
+
+Configuração via variáveis de ambiente:
+    AUTOMANAGER_HISTORICO_RETENCAO_DIAS   idade em dias para arquivar
+                                          (padrão 365; 0 desliga o arquivamento)
+"""
+import datetime
+import json
+import os
+import time
+import zlib
+from collections import defaultdict
+
+from sqlalchemy import delete, func, insert, select
+
+from db import get_session
+from instrumentacao import instrumentar
+from models.models import OrdemServico, OrdemServicoHistorico, OrdemServicoHistoricoArquivo
+
+RETENCAO_DIAS = int(os.environ.get("AUTOMANAGER_HISTORICO_RETENCAO_DIAS") or 365)
+
+_H = OrdemServicoHistorico.__table__
+
+
+def _comprimir(entradas: list[dict]) -> bytes:
+    return zlib.compress(json.dumps(entradas, default=datetime.datetime.isoformat).encode("utf-8"))
+
+
+def ler_arquivo(ordem_id: int) -> list[dict]:
+    """Entradas arquivadas da OS (mesmos campos do histórico), da mais recente para a mais antiga."""
+    with get_session() as s:
+        blobs = s.exec(
+            select(OrdemServicoHistoricoArquivo.dados)
+            .where(OrdemServicoHistoricoArquivo.ordem_id == ordem_id)
+        ).scalars().all()
+    entradas = []
+    for dados in blobs:
+        for e in json.loads(zlib.decompress(dados)):
+            e["data"] = datetime.datetime.fromisoformat(e["data"])
+            entradas.append(e)
+    entradas.sort(key=lambda e: (e["data"], e["id"]), reverse=True)
+    return entradas
+
+
+def apagar_orfaos_expostos(s) -> int:
+    """
+    Apaga, na sessão `s` (sem commit), as entradas de histórico e de arquivo
+    com ordem_id acima do maior id de OS. Sem AUTOINCREMENT, o SQLite dá à
+    próxima OS o maior id + 1, que herdaria essas entradas. É uma faixa no
+    índice de ordem_id, barata o bastante para o início do programa e cada
+    exclusão de OS; os demais órfãos ficam para RetencaoController.
+    """
+    maior = select(func.coalesce(func.max(OrdemServico.id), 0)).scalar_subquery()
+    apagadas = 0
+    for t in (_H, OrdemServicoHistoricoArquivo.__table__):
+        apagadas += s.exec(delete(t).where(t.c.ordem_id > maior)).rowcount
+    return apagadas
+
+
+@instrumentar
+class RetencaoController:
+    # linhas por transação
+    LOTE = 500
+
+    # segundos entre lotes, para as escritas da interface pegarem o lock
+    PAUSA = 0.05
+
+    def __init__(self, dias: int | None = None):
+        self.dias = RETENCAO_DIAS if dias is None else dias
+
+    def executar(self, progress_cb=None, is_cancelled=None) -> dict:
+        """
+        Apaga os órfãos e arquiva as entradas antigas, em lotes.
+        Chama `progress_cb(feitas, total)` a cada lote e para entre lotes se
+        `is_cancelled()` ficar verdadeiro (os lotes concluídos permanecem).
+        Retorna {"orfaos", "arquivadas", "cancelado"}.
+        """
+        corte = None
+        if self.dias > 0:
+            corte = datetime.datetime.utcnow() - datetime.timedelta(days=self.dias)
+        total = self._contar_orfaos() + (self._contar_antigas(corte) if corte else 0)
+
+        resumo = {"orfaos": 0, "arquivadas": 0, "cancelado": False}
+        etapas = [("orfaos", self._apagar_orfaos_lote)]
+        if corte:
+            etapas.append(("arquivadas", lambda: self._arquivar_lote(corte)))
+
+        feitas = 0
+        for chave, lote in etapas:
+            while True:
+                if is_cancelled and is_cancelled():
+                    resumo["cancelado"] = True
+                    return resumo
+                n = lote()
+                resumo[chave] += n
+                feitas += n
+                if progress_cb and n:
+                    progress_cb(feitas, max(total, feitas))
+                if n < self.LOTE:
+                    break
+                time.sleep(self.PAUSA)
+        return resumo
+
+    # ---------------------------
+    # Órfãos
+    # ---------------------------
+    @staticmethod
+    def _orfaos(tabela):
+        return (
+            select(tabela.c.id)
+            .outerjoin(OrdemServico, OrdemServico.id == tabela.c.ordem_id)
+            .where(OrdemServico.id.is_(None))
+        )
+
+    def _contar_orfaos(self) -> int:
+        with get_session() as s:
+            return sum(
+                s.scalar(select(func.count()).select_from(self._orfaos(t).subquery()))
+                for t in (_H, OrdemServicoHistoricoArquivo.__table__)
+            )
+
+    def _apagar_orfaos_lote(self) -> int:
+        """Apaga até LOTE entradas (de histórico ou de arquivo) sem OS."""
+        apagadas = 0
+        with get_session() as s:
+            for t in (_H, OrdemServicoHistoricoArquivo.__table__):
+                ids = s.exec(self._orfaos(t).limit(self.LOTE - apagadas)).scalars().all()
+                if ids:
+                    s.exec(delete(t).where(t.c.id.in_(ids)))
+                    apagadas += len(ids)
+                if apagadas >= self.LOTE:
+                    break
+            s.commit()
+        return apagadas
+
+    # ---------------------------
+    # Arquivamento
+    # ---------------------------
+    @staticmethod
+    def _contar_antigas(corte) -> int:
+        with get_session() as s:
+            # sem os órfãos, que já terão sido apagados
+            return s.scalar(
+                select(func.count()).select_from(_H)
+                .join(OrdemServico, OrdemServico.id == _H.c.ordem_id)
+                .where(_H.c.data < corte)
+            )
+
+    def _arquivar_lote(self, corte) -> int:
+        """Move até LOTE entradas anteriores a `corte` para o arquivo."""
+        with get_session() as s:
+            linhas = s.exec(
+                select(_H).where(_H.c.data < corte).order_by(_H.c.id).limit(self.LOTE)
+            ).mappings().all()
+            if not linhas:
+                return 0
+
+            por_ordem = defaultdict(list)
+            for r in linhas:
+                por_ordem[r["ordem_id"]].append(dict(r))
+            s.exec(insert(OrdemServicoHistoricoArquivo), params=[
+                {
+                    "ordem_id": ordem_id,
+                    "data_inicio": min(e["data"] for e in entradas),
+                    "data_fim": max(e["data"] for e in entradas),
+                    "quantidade": len(entradas),
+                    "dados": _comprimir(entradas),
+                }
+                for ordem_id, entradas in por_ordem.items()
+            ])
+            s.exec(delete(_H).where(_H.c.id.in_([r["id"] for r in linhas])))
+            s.commit()
+        return len(linhas)
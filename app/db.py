@@ -1,11 +1,395 @@
+import os
+import re
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 from sqlmodel import SQLModel, create_engine, Session
 
-DATABASE_URL = "sqlite:///automanager.db"
-engine = create_engine(DATABASE_URL, echo=False)
+import instrumentacao
+
+# Configuração via variáveis de ambiente:
+#   AUTOMANAGER_DB_URL            URL do banco (padrão: sqlite:///automanager.db)
+#   AUTOMANAGER_DB_POOL           queue (padrão) | null | static
+#   AUTOMANAGER_DB_POOL_SIZE      conexões mantidas abertas no pool "queue"
+#   AUTOMANAGER_SQLITE_<PRAGMA>   sobrescreve um pragma de SQLITE_PRAGMAS,
+#                                 ex.: AUTOMANAGER_SQLITE_JOURNAL_MODE=DELETE
+#                                 (valor vazio desliga o pragma)
+DATABASE_URL = os.environ.get("AUTOMANAGER_DB_URL", "sqlite:///automanager.db")
+
+# Perfil de desempenho aplicado a toda conexão SQLite nova
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",         # leitores não bloqueiam o escritor
+    "synchronous": "NORMAL",       # seguro com WAL e bem menos fsync
+    "cache_size": "-20000",        # negativo = KiB (~20 MB por conexão)
+    "mmap_size": "268435456",      # 256 MB de leitura via mmap
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",        # ms esperando lock antes de "database is locked"
+    "foreign_keys": "ON",
+}
+
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def load_sqlite_pragmas(env=None) -> dict:
+    """Perfil padrão com as sobrescritas de AUTOMANAGER_SQLITE_*."""
+    env = os.environ if env is None else env
+    pragmas = dict(SQLITE_PRAGMAS)
+    for name in SQLITE_PRAGMAS:
+        value = env.get(f"AUTOMANAGER_SQLITE_{name.upper()}")
+        if value is None:
+            continue
+        value = value.strip()
+        if not value:
+            pragmas.pop(name)
+        elif _PRAGMA_VALUE.match(value):
+            pragmas[name] = value
+        else:
+            raise ValueError(f"Valor inválido para o pragma {name}: {value!r}")
+    return pragmas
+
+
+def _pool_options(pool: str | None, env=None) -> dict:
+    env = os.environ if env is None else env
+    pool = (pool or env.get("AUTOMANAGER_DB_POOL") or "queue").strip().lower()
+    if pool == "null":
+        # abre/fecha uma conexão por sessão (útil com o banco em rede)
+        return {"poolclass": NullPool}
+    if pool == "static":
+        # uma única conexão compartilhada (bancos em memória)
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    if pool == "queue":
+        # uma conexão por thread do QThreadPool, sem abrir/fechar a cada sessão
+        size = int(env.get("AUTOMANAGER_DB_POOL_SIZE") or max(os.cpu_count() or 4, 4))
+        return {"poolclass": QueuePool, "pool_size": size, "max_overflow": size}
+    raise ValueError(f"Pool desconhecido: {pool!r} (use queue, null ou static)")
+
+
+def build_engine(url: str = DATABASE_URL, pragmas: dict | None = None, pool: str | None = None):
+    """
+    Cria o engine. Em SQLite, aplica `pragmas` (padrão: load_sqlite_pragmas())
+    em cada conexão aberta pelo pool. Todo comando é cronometrado
+    (instrumentacao.estatisticas e log de consultas lentas).
+    """
+    is_sqlite = url.startswith("sqlite")
+    options = _pool_options(pool) if is_sqlite else {}
+    eng = create_engine(url, echo=False, **options)
+    instrumentacao.instalar(eng)
+
+    if is_sqlite:
+        pragmas = load_sqlite_pragmas() if pragmas is None else pragmas
+
+        @event.listens_for(eng, "connect")
+        def _apply_pragmas(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cur.execute(f"PRAGMA {name}={value}")
+            finally:
+                cur.close()
+
+    return eng
+
+
+engine = build_engine()
+
+# False quando o SQLite em uso foi compilado sem FTS5 (busca cai para LIKE)
+fts_enabled = True
+
+# False fora do SQLite: sem os gatilhos de resumo_os, o painel agrega as OS direto
+resumo_enabled = True
 
 def init_db():
     import models.models as models  # garante import das classes
     SQLModel.metadata.create_all(engine)
+    _migrar_valor_centavos()
+    _migrar_historico_delta()
+    _migrar_busca_clientes()
+    _migrar_chaves_unicas()
+    _dedupe_codigos_os()
+    _apagar_historico_exposto()
+    _ensure_indexes()
+    _ensure_sequencias()
+    _ensure_fts()
+    _ensure_resumo()
+
+def _ensure_indexes():
+    """
+    create_all só cria índices junto com tabelas novas; em bancos que já
+    existiam, os índices declarados nos models são criados aqui.
+    """
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+def _migrar_valor_centavos():
+    """
+    Bancos antigos guardavam `valor` em reais (float); a coluna vira
+    `valor_centavos` (inteiro), arredondada para o centavo mais próximo.
+    """
+    with engine.begin() as conn:
+        insp = inspect(conn)
+        for tabela, ddl in (("ordemservico", "INTEGER NOT NULL DEFAULT 0"),
+                            ("ordemservicohistorico", "INTEGER")):
+            if "valor" not in {c["name"] for c in insp.get_columns(tabela)}:
+                continue
+            conn.execute(text(f"ALTER TABLE {tabela} ADD COLUMN valor_centavos {ddl}"))
+            conn.execute(text(
+                f"UPDATE {tabela} SET valor_centavos = CAST(ROUND(valor * 100) AS INTEGER) "
+                "WHERE valor IS NOT NULL"
+            ))
+            # o SQLite não remove coluna indexada
+            for ix in insp.get_indexes(tabela):
+                if "valor" in ix["column_names"]:
+                    conn.execute(text(f"DROP INDEX {ix['name']}"))
+            conn.execute(text(f"ALTER TABLE {tabela} DROP COLUMN valor"))
+
+def _migrar_historico_delta():
+    """
+    Adiciona a coluna dos deltas ao histórico de bancos antigos. As entradas
+    já gravadas continuam como fotos completas (alteracoes NULL).
+    """
+    with engine.begin() as conn:
+        colunas = {c["name"] for c in inspect(conn).get_columns("ordemservicohistorico")}
+        if "alteracoes" not in colunas:
+            conn.execute(text("ALTER TABLE ordemservicohistorico ADD COLUMN alteracoes JSON"))
+
+def _migrar_busca_clientes():
+    """
+    Adiciona a chave de busca do nome (Cliente.nome_busca) a bancos antigos
+    e a calcula para os clientes já cadastrados. A dobra de acentos é feita
+    em Python (o SQLite não tem uma função para isso).
+    """
+    from controllers.normalizacao import chave_busca
+    with engine.begin() as conn:
+        colunas = {c["name"] for c in inspect(conn).get_columns("cliente")}
+        if "nome_busca" in colunas:
+            return
+        conn.execute(text("ALTER TABLE cliente ADD COLUMN nome_busca VARCHAR NOT NULL DEFAULT ''"))
+        clientes = conn.execute(text("SELECT id, nome FROM cliente")).all()
+        if clientes:
+            conn.execute(text("UPDATE cliente SET nome_busca = :nome_busca WHERE id = :id"),
+                         [{"id": i, "nome_busca": chave_busca(nome)} for i, nome in clientes])
+
+def _migrar_chaves_unicas():
+    """
+    Adiciona as chaves normalizadas de documento e placa (Cliente.documento_norm,
+    Veiculo.placa_norm) a bancos antigos, antes de os índices únicos serem
+    criados. Quando a mesma chave aparece em mais de um registro ("abc-1234"
+    e "ABC1234"), só o mais antigo fica com ela; os demais ficam com NULL
+    (continuam nas listas, mas fora das buscas por placa/documento).
+    """
+    from controllers.normalizacao import chave_documento, chave_placa
+    with engine.begin() as conn:
+        insp = inspect(conn)
+        for tabela, coluna, origem, chave in (("cliente", "documento_norm", "documento", chave_documento),
+                                              ("veiculo", "placa_norm", "placa", chave_placa)):
+            if coluna in {c["name"] for c in insp.get_columns(tabela)}:
+                continue
+            conn.execute(text(f"ALTER TABLE {tabela} ADD COLUMN {coluna} VARCHAR"))
+            vistas, valores = set(), []
+            for id_, valor in conn.execute(text(f"SELECT id, {origem} FROM {tabela} ORDER BY id")):
+                k = chave(valor)
+                if k is not None and k not in vistas:
+                    vistas.add(k)
+                    valores.append({"id": id_, "chave": k})
+            if valores:
+                conn.execute(text(f"UPDATE {tabela} SET {coluna} = :chave WHERE id = :id"), valores)
+
+def _dedupe_codigos_os():
+    """
+    Bancos antigos geravam o código pelo horário e podiam repetir códigos;
+    antes de criar o índice único, as repetições (exceto a mais antiga)
+    ganham o id como sufixo: OS-20240101120000 -> OS-20240101120000-42.
+    """
+    with engine.begin() as conn:
+        indices = {ix["name"] for ix in inspect(conn).get_indexes("ordemservico")}
+        if "ix_ordemservico_codigo" in indices:
+            return
+        conn.execute(text("""
+            UPDATE ordemservico SET codigo = codigo || '-' || id
+            WHERE id NOT IN (SELECT MIN(id) FROM ordemservico GROUP BY codigo)
+        """))
+
+def _apagar_historico_exposto():
+    """
+    Antes de qualquer OS nova: histórico órfão que ela herdaria (ordem_id
+    acima do maior id; ver retencao_controller.apagar_orfaos_expostos).
+    """
+    from controllers.retencao_controller import apagar_orfaos_expostos
+    with get_session() as s:
+        apagar_orfaos_expostos(s)
+        s.commit()
+
+def _ensure_sequencias():
+    """
+    Cria o contador dos códigos de OS começando depois do maior código
+    já emitido no formato sequencial (OS-000123).
+    """
+    with engine.begin() as conn:
+        existe = conn.execute(text(
+            "SELECT 1 FROM sequencia WHERE nome = 'os_codigo'"
+        )).first()
+        if existe:
+            return
+        codigos = conn.execute(text(
+            "SELECT codigo FROM ordemservico WHERE codigo LIKE 'OS-%' AND length(codigo) < 17"
+        )).scalars()
+        ultimo = max((int(c[3:]) for c in codigos if c[3:].isdigit()), default=0)
+        conn.execute(text(
+            "INSERT INTO sequencia (nome, valor) VALUES ('os_codigo', :valor)"
+        ), {"valor": ultimo})
 
 def get_session() -> Session:
     return Session(engine)
+
+# Índice de texto completo das OS (descrição, código, nome do cliente e placa).
+# rowid = ordemservico.id; remove_diacritics faz "embreagem" achar "Embréagem".
+_FTS_TABLE = """
+CREATE VIRTUAL TABLE ordemservico_fts USING fts5(
+    codigo, descricao, cliente_nome, veiculo_placa,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+_FTS_POPULATE = """
+INSERT INTO ordemservico_fts (rowid, codigo, descricao, cliente_nome, veiculo_placa)
+SELECT o.id, o.codigo, o.descricao, c.nome, v.placa
+FROM ordemservico o
+LEFT JOIN cliente c ON c.id = o.cliente_id
+LEFT JOIN veiculo v ON v.id = o.veiculo_id
+"""
+
+# gatilhos que mantêm o índice em dia a cada INSERT/UPDATE/DELETE
+_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS ordemservico_fts_ai AFTER INSERT ON ordemservico BEGIN
+        INSERT INTO ordemservico_fts (rowid, codigo, descricao, cliente_nome, veiculo_placa)
+        VALUES (new.id, new.codigo, new.descricao,
+                (SELECT nome FROM cliente WHERE id = new.cliente_id),
+                (SELECT placa FROM veiculo WHERE id = new.veiculo_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ordemservico_fts_ad AFTER DELETE ON ordemservico BEGIN
+        DELETE FROM ordemservico_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ordemservico_fts_au
+    AFTER UPDATE OF codigo, descricao, cliente_id, veiculo_id ON ordemservico BEGIN
+        UPDATE ordemservico_fts
+        SET codigo = new.codigo,
+            descricao = new.descricao,
+            cliente_nome = (SELECT nome FROM cliente WHERE id = new.cliente_id),
+            veiculo_placa = (SELECT placa FROM veiculo WHERE id = new.veiculo_id)
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS cliente_fts_au AFTER UPDATE OF nome ON cliente BEGIN
+        UPDATE ordemservico_fts SET cliente_nome = new.nome
+        WHERE rowid IN (SELECT id FROM ordemservico WHERE cliente_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS veiculo_fts_au AFTER UPDATE OF placa ON veiculo BEGIN
+        UPDATE ordemservico_fts SET veiculo_placa = new.placa
+        WHERE rowid IN (SELECT id FROM ordemservico WHERE veiculo_id = new.id);
+    END
+    """,
+]
+
+
+def _ensure_fts():
+    """Cria (e popula, na primeira vez) o índice FTS5 e seus gatilhos."""
+    global fts_enabled
+    if engine.dialect.name != "sqlite":
+        fts_enabled = False
+        return
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ordemservico_fts'"
+            )).first()
+            if not exists:
+                conn.execute(text(_FTS_TABLE))
+                conn.execute(text(_FTS_POPULATE))
+            for ddl in _FTS_TRIGGERS:
+                conn.execute(text(ddl))
+    except OperationalError as ex:
+        if "fts5" not in str(ex):
+            raise
+        # SQLite sem o módulo fts5
+        fts_enabled = False
+
+
+# Totais por dia × status × mecânico (tabela resumo_os), mantidos pelos
+# gatilhos abaixo a cada INSERT/UPDATE/DELETE de ordemservico, inclusive
+# os INSERTs em lote. O painel lê só esta tabela, que cresce com o número de
+# dias, não com o de ordens. O dia é o de aberta_em (UTC).
+_RESUMO_POPULATE = """
+INSERT INTO resumo_os (dia, status, mecanico, quantidade, total_centavos)
+SELECT date(aberta_em), status, COALESCE(mecanico, ''), COUNT(*), SUM(valor_centavos)
+FROM ordemservico
+GROUP BY date(aberta_em), status, COALESCE(mecanico, '')
+"""
+
+_RESUMO_SOMA = """
+    INSERT INTO resumo_os (dia, status, mecanico, quantidade, total_centavos)
+    VALUES (date(new.aberta_em), new.status, COALESCE(new.mecanico, ''), 1, new.valor_centavos)
+    ON CONFLICT (dia, status, mecanico) DO UPDATE SET
+        quantidade = quantidade + 1,
+        total_centavos = total_centavos + excluded.total_centavos;
+"""
+
+_RESUMO_SUBTRAI = """
+    UPDATE resumo_os
+    SET quantidade = quantidade - 1, total_centavos = total_centavos - old.valor_centavos
+    WHERE dia = date(old.aberta_em) AND status = old.status
+      AND mecanico = COALESCE(old.mecanico, '');
+    DELETE FROM resumo_os
+    WHERE dia = date(old.aberta_em) AND status = old.status
+      AND mecanico = COALESCE(old.mecanico, '') AND quantidade = 0;
+"""
+
+_RESUMO_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_os_ai AFTER INSERT ON ordemservico BEGIN
+        {_RESUMO_SOMA}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_os_ad AFTER DELETE ON ordemservico BEGIN
+        {_RESUMO_SUBTRAI}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_os_au
+    AFTER UPDATE OF status, mecanico, valor_centavos, aberta_em ON ordemservico BEGIN
+        {_RESUMO_SUBTRAI}
+        {_RESUMO_SOMA}
+    END
+    """,
+]
+
+
+def _ensure_resumo():
+    """
+    Cria os gatilhos de resumo_os. Se ainda não existiam (banco novo ou
+    anterior ao painel), a tabela é recalculada a partir das OS.
+    """
+    global resumo_enabled
+    if engine.dialect.name != "sqlite":
+        resumo_enabled = False
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'resumo_os_ai'"
+        )).first()
+        if not exists:
+            conn.execute(text("DELETE FROM resumo_os"))
+            conn.execute(text(_RESUMO_POPULATE))
+        for ddl in _RESUMO_TRIGGERS:
+            conn.execute(text(ddl))
@@ -0,0 +1,40 @@
+# app/importar.py
+"""
+Importa clientes e veículos de um CSV sem abrir a interface.
+
+Uso (a partir de app/):
+    python importar.py clientes.csv [--relatorio rejeitados.csv] [--processos N]
+"""
+import argparse
+import sys
+
+from db import init_db
+from controllers.import_controller import ImportController
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("arquivo")
+    parser.add_argument("--relatorio", help="CSV das linhas recusadas (padrão: <arquivo>.rejeitados.csv)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="processos de validação (0 = nenhum; padrão: automático)")
+    args = parser.parse_args(argv)
+
+    init_db()
+
+    def progresso(feitas, total):
+        print(f"\r{feitas}/{total} linhas", end="", file=sys.stderr, flush=True)
+
+    resumo = ImportController().importar_clientes_veiculos(
+        args.arquivo, relatorio=args.relatorio, processos=args.processos, progress_cb=progresso,
+    )
+    print(file=sys.stderr)
+    print(f"{resumo['clientes']} clientes e {resumo['veiculos']} veículos importados; "
+          f"{resumo['rejeitadas']} linhas recusadas")
+    if resumo["relatorio"]:
+        print(f"Relatório de recusas: {resumo['relatorio']}")
+    return 1 if resumo["rejeitadas"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# app/instrumentacao.py
+"""
+Instrumentação das consultas SQL.
+
+Cada comando executado pelo engine (db.build_engine) é cronometrado e
+atribuído ao método de controller que o emitiu (ex.: "OSController.update_os",
+marcado por @instrumentar). Os tempos se acumulam em `estatisticas`, que
+alimenta o diálogo de diagnóstico, e comandos acima do limiar vão para um log
+rotativo de consultas lentas.
+
+O tempo medido é o da execução no driver. No SQLite, um SELECT entrega as
+linhas aos poucos durante o fetch; por isso seu número de linhas fica
+indefinido (o driver informa -1) e só INSERT/UPDATE/DELETE o registram.
+
+Configuração via variáveis de ambiente:
+    AUTOMANAGER_SQL_LENTA_MS   limiar do log de consultas lentas em ms (padrão 200)
+    AUTOMANAGER_SQL_LOG        arquivo do log (padrão consultas_lentas.log; vazio desliga)
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+LIMITE_LENTA_MS = float(os.environ.get("AUTOMANAGER_SQL_LENTA_MS") or 200)
+LOG_PATH = os.environ.get("AUTOMANAGER_SQL_LOG", "consultas_lentas.log")
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+logger = logging.getLogger("automanager.sql")
+
+# método de controller em execução na thread/contexto atual
+_origem = contextvars.ContextVar("origem_sql", default=None)
+
+_ESPACOS = re.compile(r"\s+")
+# listas de parâmetros de tamanho variável (IN (?, ?, ...), VALUES em lote)
+_LISTA_PARAMETROS = re.compile(r"\?(?:\s*,\s*\?)+")
+_GRUPOS_REPETIDOS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+
+
+def normalizar_sql(sql: str) -> str:
+    """Uma linha só e listas de placeholders colapsadas: comandos iguais agrupam juntos."""
+    sql = _ESPACOS.sub(" ", sql).strip()
+    sql = _LISTA_PARAMETROS.sub("?, ...", sql)
+    return _GRUPOS_REPETIDOS.sub(r"\1, ...", sql)
+
+
+def formato_parametros(parametros, executemany: bool = False) -> str:
+    """Formato dos parâmetros sem os valores: "3", "500x4" (executemany) ou "-"."""
+    if executemany:
+        primeiro = parametros[0] if parametros else ()
+        return f"{len(parametros)}x{len(primeiro)}"
+    return str(len(parametros)) if parametros else "-"
+
+
+def origem_atual() -> str | None:
+    return _origem.get()
+
+
+def _rotular(rotulo: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # chamadas aninhadas (um método público chamando outro) ficam com o rótulo de fora
+        if _origem.get() is not None:
+            return fn(*args, **kwargs)
+        token = _origem.set(rotulo)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _origem.reset(token)
+    return wrapper
+
+
+def instrumentar(cls):
+    """
+    Decorador de classe: os métodos públicos passam a rotular os comandos
+    SQL que emitem com "Classe.metodo". Métodos estáticos/de classe e
+    geradores não são alterados.
+    """
+    for nome, attr in list(vars(cls).items()):
+        if nome.startswith("_") or not inspect.isfunction(attr) or inspect.isgeneratorfunction(attr):
+            continue
+        setattr(cls, nome, _rotular(f"{cls.__name__}.{nome}", attr))
+    return cls
+
+
+class EstatisticasSQL:
+    """Totais por (comando normalizado, origem), seguro para as threads do QThreadPool."""
+
+    def __init__(self, limite_lenta_ms: float = LIMITE_LENTA_MS):
+        self.limite_lenta_ms = limite_lenta_ms
+        self._lock = threading.Lock()
+        self._dados = {}    # (comando, origem) -> [execucoes, total_ms, max_ms, linhas]
+        self.desde = time.time()
+
+    def registrar(self, sql: str, origem: str | None, ms: float, linhas: int | None = None,
+                  parametros: str = "-"):
+        comando = normalizar_sql(sql)
+        with self._lock:
+            d = self._dados.get((comando, origem))
+            if d is None:
+                d = self._dados[(comando, origem)] = [0, 0.0, 0.0, None]
+            d[0] += 1
+            d[1] += ms
+            if ms > d[2]:
+                d[2] = ms
+            if linhas is not None:
+                d[3] = (d[3] or 0) + linhas
+        if ms >= self.limite_lenta_ms:
+            logger.warning("%.1f ms | %s | linhas=%s | params=%s | %s",
+                           ms, origem or "-", "-" if linhas is None else linhas, parametros, comando)
+
+    def top(self, por: str = "total_ms", n: int = 20) -> list[dict]:
+        """Os `n` comandos com maior `por` (total_ms, execucoes, max_ms ou media_ms)."""
+        with self._lock:
+            itens = [
+                {
+                    "comando": comando,
+                    "origem": origem,
+                    "execucoes": execucoes,
+                    "total_ms": total,
+                    "media_ms": total / execucoes,
+                    "max_ms": maximo,
+                    "linhas": linhas,
+                }
+                for (comando, origem), (execucoes, total, maximo, linhas) in self._dados.items()
+            ]
+        itens.sort(key=lambda i: i[por], reverse=True)
+        return itens[:n]
+
+    def totais(self) -> dict:
+        with self._lock:
+            return {
+                "comandos": len(self._dados),
+                "execucoes": sum(d[0] for d in self._dados.values()),
+                "total_ms": sum(d[1] for d in self._dados.values()),
+                "desde": self.desde,
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._dados.clear()
+            self.desde = time.time()
+
+
+# instância compartilhada por todos os engines do processo
+estatisticas = EstatisticasSQL()
+
+
+def _configurar_log():
+    if logger.handlers:
+        return
+    # o log de consultas lentas não se mistura ao log geral do programa
+    logger.propagate = False
+    if not LOG_PATH:
+        logger.addHandler(logging.NullHandler())
+        return
+    handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                  encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING)
+
+
+def instalar(eng, destino: EstatisticasSQL | None = None):
+    """Registra os eventos de cronometragem em `eng`."""
+    _configurar_log()
+    destino = destino or estatisticas
+
+    @event.listens_for(eng, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("instrumentacao_inicio", []).append(time.perf_counter())
+
+    @event.listens_for(eng, "after_cursor_execute")
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        ms = (time.perf_counter() - conn.info["instrumentacao_inicio"].pop()) * 1000
+        linhas = cursor.rowcount
+        destino.registrar(
+            statement, _origem.get(), ms,
+            linhas if linhas is not None and linhas >= 0 else None,
+            formato_parametros(parameters, executemany),
+        )
+
+    # um comando que falha não chega a after_cursor_execute
+    @event.listens_for(eng, "handle_error")
+    def _erro(ctx):
+        if ctx.connection is not None:
+            inicio = ctx.connection.info.get("instrumentacao_inicio")
+            if inicio:
+                inicio.pop()
+
+
+@contextlib.contextmanager
+def capturar(eng):
+    """
+    Lista, enquanto o bloco roda, os comandos (sql, parametros) executados
+    em `eng` por qualquer thread. Usado pelas verificações de contagem de
+    consultas (benchmarks.verificar_consultas).
+    """
+    comandos = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        comandos.append((statement, parameters))
+
+    event.listen(eng, "after_cursor_execute", _registrar)
+    try:
+        yield comandos
+    finally:
+        event.remove(eng, "after_cursor_execute", _registrar)
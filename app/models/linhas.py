@@ -0,0 +1,78 @@
+# app/models/linhas.py
+"""
+Linhas somente leitura devolvidas pelas listagens dos controllers.
+
+São namedtuples (ou classes com __slots__) montadas a partir de um SELECT
+coluna a coluna, sem criar objetos do ORM: nada de validação do pydantic,
+de identity map ou de estado de sessão por linha. Os models de models.py
+continuam sendo usados nas escritas.
+"""
+from collections import namedtuple
+from typing import Optional
+
+from sqlmodel import select
+
+
+ClienteLinha = namedtuple("ClienteLinha", "id nome documento telefone email")
+
+VeiculoLinha = namedtuple("VeiculoLinha", "id placa marca modelo ano cliente_id")
+
+# sem o hash da senha
+UsuarioLinha = namedtuple("UsuarioLinha", "id username nome role")
+
+
+class OSLinha(namedtuple("OSLinha", "id codigo descricao status prioridade aberta_em "
+                                    "cliente_id veiculo_id mecanico valor_centavos")):
+    __slots__ = ()
+
+    @property
+    def valor(self) -> float:
+        """Valor em reais (para exibição)."""
+        return (self.valor_centavos or 0) / 100
+
+
+class HistoricoLinha:
+    """
+    Entrada do histórico de uma OS. Não é uma tupla porque
+    OSController._remontar_historico preenche as fotos depois da leitura.
+    """
+    __slots__ = ("id", "ordem_id", "data", "usuario", "acao", "status", "prioridade",
+                 "mecanico", "valor_centavos", "descricao", "alteracoes")
+    _fields = __slots__
+
+    def __init__(self, id, ordem_id, data, usuario=None, acao="ATUALIZACAO", status=None,
+                 prioridade=None, mecanico=None, valor_centavos=None, descricao=None,
+                 alteracoes=None):
+        self.id = id
+        self.ordem_id = ordem_id
+        self.data = data
+        self.usuario = usuario
+        self.acao = acao
+        self.status = status
+        self.prioridade = prioridade
+        self.mecanico = mecanico
+        self.valor_centavos = valor_centavos
+        self.descricao = descricao
+        self.alteracoes = alteracoes
+
+    @classmethod
+    def _make(cls, valores):
+        return cls(*valores)
+
+    @property
+    def valor(self) -> Optional[float]:
+        """Valor em reais (para exibição)."""
+        return None if self.valor_centavos is None else self.valor_centavos / 100
+
+    def __repr__(self):
+        return f"HistoricoLinha(id={self.id}, ordem_id={self.ordem_id}, acao={self.acao!r})"
+
+
+def selecionar(linha, model):
+    """SELECT só das colunas de `model` que formam `linha`, na ordem de `linha._fields`."""
+    return select(*(getattr(model, campo) for campo in linha._fields))
+
+
+def carregar(s, linha, stmt) -> list:
+    """Executa `stmt` (de `selecionar`) em `s` e monta as linhas sem passar pelo ORM."""
+    return list(map(linha._make, s.exec(stmt)))
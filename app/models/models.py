@@ -1,21 +1,45 @@
 # app/models/models.py
 from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import JSON, Column, Index
 import datetime
 
 class OrdemServicoHistorico(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     ordem_id: int = Field(foreign_key="ordemservico.id")
 
-    data: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
+    data: datetime.datetime = Field(default_factory=datetime.datetime.utcnow, index=True)
     usuario: Optional[str] = None
     acao: str = "ATUALIZACAO"  # CRIACAO / ATUALIZACAO / EXCLUSAO
 
+    # CRIACAO guarda a foto completa nas colunas abaixo; ATUALIZACAO guarda só
+    # os campos alterados em `alteracoes` ({campo: [antigo, novo]}) e deixa as
+    # colunas vazias (OSController.listar_historico_os remonta as fotos)
     status: Optional[str] = None
     prioridade: Optional[str] = None
     mecanico: Optional[str] = None
-    valor: Optional[float] = None
+    valor_centavos: Optional[int] = None
     descricao: Optional[str] = None
+    alteracoes: Optional[dict] = Field(default=None, sa_column=Column(JSON(none_as_null=True)))
+
+    @property
+    def valor(self) -> Optional[float]:
+        """Valor em reais (para exibição)."""
+        return None if self.valor_centavos is None else self.valor_centavos / 100
+
+
+class OrdemServicoHistoricoArquivo(SQLModel, table=True):
+    """
+    Entradas antigas do histórico de uma OS, movidas pela retenção
+    (controllers/retencao_controller.py): `dados` é a lista das entradas em
+    JSON comprimido com zlib, uma linha por OS a cada execução.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    ordem_id: int = Field(foreign_key="ordemservico.id", index=True)
+    data_inicio: datetime.datetime
+    data_fim: datetime.datetime
+    quantidade: int = 0
+    dados: bytes
 
 
 class User(SQLModel, table=True):
@@ -30,8 +54,13 @@ class User(SQLModel, table=True):
 class Cliente(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     nome: str
+    # nome sem acentos e em minúsculas (normalizacao.chave_busca), para a
+    # busca por prefixo dos seletores de cliente
+    nome_busca: str = Field(default="", index=True)
     documento: Optional[str] = None
-    telefone: Optional[str] = None
+    # documento só com dígitos (normalizacao.chave_documento): um cliente por documento
+    documento_norm: Optional[str] = Field(default=None, unique=True, index=True)
+    telefone: Optional[str] = Field(default=None, index=True)
     email: Optional[str] = None
     veiculos: List["Veiculo"] = Relationship(back_populates="cliente")
 
@@ -39,21 +68,56 @@ class Cliente(SQLModel, table=True):
 class Veiculo(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     placa: str
+    # placa em maiúsculas, sem hífen (normalizacao.chave_placa): um veículo por placa
+    placa_norm: Optional[str] = Field(default=None, unique=True, index=True)
     marca: Optional[str] = None
     modelo: Optional[str] = None
     ano: Optional[int] = None
-    cliente_id: Optional[int] = Field(default=None, foreign_key="cliente.id")
+    cliente_id: Optional[int] = Field(default=None, foreign_key="cliente.id", index=True)
     cliente: Optional[Cliente] = Relationship(back_populates="veiculos")
 
 
 class OrdemServico(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    codigo: str
+    codigo: str = Field(index=True, unique=True)
     descricao: str
-    status: str = "ABERTA"
-    prioridade: str = "MEDIA"
-    aberta_em: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
-    cliente_id: int = Field(foreign_key="cliente.id")
-    veiculo_id: int = Field(foreign_key="veiculo.id")
-    mecanico: Optional[str] = None
-    valor: float = Field(default=0.0)
+    status: str = Field(default="ABERTA", index=True)
+    prioridade: str = Field(default="MEDIA", index=True)
+    aberta_em: datetime.datetime = Field(default_factory=datetime.datetime.utcnow, index=True)
+    cliente_id: int = Field(foreign_key="cliente.id", index=True)
+    veiculo_id: int = Field(foreign_key="veiculo.id", index=True)
+    mecanico: Optional[str] = Field(default=None, index=True)
+    # em centavos: somas e comparações no SQL são exatas
+    valor_centavos: int = Field(default=0, index=True)
+
+    @property
+    def valor(self) -> float:
+        """Valor em reais (para exibição)."""
+        return (self.valor_centavos or 0) / 100
+
+
+class Sequencia(SQLModel, table=True):
+    """Contadores persistentes (ex.: "os_codigo" -> último número de OS emitido)."""
+    nome: str = Field(primary_key=True)
+    valor: int = 0
+
+
+class ResumoOS(SQLModel, table=True):
+    """
+    Totais das OS por dia de abertura × status × mecânico, mantidos pelos
+    gatilhos criados em db._ensure_resumo. Alimenta o painel.
+    """
+    __tablename__ = "resumo_os"
+    dia: datetime.date = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    mecanico: str = Field(default="", primary_key=True)  # "" = sem mecânico
+    quantidade: int = 0
+    total_centavos: int = 0
+
+
+# histórico de uma OS, do mais recente para o mais antigo (listar_historico_os)
+Index(
+    "ix_ordemservicohistorico_ordem_id_data",
+    OrdemServicoHistorico.ordem_id,
+    OrdemServicoHistorico.data.desc(),
+)
@@ -0,0 +1,103 @@
+# views/diagnostico_dialog.py
+import datetime
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget,
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
+)
+
+import instrumentacao
+
+
+class DiagnosticoDialog(QDialog):
+    """Comandos SQL mais caros desde a abertura do programa (ou desde o último "Zerar")."""
+
+    COLUNAS = ["Origem", "Execuções", "Total (ms)", "Média (ms)", "Máx. (ms)", "Linhas", "Comando"]
+    TOP = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico de consultas")
+        self.resize(1000, 520)
+        self.estatisticas = instrumentacao.estatisticas
+        self._setup_ui()
+        self.atualizar()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.lbl_resumo = QLabel("")
+        layout.addWidget(self.lbl_resumo)
+        log = instrumentacao.LOG_PATH or "desligado"
+        layout.addWidget(QLabel(
+            f"Consultas acima de {self.estatisticas.limite_lenta_ms:g} ms vão para o log: {log}"
+        ))
+
+        self.tabs = QTabWidget()
+        self.tbl_tempo = self._tabela()
+        self.tbl_contagem = self._tabela()
+        self.tabs.addTab(self.tbl_tempo, "Por tempo total")
+        self.tabs.addTab(self.tbl_contagem, "Por execuções")
+        layout.addWidget(self.tabs)
+
+        h = QHBoxLayout()
+        btn_atualizar = QPushButton("Atualizar")
+        btn_atualizar.clicked.connect(self.atualizar)
+        btn_zerar = QPushButton("Zerar")
+        btn_zerar.clicked.connect(self.zerar)
+        btn_fechar = QPushButton("Fechar")
+        btn_fechar.clicked.connect(self.accept)
+        h.addWidget(btn_atualizar)
+        h.addWidget(btn_zerar)
+        h.addStretch()
+        h.addWidget(btn_fechar)
+        layout.addLayout(h)
+
+    def _tabela(self):
+        t = QTableWidget(0, len(self.COLUNAS))
+        t.setHorizontalHeaderLabels(self.COLUNAS)
+        t.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        t.setSelectionBehavior(QAbstractItemView.SelectRows)
+        t.verticalHeader().setVisible(False)
+        t.setWordWrap(False)
+        t.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        t.horizontalHeader().setStretchLastSection(True)
+        return t
+
+    def atualizar(self):
+        # as estatísticas ficam em memória: ler na thread da interface é barato
+        totais = self.estatisticas.totais()
+        desde = datetime.datetime.fromtimestamp(totais["desde"]).strftime("%d/%m/%Y %H:%M")
+        self.lbl_resumo.setText(
+            f"Desde {desde}: {totais['execucoes']} execuções de {totais['comandos']} comandos, "
+            f"{totais['total_ms']:.0f} ms no banco."
+        )
+        self._preencher(self.tbl_tempo, self.estatisticas.top("total_ms", self.TOP))
+        self._preencher(self.tbl_contagem, self.estatisticas.top("execucoes", self.TOP))
+
+    def zerar(self):
+        self.estatisticas.limpar()
+        self.atualizar()
+
+    @staticmethod
+    def _preencher(table, itens):
+        table.setRowCount(len(itens))
+        for row, i in enumerate(itens):
+            valores = (
+                i["origem"] or "(sem origem)",
+                str(i["execucoes"]),
+                f"{i['total_ms']:.1f}",
+                f"{i['media_ms']:.2f}",
+                f"{i['max_ms']:.1f}",
+                "—" if i["linhas"] is None else str(i["linhas"]),
+                i["comando"],
+            )
+            for col, v in enumerate(valores):
+                item = QTableWidgetItem(v)
+                if 0 < col < 6:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if col == 6:
+                    item.setToolTip(v)
+                table.setItem(row, col, item)
@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (
 )
 from controllers.os_controller import OSController
 from controllers.auth_controller import AuthController
+from views.workers import TaskRunner
 
 class EditOSDialog(QDialog):
     def __init__(self, os_obj, current_user=None, parent=None):
@@ -14,6 +15,7 @@ class EditOSDialog(QDialog):
         self.current_user = current_user
         self.ctrl = OSController()
         self.auth_ctrl = AuthController()
+        self.runner = TaskRunner(self)
         # papel do usuário
         self.user_role = ""
         if self.current_user is not None:
@@ -55,12 +57,18 @@ class EditOSDialog(QDialog):
 
         layout.addLayout(form)
 
+        # indicador de carregamento/gravação em segundo plano
+        self.lbl_busy = QLabel("Carregando...")
+        self.lbl_busy.hide()
+        self.runner.busy_changed.connect(self.lbl_busy.setVisible)
+        layout.addWidget(self.lbl_busy)
+
         h = QHBoxLayout()
-        btn_save = QPushButton("Salvar")
-        btn_save.clicked.connect(self.on_save)
+        self.btn_save = QPushButton("Salvar")
+        self.btn_save.clicked.connect(self.on_save)
         btn_cancel = QPushButton("Cancelar")
         btn_cancel.clicked.connect(self.reject)
-        h.addWidget(btn_save); h.addWidget(btn_cancel)
+        h.addWidget(self.btn_save); h.addWidget(btn_cancel)
         layout.addLayout(h)
 
         # --- restrições por papel ---
@@ -77,7 +85,6 @@ class EditOSDialog(QDialog):
         self.input_descricao.setText(getattr(self.os, "descricao", "") or "")
         status = getattr(self.os, "status", "ABERTA")
         prioridade = getattr(self.os, "prioridade", "MEDIA")
-        mecanico = getattr(self.os, "mecanico", "") or ""
         try:
             self.combo_status.setCurrentText(status)
         except Exception:
@@ -89,33 +96,15 @@ class EditOSDialog(QDialog):
 
         # mecânicos
         self.combo_mecanico.clear()
-        try:
-            users = self.auth_ctrl.list_users()
-            mecanicos = [u for u in users if (getattr(u, "role", "") or "").strip().lower() == "mecanico"]
-            self.combo_mecanico.addItem("Nenhum", userData=None)
-            sel_idx = 0
-            for idx, u in enumerate(mecanicos, start=1):
-                display = f"{u.nome or u.username} ({u.username})"
-                self.combo_mecanico.addItem(display, userData=u.username)
-                if u.username == mecanico:
-                    sel_idx = idx
-            self.combo_mecanico.setCurrentIndex(sel_idx)
-        except Exception:
-            self.combo_mecanico.addItem("Nenhum", userData=None)
+        self.combo_mecanico.addItem("Nenhum", userData=None)
+        self.runner.submit(self.auth_ctrl.list_mecanicos, on_result=self._fill_mecanicos)
 
         # veículos
         cliente_id = getattr(self.os, "cliente_id", None)
         self.combo_veiculo.clear()
         if cliente_id:
-            veiculos = self.ctrl.listar_veiculos_por_cliente(cliente_id)
-            sel = 0
-            for idx, v in enumerate(veiculos):
-                display = f"{v.placa} — {v.marca or ''} {v.modelo or ''}".strip()
-                self.combo_veiculo.addItem(display, userData=v.id)
-                if v.id == getattr(self.os, "veiculo_id", None):
-                    sel = idx
-            if self.combo_veiculo.count() > 0:
-                self.combo_veiculo.setCurrentIndex(sel)
+            self.runner.submit(self.ctrl.listar_veiculos_por_cliente, cliente_id,
+                               on_result=self._fill_veiculos)
         else:
             self.combo_veiculo.addItem("Nenhum", userData=None)
 
@@ -126,6 +115,31 @@ class EditOSDialog(QDialog):
         except Exception:
             self.input_valor.setText("0.00")
 
+    def _fill_mecanicos(self, mecanicos):
+        mecanico = getattr(self.os, "mecanico", "") or ""
+        sel_idx = 0
+        for idx, u in enumerate(mecanicos, start=1):
+            display = f"{u.nome or u.username} ({u.username})"
+            self.combo_mecanico.addItem(display, userData=u.username)
+            if u.username == mecanico:
+                sel_idx = idx
+        self.combo_mecanico.setCurrentIndex(sel_idx)
+
+    def _fill_veiculos(self, veiculos):
+        sel = 0
+        for idx, v in enumerate(veiculos):
+            display = f"{v.placa} — {v.marca or ''} {v.modelo or ''}".strip()
+            self.combo_veiculo.addItem(display, userData=v.id)
+            if v.id == getattr(self.os, "veiculo_id", None):
+                sel = idx
+        if self.combo_veiculo.count() > 0:
+            self.combo_veiculo.setCurrentIndex(sel)
+
+    def done(self, result):
+        # descarta cargas/gravações ainda em andamento ao fechar
+        self.runner.cancel_all()
+        super().done(result)
+
     def on_save(self):
         # Descrição obrigatória
         descricao = self.input_descricao.text().strip()
@@ -155,19 +169,7 @@ class EditOSDialog(QDialog):
             usuario = getattr(self.current_user, "username", None)
             role = getattr(self.current_user, "role", None)
 
-        # Chamada ao controller
-        try:
-            updated = self.ctrl.update_os(
-                os_id=self.os.id,
-                descricao=descricao,
-                status=status,
-                prioridade=prioridade,
-                mecanico=mecanico,
-                veiculo_id=veiculo_id,
-                valor=valor,
-                usuario=usuario,
-                role=role,
-            )
+        def on_result(updated):
             if updated is None:
                 QMessageBox.warning(self, "Erro", "Ordem não encontrada.")
                 self.reject()
@@ -176,7 +178,29 @@ class EditOSDialog(QDialog):
             QMessageBox.information(self, "Ok", "Ordem atualizada com sucesso.")
             self.accept()
 
-        except PermissionError as ex:
-            QMessageBox.warning(self, "Acesso negado", str(ex))
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao atualizar OS: {ex}")
+        def on_error(ex):
+            if isinstance(ex, PermissionError):
+                QMessageBox.warning(self, "Acesso negado", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao atualizar OS: {ex}")
+
+        def on_finished():
+            self.btn_save.setEnabled(True)
+
+        # Chamada ao controller (em segundo plano)
+        self.btn_save.setEnabled(False)
+        self.runner.submit(
+            self.ctrl.update_os,
+            os_id=self.os.id,
+            descricao=descricao,
+            status=status,
+            prioridade=prioridade,
+            mecanico=mecanico,
+            veiculo_id=veiculo_id,
+            valor=valor,
+            usuario=usuario,
+            role=role,
+            on_result=on_result,
+            on_error=on_error,
+            on_finished=on_finished,
+        )
@@ -0,0 +1,120 @@
+# views/import_dialog.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+    QPushButton, QProgressBar, QFileDialog, QMessageBox
+)
+from controllers.import_controller import ImportController
+from views.workers import TaskRunner
+
+
+class ImportDialog(QDialog):
+    """Importação de clientes e veículos a partir de um CSV."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Importar clientes e veículos")
+        self.ctrl = ImportController()
+        self.runner = TaskRunner(self)
+        self.imported = False
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        layout.addWidget(QLabel(
+            "CSV com cabeçalho: nome, documento, telefone, email, placa, marca, modelo, ano.\n"
+            "Uma linha por veículo; linhas com o mesmo documento são o mesmo cliente."
+        ))
+
+        h = QHBoxLayout()
+        self.input_path = QLineEdit()
+        self.input_path.setPlaceholderText("Arquivo CSV")
+        btn_browse = QPushButton("Escolher...")
+        btn_browse.clicked.connect(self._choose_file)
+        h.addWidget(self.input_path)
+        h.addWidget(btn_browse)
+        layout.addLayout(h)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 1)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setWordWrap(True)
+        layout.addWidget(self.lbl_status)
+
+        h = QHBoxLayout()
+        self.btn_import = QPushButton("Importar")
+        self.btn_import.clicked.connect(self.on_import)
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.clicked.connect(self.on_cancel)
+        self.btn_cancel.setEnabled(False)
+        btn_close = QPushButton("Fechar")
+        btn_close.clicked.connect(self.accept)
+        h.addStretch()
+        h.addWidget(self.btn_import)
+        h.addWidget(self.btn_cancel)
+        h.addWidget(btn_close)
+        layout.addLayout(h)
+
+        # também cobre a tarefa cancelada, que só libera a tela quando de fato para
+        self.runner.busy_changed.connect(self._set_running)
+
+    def done(self, result):
+        # os lotes já gravados ficam; o restante é interrompido
+        self.runner.cancel_all()
+        super().done(result)
+
+    def _choose_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Importar CSV", "", "CSV Files (*.csv)")
+        if path:
+            self.input_path.setText(path)
+
+    def _set_running(self, running):
+        self.btn_import.setEnabled(not running)
+        self.btn_cancel.setEnabled(running)
+        self.input_path.setEnabled(not running)
+
+    def on_import(self):
+        path = self.input_path.text().strip()
+        if not path:
+            QMessageBox.warning(self, "Importar", "Escolha um arquivo CSV.")
+            return
+
+        def on_progress(feitas, total):
+            self.progress.setMaximum(max(total, 1))
+            self.progress.setValue(min(feitas, total))
+            self.lbl_status.setText(f"{feitas} de {total} linhas processadas...")
+
+        def on_result(resumo):
+            self.imported = self.imported or bool(resumo["clientes"] or resumo["veiculos"])
+            texto = (f"{resumo['clientes']} clientes e {resumo['veiculos']} veículos importados; "
+                     f"{resumo['rejeitadas']} linhas recusadas.")
+            if resumo["relatorio"]:
+                texto += f"\nRelatório de recusas: {resumo['relatorio']}"
+            self.lbl_status.setText(texto)
+
+        def on_error(ex):
+            self.progress.setRange(0, 1)
+            self.lbl_status.setText("")
+            QMessageBox.critical(self, "Erro", f"Erro ao importar: {ex}")
+
+        self.progress.setRange(0, 0)
+        self.lbl_status.setText("Lendo arquivo...")
+        self.runner.submit(
+            self.ctrl.importar_clientes_veiculos, path,
+            on_result=on_result,
+            on_progress=on_progress,
+            on_error=on_error,
+            key="importar",
+        )
+
+    def on_cancel(self):
+        # a tarefa para no próximo lote; cancelada, ela não entrega resultado
+        self.runner.cancel("importar")
+        self.imported = True
+        self.btn_cancel.setEnabled(False)
+        self.progress.setRange(0, 1)
+        self.lbl_status.setText("Importação cancelada; os lotes já gravados foram mantidos.")
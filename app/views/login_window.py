@@ -2,7 +2,7 @@
 import sys
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QFrame, QMessageBox
+    QPushButton, QFrame, QMessageBox, QProgressBar
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
@@ -10,6 +10,7 @@ from PySide6.QtGui import QFont
 from controllers.auth_controller import AuthController
 from views.cadastro_window import CadastroWindow
 from views.main_window import MainWindow
+from views.workers import TaskRunner
 
 
 class LoginWindow(QWidget):
@@ -17,6 +18,8 @@ class LoginWindow(QWidget):
         super().__init__(parent)
 
         self.auth = AuthController()
+        # a verificação argon2 é lenta: roda fora da thread da interface
+        self.runner = TaskRunner(self)
 
         self.setWindowTitle("AutoManager - Login")
         # tamanho agradável (não-fullscreen)
@@ -94,6 +97,14 @@ class LoginWindow(QWidget):
 
         card_layout.addLayout(btn_row)
 
+        # spinner exibido enquanto a senha é verificada
+        self.spinner = QProgressBar()
+        self.spinner.setRange(0, 0)
+        self.spinner.setTextVisible(False)
+        self.spinner.setFixedHeight(6)
+        self.spinner.hide()
+        card_layout.addWidget(self.spinner)
+
         root.addWidget(card)
         root.addStretch()
 
@@ -178,17 +189,40 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Erro", "Informe usuário e senha.")
             return
 
-        try:
-            user = self.auth.authenticate(username, password)
-        except ValueError as ex:
-            QMessageBox.warning(self, "Erro", str(ex))
-            return
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao autenticar: {ex}")
-            return
-
-        # se logou, abre MainWindow
-        self.open_main_window(user)
+        def on_result(res):
+            self._set_busy(False)
+            user, needs_rehash = res
+            if user is None:
+                QMessageBox.warning(self, "Erro", "Usuário ou senha inválidos.")
+                self.input_pass.setFocus()
+                self.input_pass.selectAll()
+                return
+
+            # se logou, abre MainWindow
+            self.open_main_window(user)
+
+            # upgrade do hash só depois que a tela principal já abriu
+            if needs_rehash:
+                self.runner.submit(self.auth.rehash_password, user.id, password, user.password_hash)
+
+        def on_error(ex):
+            self._set_busy(False)
+            if isinstance(ex, ValueError):
+                QMessageBox.warning(self, "Erro", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao autenticar: {ex}")
+
+        self._set_busy(True)
+        self.runner.submit(
+            self.auth.verify_credentials, username, password,
+            on_result=on_result,
+            on_error=on_error,
+        )
+
+    def _set_busy(self, busy: bool):
+        for w in (self.input_user, self.input_pass, self.btn_login, self.btn_register):
+            w.setEnabled(not busy)
+        self.spinner.setVisible(busy)
 
     def on_open_cadastro(self):
         dlg = CadastroWindow(parent=self)
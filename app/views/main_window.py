@@ -4,78 +4,26 @@ from PySide6.QtWidgets import (
     QPushButton, QComboBox, QListWidget, QMessageBox, QHBoxLayout,
     QFormLayout, QToolBar, QStackedWidget, QListWidgetItem,
     QTableView, QHeaderView, QDialog, QAbstractItemView,
-    QFileDialog
+    QFileDialog, QProgressBar, QCheckBox, QDateEdit, QProgressDialog,
+    QTableWidget, QTableWidgetItem
 )
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtCore import Qt, QTimer, QDate
 from PySide6.QtGui import QAction
 import datetime
-import csv
 from controllers.os_controller import OSController
 from controllers.auth_controller import AuthController
+from controllers.export_controller import ExportController
+from controllers.dashboard_controller import DashboardController
+from controllers.retencao_controller import RetencaoController
 from views.edit_os_dialog import EditOSDialog
 from views.os_history_dialog import OSHistoryDialog
-
-class OSTableModel(QAbstractTableModel):
-    COLUMNS = [
-        ("ID", "id"),
-        ("Código", "codigo"),
-        ("Descrição", "descricao"),
-        ("Status", "status"),
-        ("Prioridade", "prioridade"),
-        ("Cliente", "cliente_nome"),
-        ("Veículo", "veiculo_placa"),
-        ("Mecânico", "mecanico"),
-        ("Aberta Em", "aberta_em"),
-    ]
-
-    def __init__(self, rows=None, parent=None):
-        super().__init__(parent)
-        self._rows = rows or []
-
-    def rowCount(self, parent=QModelIndex()):
-        return len(self._rows)
-
-    def columnCount(self, parent=QModelIndex()):
-        return len(self.COLUMNS)
-
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role != Qt.DisplayRole:
-            return None
-        if orientation == Qt.Horizontal:
-            return self.COLUMNS[section][0]
-        return section + 1
-
-    def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
-            return None
-        row = index.row()
-        col = index.column()
-        attr = self.COLUMNS[col][1]
-        item = self._rows[row]
-
-        if role == Qt.DisplayRole:
-            # support both object attributes and dicts
-            val = getattr(item, attr, None) if hasattr(item, attr) else item.get(attr, None)
-            if isinstance(val, datetime.datetime):
-                return val.strftime("%Y-%m-%d %H:%M")
-            return "" if val is None else str(val)
-
-        if role == Qt.UserRole:
-            # Return the underlying object for convenience
-            return item
-
-        return None
-
-    def get_item(self, row_idx):
-        if 0 <= row_idx < len(self._rows):
-            return self._rows[row_idx]
-        return None
-
-    def set_rows(self, rows):
-        self.beginResetModel()
-        self._rows = rows or []
-        self.endResetModel()
-
+from views.import_dialog import ImportDialog
+from views.diagnostico_dialog import DiagnosticoDialog
+from views.table_models import OSTableModel
+from views.table_views import OSTableView
+from views.pickers import SeletorBusca
+from models.linhas import ClienteLinha
+from views.workers import TaskRunner
 
 class MainWindow(QMainWindow):
     def __init__(self, user=None, parent=None):
@@ -86,6 +34,18 @@ class MainWindow(QMainWindow):
         self.user = user or None
         self.controller = OSController()
         self.auth_controller = AuthController()
+        self.export_controller = ExportController()
+        self.dashboard_controller = DashboardController()
+
+        # chamadas aos controllers rodam fora da thread da interface
+        self.runner = TaskRunner(self)
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)  # indeterminado
+        self.busy_indicator.setMaximumWidth(160)
+        self.busy_indicator.setTextVisible(False)
+        self.busy_indicator.hide()
+        self.statusBar().addPermanentWidget(self.busy_indicator)
+        self.runner.busy_changed.connect(self.busy_indicator.setVisible)
 
         # Central stacked widget (cada "página" é um widget)
         self.stack = QStackedWidget()
@@ -96,12 +56,14 @@ class MainWindow(QMainWindow):
         self.page_clients = self._build_clients_page()
         self.page_vehicles = self._build_vehicles_page()
         self.page_users = self._build_users_page()
+        self.page_dashboard = self._build_dashboard_page()
 
         # Adicionar páginas ao stack
         self.stack.addWidget(self.page_os)
         self.stack.addWidget(self.page_clients)
         self.stack.addWidget(self.page_vehicles)
         self.stack.addWidget(self.page_users)
+        self.stack.addWidget(self.page_dashboard)
 
         # Barra de menu / toolbar
         self._create_menu()
@@ -109,6 +71,37 @@ class MainWindow(QMainWindow):
         # Inicial: mostrar OS
         self.show_os_page()
 
+        # manutenção do histórico em segundo plano, com runner próprio para
+        # não acender o indicador de ocupado durante a limpeza
+        self.maintenance_runner = TaskRunner(self)
+        QTimer.singleShot(self.RETENCAO_ATRASO_MS, self._start_retencao)
+
+    # espera após abrir a janela antes de começar a retenção do histórico
+    RETENCAO_ATRASO_MS = 30_000
+
+    def closeEvent(self, event):
+        # resultados que chegarem depois do fechamento são descartados
+        self.runner.cancel_all()
+        # a retenção para no fim do lote atual
+        self.maintenance_runner.cancel_all()
+        super().closeEvent(event)
+
+    def _start_retencao(self):
+        def on_result(resumo):
+            if resumo["orfaos"] or resumo["arquivadas"]:
+                self.statusBar().showMessage(
+                    f"Histórico: {resumo['arquivadas']} entradas arquivadas, "
+                    f"{resumo['orfaos']} órfãs removidas.", 10_000
+                )
+
+        self.maintenance_runner.submit(
+            RetencaoController().executar,
+            on_result=on_result,
+            # falha na manutenção não interrompe o uso; tenta de novo no próximo login
+            on_error=lambda ex: self.statusBar().showMessage(f"Retenção do histórico falhou: {ex}", 10_000),
+            key="retencao",
+        )
+
     def _apply_style(self):
         """
         Aplica um tema escuro agradável para a janela principal.
@@ -294,12 +287,24 @@ class MainWindow(QMainWindow):
         self.act_users.setEnabled(self._current_user_is_admin())
         menu_opcoes.addAction(self.act_users)
 
+        self.act_dashboard = QAction("Painel", self)
+        self.act_dashboard.triggered.connect(self.show_dashboard_page)
+        self.act_dashboard.setEnabled(self._current_user_is_manager())
+        menu_opcoes.addAction(self.act_dashboard)
+
+        # tempos das consultas SQL (instrumentacao.py)
+        self.act_diagnostico = QAction("Diagnóstico", self)
+        self.act_diagnostico.triggered.connect(self.show_diagnostico)
+        self.act_diagnostico.setEnabled(self._current_user_is_admin())
+        menu_opcoes.addAction(self.act_diagnostico)
+
         toolbar = QToolBar("Principal")
         self.addToolBar(toolbar)
         toolbar.addAction(self.act_os)
         toolbar.addAction(self.act_clients)
         toolbar.addAction(self.act_vehicles)
         toolbar.addAction(self.act_users)
+        toolbar.addAction(self.act_dashboard)
 
     def _current_user_is_admin(self) -> bool:
         if not self.user:
@@ -310,13 +315,20 @@ class MainWindow(QMainWindow):
         except Exception:
             return False
 
+    def _current_user_is_manager(self) -> bool:
+        """Administrador ou Gerente."""
+        if not self.user:
+            return False
+        role = getattr(self.user, "role", None) or ""
+        return str(role).strip().lower() in ("administrador", "gerente")
+
     # ---------------------------
     # Page switching helpers
     # ---------------------------
     def show_os_page(self):
         self.stack.setCurrentWidget(self.page_os)
         self.load_os_list()
-        self.load_clients_in_os_page()
+        self.load_os_mecanicos_filter()
 
     def show_clients_page(self):
         self.stack.setCurrentWidget(self.page_clients)
@@ -324,7 +336,6 @@ class MainWindow(QMainWindow):
 
     def show_vehicles_page(self):
         self.stack.setCurrentWidget(self.page_vehicles)
-        self.load_clients_in_vehicle_page()
         self.load_vehicles_list()
 
     def show_users_page(self):
@@ -334,6 +345,19 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentWidget(self.page_users)
         self.load_users_list()
 
+    def show_dashboard_page(self):
+        if not self._current_user_is_manager():
+            QMessageBox.warning(self, "Acesso negado", "Acesso restrito a Administradores e Gerentes.")
+            return
+        self.stack.setCurrentWidget(self.page_dashboard)
+        self.load_dashboard()
+
+    def show_diagnostico(self):
+        if not self._current_user_is_admin():
+            QMessageBox.warning(self, "Acesso negado", "Acesso restrito a Administradores.")
+            return
+        DiagnosticoDialog(self).exec()
+
     # ---------------------------
     # OS Page (QTableView)
     # ---------------------------
@@ -347,13 +371,18 @@ class MainWindow(QMainWindow):
         layout.addWidget(title)
 
         form = QFormLayout()
-        self.os_cliente_combo = QComboBox()
-        self.os_veiculo_combo = QComboBox()
+        # seletores com busca no banco (nome, documento, telefone, placa) em vez de combos com tudo
+        self.os_cliente_picker = self._cliente_picker("Nome, documento, telefone ou placa")
+        self.os_cliente_picker.escolhido.connect(self._on_os_cliente_escolhido)
+        self.os_veiculo_picker = SeletorBusca(
+            self.controller.buscar_veiculos, self._formatar_veiculo, self.runner)
+        self.os_veiculo_picker.setPlaceholderText("Placa")
+        self.os_veiculo_picker.escolhido.connect(self._on_os_veiculo_escolhido)
         self.os_descricao = QLineEdit()
         self.os_valor = QLineEdit()
         self.os_valor.setPlaceholderText("0.00")
-        form.addRow("Cliente:", self.os_cliente_combo)
-        form.addRow("Veículo:", self.os_veiculo_combo)
+        form.addRow("Cliente:", self.os_cliente_picker)
+        form.addRow("Veículo:", self.os_veiculo_picker)
         form.addRow("Descrição:", self.os_descricao)
         form.addRow("Valor (R$):", self.os_valor)
         layout.addLayout(form)
@@ -379,8 +408,8 @@ class MainWindow(QMainWindow):
         btn_refresh = QPushButton("Refresh")
         btn_refresh.clicked.connect(self.load_os_list)
 
-        btn_export = QPushButton("Exportar CSV")
-        btn_export.clicked.connect(self.export_os_csv)
+        btn_export = QPushButton("Exportar...")
+        btn_export.clicked.connect(self.export_os)
         btn_layout.addWidget(btn_export)
 
         btn_layout.addWidget(btn_create)
@@ -391,12 +420,93 @@ class MainWindow(QMainWindow):
 
         # Table view
         layout.addWidget(QLabel("Lista de Ordens:"))
-        self.os_table = QTableView()
+
+        # busca e filtros: recarregam só depois de uma pausa na digitação
+        self._os_reload_timer = QTimer(self)
+        self._os_reload_timer.setSingleShot(True)
+        self._os_reload_timer.setInterval(300)
+        self._os_reload_timer.timeout.connect(self.load_os_list)
+        schedule_reload = lambda *_: self._os_reload_timer.start()
+
+        self.os_busca = QLineEdit()
+        self.os_busca.setPlaceholderText("Buscar por descrição, código, cliente ou placa...")
+        self.os_busca.setClearButtonEnabled(True)
+        self.os_busca.textChanged.connect(schedule_reload)
+        layout.addWidget(self.os_busca)
+
+        filtros1 = QHBoxLayout()
+        self.f_status = QComboBox()
+        self.f_status.addItem("Status: todos", userData=None)
+        for st in ("ABERTA", "EM ANDAMENTO", "CONCLUIDA"):
+            self.f_status.addItem(st, userData=st)
+        self.f_prioridade = QComboBox()
+        self.f_prioridade.addItem("Prioridade: todas", userData=None)
+        for pr in ("BAIXA", "MEDIA", "ALTA"):
+            self.f_prioridade.addItem(pr, userData=pr)
+        self.f_mecanico = QComboBox()
+        self.f_mecanico.addItem("Mecânico: todos", userData=None)
+        self.f_cliente = QLineEdit()
+        self.f_cliente.setPlaceholderText("Cliente (início do nome)")
+        # balcão: placa completa + Enter -> veículo, dono e as OS do veículo
+        self.f_placa = QLineEdit()
+        self.f_placa.setPlaceholderText("Placa + Enter")
+        self.f_placa.setClearButtonEnabled(True)
+        self.f_placa.returnPressed.connect(self.on_buscar_placa)
+        self.f_placa.textChanged.connect(self._on_f_placa_changed)
+        self._os_veiculo_filtro = None
+        for combo in (self.f_status, self.f_prioridade, self.f_mecanico):
+            combo.currentIndexChanged.connect(schedule_reload)
+        self.f_cliente.textChanged.connect(schedule_reload)
+        filtros1.addWidget(self.f_status)
+        filtros1.addWidget(self.f_prioridade)
+        filtros1.addWidget(self.f_mecanico)
+        filtros1.addWidget(self.f_cliente)
+        filtros1.addWidget(self.f_placa)
+        layout.addLayout(filtros1)
+
+        filtros2 = QHBoxLayout()
+        self.f_desde = QDateEdit()
+        self.f_ate = QDateEdit()
+        for de in (self.f_desde, self.f_ate):
+            de.setCalendarPopup(True)
+            de.setDisplayFormat("yyyy-MM-dd")
+            de.setMinimumDate(QDate(2000, 1, 1))
+            # a data mínima significa "sem limite"
+            de.setSpecialValueText("—")
+            de.setDate(de.minimumDate())
+            de.dateChanged.connect(schedule_reload)
+        self.f_valor_min = QLineEdit()
+        self.f_valor_min.setPlaceholderText("Valor mín.")
+        self.f_valor_max = QLineEdit()
+        self.f_valor_max.setPlaceholderText("Valor máx.")
+        for le in (self.f_valor_min, self.f_valor_max):
+            le.textChanged.connect(schedule_reload)
+        filtros2.addWidget(QLabel("Aberta de:"))
+        filtros2.addWidget(self.f_desde)
+        filtros2.addWidget(QLabel("até:"))
+        filtros2.addWidget(self.f_ate)
+        filtros2.addWidget(self.f_valor_min)
+        filtros2.addWidget(self.f_valor_max)
+
+        # mecânico: por padrão só as ordens que ele pode alterar
+        self.f_minhas = QCheckBox("Somente minhas ordens")
+        is_mecanico = str(role).strip().lower() == "mecanico"
+        self.f_minhas.setVisible(is_mecanico)
+        self.f_minhas.setChecked(is_mecanico)
+        self.f_mecanico.setEnabled(not is_mecanico)
+        self.f_minhas.toggled.connect(lambda on: self.f_mecanico.setEnabled(not on))
+        self.f_minhas.toggled.connect(schedule_reload)
+        filtros2.addWidget(self.f_minhas)
+        layout.addLayout(filtros2)
+
+        # com muitas linhas, larguras fixas em vez de medir todas (ver OSTableView)
+        self.os_table = OSTableView("os_grade")
         self.os_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.os_table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.os_table.horizontalHeader().setStretchLastSection(True)
-        self.os_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        self.os_model = OSTableModel(rows=[])
+        self.os_model = OSTableModel(rows=[], runner=self.runner)
+        self.os_model.load_failed.connect(
+            lambda ex: QMessageBox.critical(self, "Erro", f"Erro ao carregar ordens: {ex}")
+        )
         self.os_table.setModel(self.os_model)
         # escondendo ID (coluna 0) para o usuário
         self.os_table.setColumnHidden(0, True)
@@ -404,6 +514,15 @@ class MainWindow(QMainWindow):
         self.os_table.selectionModel().selectionChanged.connect(self._on_os_table_selection_changed)
         # double click -> edit
         self.os_table.doubleClicked.connect(lambda _: self.on_edit_os())
+        # ordenação pelo cabeçalho, feita no banco (ver OSTableModel.sort)
+        self._os_sort = ("aberta_em", True)
+        # (filtros, ordenação) da carga paginada atual
+        self._os_consulta = None
+        self.os_model.sort_requested.connect(self._on_os_sort_requested)
+        self.os_table.horizontalHeader().setSortIndicator(
+            self._os_column_index("aberta_em"), Qt.DescendingOrder
+        )
+        self.os_table.setSortingEnabled(True)
 
         layout.addWidget(self.os_table)
 
@@ -442,91 +561,186 @@ class MainWindow(QMainWindow):
         dlg = OSHistoryDialog(os_id, parent=self)
         dlg.exec()
 
-    def load_clients_in_os_page(self):
-        # tenta desconectar APENAS o slot que usamos
+    def _cliente_picker(self, placeholder: str) -> SeletorBusca:
+        picker = SeletorBusca(self.controller.buscar_clientes, self._formatar_cliente, self.runner)
+        picker.setPlaceholderText(placeholder)
+        return picker
+
+    @staticmethod
+    def _formatar_cliente(c) -> str:
+        extra = c.documento or c.telefone
+        return f"{c.nome} — {extra}" if extra else c.nome
+
+    @staticmethod
+    def _formatar_veiculo(v) -> str:
+        return f"{v.placa} — {v.modelo or ''} ({v.cliente_nome})"
+
+    def _on_os_cliente_escolhido(self, cliente):
+        veiculo = self.os_veiculo_picker.linha_atual()
+        if cliente is None:
+            self.os_veiculo_picker.filtros = {}
+            self.os_veiculo_picker.limpar()
+            return
+        self.os_veiculo_picker.filtros = {"cliente_id": cliente.id}
+        if veiculo is not None and veiculo.cliente_id == cliente.id:
+            return
+        self.os_veiculo_picker.limpar()
+        # uma consulta por cliente escolhido; com um só veículo, ele já fica escolhido
+        self.runner.submit(
+            self.controller.buscar_veiculos, cliente_id=cliente.id, limit=2,
+            on_result=self._on_os_veiculos_do_cliente,
+            key="os_veiculos",
+        )
+
+    def _on_os_veiculos_do_cliente(self, veiculos):
+        cliente_id = self.os_cliente_picker.current_id()
+        if len(veiculos) == 1 and veiculos[0].cliente_id == cliente_id \
+                and self.os_veiculo_picker.linha_atual() is None:
+            self.os_veiculo_picker.definir(veiculos[0])
+
+    def _on_os_veiculo_escolhido(self, veiculo):
+        # veículo escolhido pela placa, sem cliente: o dono vira o cliente da OS
+        if veiculo is not None and self.os_cliente_picker.current_id() != veiculo.cliente_id:
+            self.os_cliente_picker.definir(ClienteLinha(
+                veiculo.cliente_id, veiculo.cliente_nome, None, None, None))
+
+    def load_os_list(self):
+        """
+        Carrega a primeira página da grade (já com cliente_nome e
+        veiculo_placa); as próximas são buscadas conforme o usuário rola.
+        Com texto na busca, mostra os resultados da busca (por relevância).
+        Filtros e ordenação são aplicados no banco.
+        """
         try:
-            self.os_cliente_combo.currentIndexChanged.disconnect(self._os_update_vehicles_from_client)
-        except TypeError:
-            # se não havia conexão ainda, ignoramos o erro
-            pass
+            filtros = self._collect_os_filtros()
+        except ValueError as ex:
+            self.statusBar().showMessage(str(ex), 3000)
+            return
 
-        self.os_cliente_combo.clear()
-        clientes = self.controller.listar_clientes()
-        for c in clientes:
-            self.os_cliente_combo.addItem(f"{c.nome}", userData=c.id)
+        termo = self.os_busca.text().strip()
+        if termo:
+            self.runner.submit(
+                self.controller.buscar_os, termo, filtros=filtros,
+                on_result=self._show_os_rows,
+                on_error=lambda ex: QMessageBox.critical(self, "Erro", f"Erro na busca: {ex}"),
+                key="os_busca",
+            )
+            return
 
-        # atualiza veículos do cliente inicialmente selecionado
-        self._os_update_vehicles_from_client(self.os_cliente_combo.currentIndex())
+        self.runner.cancel("os_busca")
+        ordenar_por, decrescente = self._os_sort
+        consulta = (filtros, self._os_sort)
+        if self.os_model.paged and consulta == self._os_consulta:
+            # mesma consulta (ex.: depois de criar/editar/excluir): só as diferenças
+            self.os_model.refresh()
+            return
 
-        # reconecta o sinal
-        self.os_cliente_combo.currentIndexChanged.connect(self._os_update_vehicles_from_client)
+        self._os_consulta = consulta
+        self.os_model.set_fetcher(
+            lambda after, limit: self.controller.listar_os_grid(
+                after=after, limit=limit, filtros=filtros,
+                ordenar_por=ordenar_por, decrescente=decrescente,
+            ),
+            lambda row: self.controller.chave_pagina_os(row, ordenar_por),
+        )
+        self._after_os_model_reset()
+
+    def _collect_os_filtros(self) -> dict:
+        """Lê os widgets de filtro; ValueError se um valor digitado for inválido."""
+        filtros = {
+            "status": self.f_status.currentData(),
+            "prioridade": self.f_prioridade.currentData(),
+            "cliente": self.f_cliente.text().strip(),
+            "veiculo_id": self._os_veiculo_filtro,
+        }
+        if self.f_minhas.isChecked():
+            filtros.update(self.controller.filtros_escopo_os(
+                getattr(self.user, "role", None), getattr(self.user, "username", None)
+            ))
+        else:
+            filtros["mecanico"] = self.f_mecanico.currentData()
 
+        if self.f_desde.date() != self.f_desde.minimumDate():
+            filtros["desde"] = datetime.datetime.combine(
+                self.f_desde.date().toPython(), datetime.time.min
+            )
+        if self.f_ate.date() != self.f_ate.minimumDate():
+            # "até" inclui o dia inteiro
+            filtros["ate"] = datetime.datetime.combine(
+                self.f_ate.date().toPython() + datetime.timedelta(days=1), datetime.time.min
+            )
 
-    def _os_update_vehicles_from_client(self, idx):
-        self.os_veiculo_combo.clear()
-        client_id = self.os_cliente_combo.currentData()
-        if not client_id:
+        for chave, le in (("valor_min", self.f_valor_min), ("valor_max", self.f_valor_max)):
+            txt = le.text().strip().replace(",", ".")
+            if txt:
+                try:
+                    filtros[chave] = float(txt)
+                except ValueError:
+                    raise ValueError(f"Valor inválido no filtro: {le.text()}") from None
+        return filtros
+
+    def on_buscar_placa(self):
+        placa = self.f_placa.text().strip()
+        if not placa:
             return
-        veiculos = self.controller.listar_veiculos_por_cliente(client_id)
-        for v in veiculos:
-            display = f"{v.placa} — {v.modelo or ''}"
-            self.os_veiculo_combo.addItem(display, userData=v.id)
 
-    def load_os_list(self):
-        """
-        Carrega ordens via controller, enriquece com cliente_nome e veiculo_placa
-        e atualiza o model da tabela.
-        """
-        ordens = self.controller.listar_os()  # lista de objetos OrdemServico
-        enriched = []
+        def on_result(veiculo):
+            if veiculo is None:
+                self.statusBar().showMessage(f"Placa não cadastrada: {placa}", 3000)
+                return
+            # escolhe o veículo (e o dono) para uma nova OS e filtra a grade pelas OS dele
+            self.os_veiculo_picker.definir(veiculo)
+            self._os_veiculo_filtro = veiculo.id
+            self.statusBar().showMessage(f"{veiculo.placa} — {veiculo.cliente_nome}", 5000)
+            self.load_os_list()
 
-        # carregar clientes para lookup rápido
-        try:
-            clientes = self.controller.listar_clientes()
-            clientes_map = {c.id: c for c in clientes}
-        except Exception:
-            clientes_map = {}
-
-        # para cada ordem, buscar placa/nome para exibição
-        for o in ordens:
-            cliente_nome = ""
-            veiculo_placa = ""
-            try:
-                cliente = clientes_map.get(getattr(o, "cliente_id", None))
-                if cliente:
-                    cliente_nome = cliente.nome
-            except Exception:
-                cliente_nome = ""
-
-            try:
-                # listar veiculos do cliente e procurar por id
-                veiculos = self.controller.listar_veiculos_por_cliente(getattr(o, "cliente_id", None))
-                veiculo = next((v for v in veiculos if v.id == getattr(o, "veiculo_id", None)), None)
-                if veiculo:
-                    veiculo_placa = veiculo.placa
-            except Exception:
-                veiculo_placa = ""
-
-            # anexa atributos (SQLModel aceita setattr)
-            try:
-                setattr(o, "cliente_nome", cliente_nome)
-                setattr(o, "veiculo_placa", veiculo_placa)
-            except Exception:
-                # se não der, transforma em dict
-                o = {
-                    "id": getattr(o, "id", None),
-                    "codigo": getattr(o, "codigo", ""),
-                    "descricao": getattr(o, "descricao", ""),
-                    "status": getattr(o, "status", ""),
-                    "prioridade": getattr(o, "prioridade", ""),
-                    "cliente_nome": cliente_nome,
-                    "veiculo_placa": veiculo_placa,
-                    "mecanico": getattr(o, "mecanico", ""),
-                    "aberta_em": getattr(o, "aberta_em", None),
-                }
-            enriched.append(o)
-
-        self.os_model.set_rows(enriched)
+        self.runner.submit(
+            self.controller.find_by_placa, placa,
+            on_result=on_result,
+            on_error=lambda ex: QMessageBox.warning(self, "Aviso", f"Erro ao buscar placa: {ex}"),
+            key="os_placa",
+        )
+
+    def _on_f_placa_changed(self, texto):
+        # placa apagada ou alterada: a grade deixa de filtrar pelo veículo anterior
+        if self._os_veiculo_filtro is not None:
+            self._os_veiculo_filtro = None
+            self._os_reload_timer.start()
+
+    def _on_os_sort_requested(self, ordenar_por, decrescente):
+        if (ordenar_por, decrescente) == self._os_sort:
+            return
+        self._os_sort = (ordenar_por, decrescente)
+        # resultados de busca já foram ordenados em memória pelo model
+        if not self.os_busca.text().strip():
+            self.load_os_list()
+
+    def _os_column_index(self, attr) -> int:
+        return [c[1] for c in OSTableModel.COLUMNS].index(attr)
+
+    def load_os_mecanicos_filter(self):
+        self.runner.submit(
+            self.auth_controller.list_mecanicos,
+            on_result=self._fill_os_mecanicos_filter,
+            key="os_filtro_mecanicos",
+        )
+
+    def _fill_os_mecanicos_filter(self, mecanicos):
+        atual = self.f_mecanico.currentData()
+        self.f_mecanico.blockSignals(True)
+        self.f_mecanico.clear()
+        self.f_mecanico.addItem("Mecânico: todos", userData=None)
+        for u in mecanicos:
+            self.f_mecanico.addItem(f"{u.nome or u.username} ({u.username})", userData=u.username)
+        idx = self.f_mecanico.findData(atual)
+        self.f_mecanico.setCurrentIndex(max(idx, 0))
+        self.f_mecanico.blockSignals(False)
+
+    def _show_os_rows(self, rows):
+        # set_rows só sinaliza as diferenças; a seleção é mantida
+        self.os_model.set_rows(rows)
+
+    def _after_os_model_reset(self):
         # esconder ID caso tenha mudado o model
         try:
             self.os_table.setColumnHidden(0, True)
@@ -538,8 +752,8 @@ class MainWindow(QMainWindow):
         self.btn_edit_os.setEnabled(False)
 
     def on_criar_os(self):
-        client_id = self.os_cliente_combo.currentData()
-        veiculo_id = self.os_veiculo_combo.currentData()
+        client_id = self.os_cliente_picker.current_id()
+        veiculo_id = self.os_veiculo_picker.current_id()
         descricao = self.os_descricao.text().strip()
         val_text = self.os_valor.text().strip().replace(",", ".")
         try:
@@ -555,24 +769,29 @@ class MainWindow(QMainWindow):
         username = getattr(self.user, "username", None)
         role = getattr(self.user, "role", None)
 
-        try:
-            osr = self.controller.criar_os(
-                client_id,
-                veiculo_id,
-                descricao,
-                valor=valor,
-                usuario=username,
-                role=role,
-            )
+        def on_result(osr):
             QMessageBox.information(self, "Ok", f"Ordem criada: {osr.codigo}")
             self.os_descricao.clear()
             self.os_valor.clear()
             self.load_os_list()
-        except PermissionError as ex:
-            QMessageBox.warning(self, "Acesso negado", str(ex))
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao criar OS: {ex}")
 
+        def on_error(ex):
+            if isinstance(ex, PermissionError):
+                QMessageBox.warning(self, "Acesso negado", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao criar OS: {ex}")
+
+        self.runner.submit(
+            self.controller.criar_os,
+            client_id,
+            veiculo_id,
+            descricao,
+            valor=valor,
+            usuario=username,
+            role=role,
+            on_result=on_result,
+            on_error=on_error,
+        )
 
     def on_edit_os(self):
         sel = self.os_table.selectionModel().selectedRows()
@@ -582,15 +801,23 @@ class MainWindow(QMainWindow):
         row_idx = sel[0].row()
         item = self.os_model.get_item(row_idx)
         os_id = getattr(item, "id", None) if hasattr(item, "id") else item.get("id")
-        os_obj = self.controller.get_os_by_id(os_id)
-        if not os_obj:
-            QMessageBox.warning(self, "Erro", "Ordem não encontrada.")
-            self.load_os_list()
-            return
-        dlg = EditOSDialog(os_obj, current_user=self.user, parent=self)
-        res = dlg.exec()
-        if res == QDialog.Accepted:
-            self.load_os_list()
+
+        def on_result(os_obj):
+            if not os_obj:
+                QMessageBox.warning(self, "Erro", "Ordem não encontrada.")
+                self.load_os_list()
+                return
+            dlg = EditOSDialog(os_obj, current_user=self.user, parent=self)
+            res = dlg.exec()
+            if res == QDialog.Accepted:
+                self.load_os_list()
+
+        self.runner.submit(
+            self.controller.get_os_by_id, os_id,
+            on_result=on_result,
+            on_error=lambda ex: QMessageBox.critical(self, "Erro", f"Erro ao abrir ordem: {ex}"),
+            key="os_editar",
+        )
 
     def on_excluir_os_table(self):
         sel = self.os_table.selectionModel().selectedRows()
@@ -608,68 +835,62 @@ class MainWindow(QMainWindow):
         role = getattr(self.user, "role", None)
         username = getattr(self.user, "username", None)
 
-        try:
-            ok = self.controller.delete_os(os_id, role=role, usuario=username)
+        def on_result(ok):
             if ok:
                 QMessageBox.information(self, "Ok", "Ordem excluída.")
                 self.load_os_list()
             else:
                 QMessageBox.warning(self, "Erro", "Não foi possível excluir a ordem.")
-        except PermissionError as ex:
-            QMessageBox.warning(self, "Acesso negado", str(ex))
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao excluir ordem: {ex}")
-
-    def export_os_csv(self):
-        ordens = self.controller.listar_os()
-        if not ordens:
-            QMessageBox.information(self, "Exportar CSV", "Nenhuma ordem para exportar.")
-            return
 
-        path, _ = QFileDialog.getSaveFileName(self, "Salvar CSV", "ordens_servico.csv", "CSV Files (*.csv)")
+        def on_error(ex):
+            if isinstance(ex, PermissionError):
+                QMessageBox.warning(self, "Acesso negado", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao excluir ordem: {ex}")
+
+        self.runner.submit(
+            self.controller.delete_os, os_id, role=role, usuario=username,
+            on_result=on_result, on_error=on_error,
+        )
+
+    def export_os(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar ordens", "ordens_servico.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl);;Excel (*.xlsx)",
+        )
         if not path:
             return
-
         try:
-            # carregar lookup de clientes/veiculos para human readable
-            clientes = {c.id: c.nome for c in self.controller.listar_clientes()}
-            rows = []
-            for o in ordens:
-                cliente_nome = clientes.get(getattr(o, "cliente_id", None), "")
-                # tentar placa do veículo
-                veiculo_placa = ""
-                try:
-                    veiculos = self.controller.listar_veiculos_por_cliente(getattr(o, "cliente_id", None))
-                    v = next((v for v in veiculos if v.id == getattr(o, "veiculo_id", None)), None)
-                    if v:
-                        veiculo_placa = v.placa
-                except Exception:
-                    veiculo_placa = ""
-
-                rows.append({
-                    "id": getattr(o, "id", None),
-                    "codigo": getattr(o, "codigo", ""),
-                    "descricao": getattr(o, "descricao", ""),
-                    "status": getattr(o, "status", ""),
-                    "prioridade": getattr(o, "prioridade", ""),
-                    "cliente": cliente_nome,
-                    "veiculo": veiculo_placa,
-                    "mecanico": getattr(o, "mecanico", "") or "",
-                    "valor": f"{(getattr(o, 'valor', 0.0) or 0.0):.2f}",
-                    "aberta_em": getattr(o, "aberta_em", ""),
-                })
-
-            # escrever CSV
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=["id","codigo","descricao","status","prioridade","cliente","veiculo","mecanico","valor","aberta_em"])
-                writer.writeheader()
-                for r in rows:
-                    writer.writerow(r)
-
-            QMessageBox.information(self, "Exportar CSV", f"Exportado com sucesso: {path}")
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao exportar CSV: {ex}")
+            formato = self.export_controller.formato_por_caminho(path)
+        except ValueError as ex:
+            QMessageBox.warning(self, "Exportar", str(ex))
+            return
 
+        progress = QProgressDialog("Exportando ordens...", "Cancelar", 0, 0, self)
+        progress.setWindowTitle("Exportar")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(lambda: self.runner.cancel("os_exportar"))
+
+        def on_progress(feitas, total):
+            progress.setMaximum(max(total, 1))
+            progress.setValue(min(feitas, total))
+
+        def on_result(total):
+            if not total:
+                QMessageBox.information(self, "Exportar", "Nenhuma ordem para exportar.")
+                return
+            QMessageBox.information(self, "Exportar", f"{total} ordens exportadas: {path}")
+
+        self.runner.submit(
+            self.export_controller.exportar_os, path, formato,
+            on_result=on_result,
+            on_progress=on_progress,
+            on_error=lambda ex: QMessageBox.critical(self, "Erro", f"Erro ao exportar: {ex}"),
+            # no cancelamento o próprio QProgressDialog se fecha
+            on_finished=progress.reset,
+            key="os_exportar",
+        )
 
     # ---------------------------
     # Clientes Page
@@ -703,9 +924,13 @@ class MainWindow(QMainWindow):
         btn_refresh_clients = QPushButton("Refresh")
         btn_refresh_clients.clicked.connect(self.load_clients_list)
 
+        btn_import_clients = QPushButton("Importar CSV...")
+        btn_import_clients.clicked.connect(self.on_import_clients)
+
         btn_layout.addWidget(btn_add_client)
         btn_layout.addWidget(btn_delete_client)
         btn_layout.addWidget(btn_refresh_clients)
+        btn_layout.addWidget(btn_import_clients)
 
         self.btn_delete_client = btn_delete_client
 
@@ -717,6 +942,12 @@ class MainWindow(QMainWindow):
         self.clients_list.currentItemChanged.connect(self.on_cliente_selected)
         return w
 
+    def on_import_clients(self):
+        dlg = ImportDialog(parent=self)
+        dlg.exec()
+        if dlg.imported:
+            self.load_clients_list()
+
     def on_add_client(self):
         nome = self.cl_nome.text().strip()
         documento = self.cl_doc.text().strip() or None
@@ -724,15 +955,34 @@ class MainWindow(QMainWindow):
         if not nome:
             QMessageBox.warning(self, "Erro", "Nome é obrigatório")
             return
-        c = self.controller.criar_cliente(nome, documento=documento, telefone=telefone)
-        QMessageBox.information(self, "Ok", f"Cliente criado: {c.nome}")
-        self.cl_nome.clear(); self.cl_doc.clear(); self.cl_tel.clear()
-        self.load_clients_list()
-        self.load_clients_in_os_page()
+
+        def on_result(c):
+            QMessageBox.information(self, "Ok", f"Cliente criado: {c.nome}")
+            self.cl_nome.clear(); self.cl_doc.clear(); self.cl_tel.clear()
+            self.load_clients_list()
+
+        def on_error(ex):
+            if isinstance(ex, ValueError):
+                # documento inválido ou de outro cliente
+                QMessageBox.warning(self, "Erro", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao criar cliente: {ex}")
+
+        self.runner.submit(
+            self.controller.criar_cliente, nome, documento=documento, telefone=telefone,
+            on_result=on_result, on_error=on_error,
+        )
 
     def load_clients_list(self):
+        self.runner.submit(
+            self.controller.listar_clientes,
+            on_result=self._fill_clients_list,
+            on_error=lambda ex: QMessageBox.warning(self, "Aviso", f"Erro ao listar clientes: {ex}"),
+            key="clientes_lista",
+        )
+
+    def _fill_clients_list(self, clientes):
         self.clients_list.clear()
-        clientes = self.controller.listar_clientes()
         for c in clientes:
             item = QListWidgetItem(f"{c.nome} — {c.documento or ''}")
             item.setData(Qt.UserRole, c.id)
@@ -759,19 +1009,26 @@ class MainWindow(QMainWindow):
         if confirm != QMessageBox.Yes:
             return
 
-        try:
-            ok = self.controller.delete_cliente(cliente_id)
+        def on_result(ok):
             if ok:
                 QMessageBox.information(self, "Ok", "Cliente excluído com sucesso.")
                 self.load_clients_list()
-                self.load_clients_in_os_page()
-                self.load_clients_in_vehicle_page()
+                # a escolha pode ser o cliente excluído
+                self.os_cliente_picker.limpar()
+                self.v_cliente_picker.limpar()
             else:
                 QMessageBox.warning(self, "Erro", "Cliente não encontrado.")
-        except ValueError as ex:
-            QMessageBox.warning(self, "Erro", str(ex))
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao excluir cliente: {ex}")
+
+        def on_error(ex):
+            if isinstance(ex, ValueError):
+                QMessageBox.warning(self, "Erro", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao excluir cliente: {ex}")
+
+        self.runner.submit(
+            self.controller.delete_cliente, cliente_id,
+            on_result=on_result, on_error=on_error,
+        )
 
     # ---------------------------
     # Vehicles Page
@@ -786,11 +1043,11 @@ class MainWindow(QMainWindow):
         layout.addWidget(title)
 
         form = QFormLayout()
-        self.v_cliente_combo = QComboBox()
+        self.v_cliente_picker = self._cliente_picker("Nome, documento ou telefone")
         self.v_placa = QLineEdit()
         self.v_marca = QLineEdit()
         self.v_modelo = QLineEdit()
-        form.addRow("Cliente:", self.v_cliente_combo)
+        form.addRow("Cliente:", self.v_cliente_picker)
         form.addRow("Placa:", self.v_placa)
         form.addRow("Marca:", self.v_marca)
         form.addRow("Modelo:", self.v_modelo)
@@ -859,60 +1116,81 @@ class MainWindow(QMainWindow):
         role = getattr(self.user, "role", None)
         username = getattr(self.user, "username", None)
 
-        try:
-            ok = self.controller.delete_veiculo(veiculo_id, role=role, usuario=username)
+        def on_result(ok):
             if ok:
                 QMessageBox.information(self, "Ok", "Veículo excluído com sucesso.")
                 self.load_vehicles_list()
-                # atualizar combos de OS e de veículos (se necessário)
-                self.load_clients_in_os_page()
+                self.os_veiculo_picker.limpar()
             else:
                 QMessageBox.warning(self, "Erro", "Veículo não encontrado.")
-        except ValueError as ex:
-            # regra de negócio: veículo com OS vinculada
-            QMessageBox.warning(self, "Erro", str(ex))
-        except PermissionError as ex:
-            # mecânico ou outro papel sem permissão
-            QMessageBox.warning(self, "Acesso negado", str(ex))
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao excluir veículo: {ex}")
-
-
-    def load_clients_in_vehicle_page(self):
-        self.v_cliente_combo.clear()
-        clientes = self.controller.listar_clientes()
-        for c in clientes:
-            self.v_cliente_combo.addItem(f"{c.nome}", userData=c.id)
+
+        def on_error(ex):
+            if isinstance(ex, ValueError):
+                # regra de negócio: veículo com OS vinculada
+                QMessageBox.warning(self, "Erro", str(ex))
+            elif isinstance(ex, PermissionError):
+                # mecânico ou outro papel sem permissão
+                QMessageBox.warning(self, "Acesso negado", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao excluir veículo: {ex}")
+
+        self.runner.submit(
+            self.controller.delete_veiculo, veiculo_id, role=role, usuario=username,
+            on_result=on_result, on_error=on_error,
+        )
 
     def on_add_vehicle(self):
-        client_id = self.v_cliente_combo.currentData()
+        client_id = self.v_cliente_picker.current_id()
         placa = self.v_placa.text().strip()
         marca = self.v_marca.text().strip() or None
         modelo = self.v_modelo.text().strip() or None
         if not client_id or not placa:
             QMessageBox.warning(self, "Erro", "Selecione cliente e informe a placa")
             return
-        v = self.controller.criar_veiculo(client_id, placa, marca=marca, modelo=modelo)
-        QMessageBox.information(self, "Ok", f"Veículo criado: {v.placa}")
-        self.v_placa.clear(); self.v_marca.clear(); self.v_modelo.clear()
-        self.load_vehicles_list()
-        self.load_clients_in_os_page()
+
+        def on_result(v):
+            QMessageBox.information(self, "Ok", f"Veículo criado: {v.placa}")
+            self.v_placa.clear(); self.v_marca.clear(); self.v_modelo.clear()
+            self.load_vehicles_list()
+
+        def on_error(ex):
+            if isinstance(ex, ValueError):
+                # placa inválida ou já cadastrada
+                QMessageBox.warning(self, "Erro", str(ex))
+            else:
+                QMessageBox.critical(self, "Erro", f"Erro ao criar veículo: {ex}")
+
+        self.runner.submit(
+            self.controller.criar_veiculo, client_id, placa, marca=marca, modelo=modelo,
+            on_result=on_result, on_error=on_error,
+        )
 
     def load_vehicles_list(self):
+        self.runner.submit(
+            self._fetch_vehicles_list,
+            on_result=self._fill_vehicles_list,
+            on_error=lambda ex: QMessageBox.warning(self, "Aviso", f"Erro ao listar veículos: {ex}"),
+            key="veiculos_lista",
+        )
+
+    def _fetch_vehicles_list(self):
+        # roda em segundo plano: devolve (texto, id) de cada veículo
+        return [
+            (f"{v.placa} — {v.cliente_nome} — {v.modelo or ''}", v.id)
+            for v in self.controller.listar_veiculos()
+        ]
+
+    def _fill_vehicles_list(self, itens):
         self.vehicles_list.clear()
-        clientes = self.controller.listar_clientes()
-        for c in clientes:
-            veiculos = self.controller.listar_veiculos_por_cliente(c.id)
-            for v in veiculos:
-                item = QListWidgetItem(f"{v.placa} — {c.nome} — {v.modelo or ''}")
-                item.setData(Qt.UserRole, v.id)
-                self.vehicles_list.addItem(item)
+        for texto, veiculo_id in itens:
+            item = QListWidgetItem(texto)
+            item.setData(Qt.UserRole, veiculo_id)
+            self.vehicles_list.addItem(item)
 
         # nenhum selecionado após recarregar
         if hasattr(self, "btn_delete_vehicle"):
             self.btn_delete_vehicle.setEnabled(False)
 
-
     # ---------------------------
     # Users Page (usa AuthController)
     # ---------------------------
@@ -977,25 +1255,39 @@ class MainWindow(QMainWindow):
         if not username or not senha:
             QMessageBox.warning(self, "Erro", "Usuário e senha obrigatórios")
             return
-        try:
-            user = self.auth_controller.register(username, nome, senha, role)
+
+        def on_result(user):
             QMessageBox.information(self, "Ok", f"Usuário criado: {user.username}")
             self.u_username.clear(); self.u_name.clear(); self.u_password.clear()
             self.load_users_list()
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Não foi possível criar usuário: {ex}")
+
+        def on_finished():
+            self.btn_add_user.setEnabled(True)
+
+        # o hash argon2 é caro: evita cliques repetidos enquanto roda
+        self.btn_add_user.setEnabled(False)
+        self.runner.submit(
+            self.auth_controller.register, username, nome, senha, role,
+            on_result=on_result,
+            on_error=lambda ex: QMessageBox.critical(self, "Erro", f"Não foi possível criar usuário: {ex}"),
+            on_finished=on_finished,
+        )
 
     def load_users_list(self):
+        self.runner.submit(
+            self.auth_controller.list_users,
+            on_result=self._fill_users_list,
+            on_error=lambda ex: QMessageBox.warning(self, "Aviso", f"Erro ao listar usuários: {ex}"),
+            key="usuarios_lista",
+        )
+
+    def _fill_users_list(self, users):
         self.users_list.clear()
-        try:
-            users = self.auth_controller.list_users()
-            for u in users:
-                item = QListWidgetItem(f"{u.username} — {u.nome or ''} — {u.role}")
-                item.setData(Qt.UserRole, u.id)
-                self.users_list.addItem(item)
-            self.btn_delete_user.setEnabled(False)
-        except Exception as ex:
-            QMessageBox.warning(self, "Aviso", f"Erro ao listar usuários: {ex}")
+        for u in users:
+            item = QListWidgetItem(f"{u.username} — {u.nome or ''} — {u.role}")
+            item.setData(Qt.UserRole, u.id)
+            self.users_list.addItem(item)
+        self.btn_delete_user.setEnabled(False)
 
     def on_user_selected(self, current, previous):
         if current is None:
@@ -1020,12 +1312,110 @@ class MainWindow(QMainWindow):
         confirm = QMessageBox.question(self, "Confirmar", f"Excluir o usuário '{username_display}'?", QMessageBox.Yes | QMessageBox.No)
         if confirm != QMessageBox.Yes:
             return
-        try:
-            ok = self.auth_controller.delete_user(user_id)
+
+        def on_result(ok):
             if ok:
                 QMessageBox.information(self, "Ok", "Usuário excluído.")
                 self.load_users_list()
             else:
                 QMessageBox.warning(self, "Erro", "Usuário não encontrado ou não pôde ser excluído.")
-        except Exception as ex:
-            QMessageBox.critical(self, "Erro", f"Erro ao excluir usuário: {ex}")
+
+        self.runner.submit(
+            self.auth_controller.delete_user, user_id,
+            on_result=on_result,
+            on_error=lambda ex: QMessageBox.critical(self, "Erro", f"Erro ao excluir usuário: {ex}"),
+        )
+
+    # ---------------------------
+    # Painel (dashboard)
+    # ---------------------------
+    def _build_dashboard_page(self):
+        w = QWidget(); layout = QVBoxLayout(); w.setLayout(layout)
+
+        title = QLabel("Painel")
+        title.setObjectName("pageTitle")
+        layout.addWidget(title)
+
+        periodo = QHBoxLayout()
+        inicio, fim = self.dashboard_controller.periodo_do_mes()
+        self.d_desde = QDateEdit(QDate(inicio))
+        self.d_ate = QDateEdit(QDate(fim - datetime.timedelta(days=1)))
+        for de in (self.d_desde, self.d_ate):
+            de.setCalendarPopup(True)
+            de.setDisplayFormat("dd/MM/yyyy")
+        btn_refresh = QPushButton("Atualizar")
+        btn_refresh.clicked.connect(self.load_dashboard)
+        periodo.addWidget(QLabel("De:"))
+        periodo.addWidget(self.d_desde)
+        periodo.addWidget(QLabel("Até:"))
+        periodo.addWidget(self.d_ate)
+        periodo.addWidget(btn_refresh)
+        periodo.addStretch()
+        layout.addLayout(periodo)
+
+        self.lbl_dashboard_total = QLabel("")
+        layout.addWidget(self.lbl_dashboard_total)
+
+        tabelas = QHBoxLayout()
+        col = QVBoxLayout()
+        col.addWidget(QLabel("Faturamento por mecânico (período)"))
+        self.tbl_dash_mecanico = self._dashboard_table(["Mecânico", "OS", "Faturamento (R$)"])
+        col.addWidget(self.tbl_dash_mecanico)
+        tabelas.addLayout(col)
+
+        col = QVBoxLayout()
+        col.addWidget(QLabel("Ordens por status (todas)"))
+        self.tbl_dash_status = self._dashboard_table(["Status", "OS", "Valor (R$)"])
+        col.addWidget(self.tbl_dash_status)
+        tabelas.addLayout(col)
+        layout.addLayout(tabelas)
+        return w
+
+    @staticmethod
+    def _dashboard_table(headers):
+        t = QTableWidget(0, len(headers))
+        t.setHorizontalHeaderLabels(headers)
+        t.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        t.verticalHeader().setVisible(False)
+        t.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        return t
+
+    def load_dashboard(self):
+        desde = self.d_desde.date().toPython()
+        ate = self.d_ate.date().toPython() + datetime.timedelta(days=1)
+        self.runner.submit(
+            self._fetch_dashboard, desde, ate,
+            on_result=self._fill_dashboard,
+            on_error=lambda ex: QMessageBox.warning(self, "Aviso", f"Erro ao carregar o painel: {ex}"),
+            key="painel",
+        )
+
+    def _fetch_dashboard(self, desde, ate):
+        # roda no pool: as duas consultas leem só a tabela de resumo
+        return (
+            self.dashboard_controller.faturamento_por_mecanico(desde, ate),
+            self.dashboard_controller.totais_por_status(),
+        )
+
+    def _fill_dashboard(self, dados):
+        por_mecanico, por_status = dados
+        self._fill_dashboard_table(self.tbl_dash_mecanico, [
+            (r["mecanico"] or "(sem mecânico)", r["quantidade"], r["total_centavos"])
+            for r in por_mecanico
+        ])
+        self._fill_dashboard_table(self.tbl_dash_status, [
+            (r["status"], r["quantidade"], r["total_centavos"]) for r in por_status
+        ])
+        qtd = sum(r["quantidade"] for r in por_mecanico)
+        total = sum(r["total_centavos"] for r in por_mecanico)
+        self.lbl_dashboard_total.setText(f"{qtd} ordens abertas no período — R$ {total / 100:.2f}")
+
+    @staticmethod
+    def _fill_dashboard_table(table, linhas):
+        table.setRowCount(len(linhas))
+        for row, (nome, qtd, centavos) in enumerate(linhas):
+            for col, v in enumerate((nome, str(qtd), f"{centavos / 100:.2f}")):
+                item = QTableWidgetItem(v)
+                if col:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, col, item)
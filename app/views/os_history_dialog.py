@@ -1,10 +1,11 @@
 # views/os_history_dialog.py
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QTableWidget,
-    QTableWidgetItem, QPushButton, QHBoxLayout
+    QDialog, QVBoxLayout, QLabel, QTableView, QHeaderView,
+    QAbstractItemView, QPushButton, QHBoxLayout, QMessageBox, QCheckBox
 )
 from controllers.os_controller import OSController
-import datetime
+from views.table_models import HistoricoTableModel
+from views.workers import TaskRunner
 
 class OSHistoryDialog(QDialog):
     def __init__(self, ordem_id: int, parent=None):
@@ -12,6 +13,7 @@ class OSHistoryDialog(QDialog):
         self.setWindowTitle(f"Histórico da OS #{ordem_id}")
         self.ordem_id = ordem_id
         self.ctrl = OSController()
+        self.runner = TaskRunner(self)
         self._setup_ui()
         self._load_data()
 
@@ -21,52 +23,46 @@ class OSHistoryDialog(QDialog):
 
         layout.addWidget(QLabel(f"<h3>Histórico da Ordem {self.ordem_id}</h3>"))
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels([
-            "Data/Hora", "Usuário", "Ação", "Status",
-            "Prioridade", "Mecânico", "Valor (R$)", "Descrição"
-        ])
+        # páginas buscadas ao rolar; só as células visíveis são formatadas
+        self.model = HistoricoTableModel(runner=self.runner, parent=self)
+        self.model.load_failed.connect(
+            lambda ex: QMessageBox.critical(self, "Erro", f"Erro ao carregar histórico: {ex}")
+        )
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
         layout.addWidget(self.table)
 
+        self.lbl_busy = QLabel("Carregando...")
+        self.lbl_busy.hide()
+        self.runner.busy_changed.connect(self.lbl_busy.setVisible)
+        layout.addWidget(self.lbl_busy)
+
         h = QHBoxLayout()
+        # entradas antigas movidas pela retenção só são lidas quando pedidas
+        self.chk_arquivo = QCheckBox("Incluir histórico arquivado")
+        self.chk_arquivo.toggled.connect(self._load_data)
+        h.addWidget(self.chk_arquivo)
         btn_close = QPushButton("Fechar")
         btn_close.clicked.connect(self.accept)
         h.addStretch()
         h.addWidget(btn_close)
         layout.addLayout(h)
 
-    def _load_data(self):
-        historicos = self.ctrl.listar_historico_os(self.ordem_id)
-        self.table.setRowCount(len(historicos))
+    def done(self, result):
+        self.runner.cancel_all()
+        super().done(result)
 
-        for row, h in enumerate(historicos):
-            # data/hora
-            dt = getattr(h, "data", None)
-            if isinstance(dt, datetime.datetime):
-                dt_str = dt.strftime("%Y-%m-%d %H:%M")
-            else:
-                dt_str = str(dt or "")
-            usuario = getattr(h, "usuario", "") or ""
-            acao = getattr(h, "acao", "") or ""
-            status = getattr(h, "status", "") or ""
-            prioridade = getattr(h, "prioridade", "") or ""
-            mecanico = getattr(h, "mecanico", "") or ""
-            valor = getattr(h, "valor", 0.0) or 0.0
-            descricao = getattr(h, "descricao", "") or ""
+    def _load_data(self):
+        incluir_arquivo = self.chk_arquivo.isChecked()
 
-            values = [
-                dt_str,
-                usuario,
-                acao,
-                status,
-                prioridade,
-                mecanico,
-                f"{float(valor):.2f}",
-                descricao
-            ]
-            for col, v in enumerate(values):
-                item = QTableWidgetItem(str(v))
-                self.table.setItem(row, col, item)
+        def fetcher(after, limit):
+            return self.ctrl.listar_historico_os(
+                self.ordem_id, after=after, limit=limit, incluir_arquivo=incluir_arquivo,
+            )
 
-        self.table.resizeColumnsToContents()
+        self.model.set_fetcher(fetcher, self.ctrl.chave_pagina_historico)
@@ -0,0 +1,107 @@
+# app/views/pickers.py
+"""
+Campo de texto com autocompletar para escolher um registro (cliente,
+veículo) sem carregar a tabela inteira em um QComboBox.
+
+A cada pausa na digitação, o termo vai para uma função de busca do
+controller (ex.: OSController.buscar_clientes), que roda no TaskRunner e
+devolve no máximo algumas dezenas de linhas; o QCompleter só exibe essas
+linhas, sem filtrar de novo (acentos e prefixos já foram tratados no banco).
+"""
+from PySide6.QtCore import QModelIndex, QStringListModel, QTimer, Signal
+from PySide6.QtWidgets import QCompleter, QLineEdit
+
+
+class SeletorBusca(QLineEdit):
+    # linha escolhida (como devolvida pela busca) ou None quando a escolha é desfeita
+    escolhido = Signal(object)
+
+    # pausa na digitação antes de consultar o banco
+    ATRASO_MS = 200
+    LIMITE = 20
+
+    def __init__(self, buscar, formatar, runner, parent=None):
+        """
+        buscar(termo, limit=..., **filtros) -> linhas com `id`; roda fora da thread da interface.
+        formatar(linha) -> texto exibido na lista e no campo depois da escolha.
+        """
+        super().__init__(parent)
+        self._buscar = buscar
+        self._formatar = formatar
+        self._runner = runner
+        self._chave = ("seletor", id(self))
+        self._linhas = []
+        self._atual = None
+        # argumentos extras da busca (ex.: {"cliente_id": 3} no seletor de veículos)
+        self.filtros = {}
+
+        self._model = QStringListModel(self)
+        self._completer = QCompleter(self._model, self)
+        self._completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self._completer.setMaxVisibleItems(12)
+        self._completer.setWidget(self)
+        self._completer.activated[QModelIndex].connect(self._on_activated)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.ATRASO_MS)
+        self._timer.timeout.connect(self.atualizar)
+        self.textEdited.connect(self._on_text_edited)
+
+    def current_id(self):
+        return None if self._atual is None else self._atual.id
+
+    def linha_atual(self):
+        return self._atual
+
+    def definir(self, linha):
+        """Escolhe `linha` por código (ex.: o dono do veículo escolhido)."""
+        self._timer.stop()
+        self._runner.cancel(self._chave)
+        self._atual = linha
+        self.setText("" if linha is None else self._formatar(linha))
+        self._completer.popup().hide()
+        self.escolhido.emit(linha)
+
+    def limpar(self):
+        if self._atual is not None or self.text():
+            self.definir(None)
+
+    def atualizar(self):
+        """Consulta o termo atual; sem termo (e sem filtros), só esconde a lista."""
+        termo = self.text().strip()
+        if not termo and not self.filtros:
+            self._runner.cancel(self._chave)
+            self._preencher([])
+            return
+        self._runner.submit(
+            self._buscar, termo, limit=self.LIMITE, **self.filtros,
+            on_result=self._preencher,
+            key=self._chave,
+        )
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        # seletor restrito (ex.: veículos de um cliente): mostra as opções já ao entrar
+        if self.filtros and self._atual is None and not self.text():
+            self.atualizar()
+
+    def _on_text_edited(self, _texto):
+        if self._atual is not None:
+            self._atual = None
+            self.escolhido.emit(None)
+        self._timer.start()
+
+    def _preencher(self, linhas):
+        self._linhas = list(linhas)
+        self._model.setStringList([self._formatar(l) for l in self._linhas])
+        if self._linhas and self.hasFocus():
+            self._completer.complete()
+        else:
+            self._completer.popup().hide()
+
+    def _on_activated(self, index):
+        # o índice vem do model do popup (o próprio self._model, sem filtro)
+        row = index.row()
+        if 0 <= row < len(self._linhas):
+            self.definir(self._linhas[row])
@@ -0,0 +1,475 @@
+# app/views/table_models.py
+"""
+Models das tabelas (QTableView) com paginação sob demanda: a view pede mais
+linhas (fetchMore) ao rolar até o fim. Na grade de OS, os textos das
+células são formatados uma vez, quando as linhas chegam, e guardados por
+coluna; no histórico, só quando a célula é exibida.
+"""
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QColor, QFont
+import bisect
+import datetime
+import itertools
+import sys
+
+# papéis como int: no PySide6 cada acesso a Qt.DisplayRole (enum) custa
+# microssegundos, o que pesa em data(), chamado a cada célula pintada
+_DISPLAY_ROLE = int(Qt.DisplayRole)
+_USER_ROLE = int(Qt.UserRole)
+_TOOLTIP_ROLE = int(Qt.ToolTipRole)
+
+
+class OSTableModel(QAbstractTableModel):
+    """
+    As linhas recebidas não são guardadas: cada campo vira uma coluna
+    (lista de valores) e os textos exibidos são formatados uma vez, na carga.
+    data() é só uma consulta por índice, barata mesmo rolando 100 mil linhas.
+    """
+    COLUMNS = [
+        ("ID", "id"),
+        ("Código", "codigo"),
+        ("Descrição", "descricao"),
+        ("Status", "status"),
+        ("Prioridade", "prioridade"),
+        ("Cliente", "cliente_nome"),
+        ("Veículo", "veiculo_placa"),
+        ("Mecânico", "mecanico"),
+        ("Valor (R$)", "valor"),
+        ("Aberta Em", "aberta_em"),
+    ]
+
+    # poucos valores distintos: cada um vira uma única str (sys.intern)
+    INTERNED = ("status", "prioridade", "mecanico")
+
+    # colunas cujo texto pode ser cortado na view: o texto inteiro vai na dica
+    TOOLTIP_COLUMNS = ("descricao",)
+
+    # linhas buscadas por vez quando a view rola até o fim
+    PAGE_SIZE = 200
+
+    # erro ao buscar uma página em segundo plano
+    load_failed = Signal(object)
+    # clique no cabeçalho: (chave da coluna, decrescente). Com paginação
+    # ativa, quem montou o fetcher recarrega com o novo ORDER BY
+    sort_requested = Signal(str, bool)
+
+    def __init__(self, rows=None, parent=None, runner=None):
+        super().__init__(parent)
+        self._fields = []                               # campos das linhas recebidas
+        self._cols = {}                                 # campo -> valores, um por linha
+        self._display = [[] for _ in self.COLUMNS]      # textos exibidos, por coluna
+        self._count = 0
+        # fetcher(after, limit) -> lista de linhas; None = model estático
+        self._fetcher = None
+        self._key_func = None
+        self._after = None      # key_func da última linha carregada
+        self._exhausted = True
+        # com runner, as páginas são buscadas fora da thread da interface
+        self._runner = runner
+        self._loading = False
+        self._generation = 0
+        if rows:
+            self._reset_to(self._columnar(rows))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=_DISPLAY_ROLE):
+        if role != _DISPLAY_ROLE:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return section + 1
+
+    def data(self, index, role=_DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE:
+            return self._display[index.column()][index.row()] if index.isValid() else None
+        if role == _USER_ROLE:
+            return self.get_item(index.row())
+        if role == _TOOLTIP_ROLE and self.COLUMNS[index.column()][1] in self.TOOLTIP_COLUMNS:
+            return self._display[index.column()][index.row()] or None
+        return None
+
+    def get_item(self, row_idx):
+        """A linha `row_idx` como dict (campo -> valor), montado na hora."""
+        if 0 <= row_idx < self._count:
+            return {f: self._cols[f][row_idx] for f in self._fields}
+        return None
+
+    # ---------------------------
+    # Armazenamento colunar
+    # ---------------------------
+    @staticmethod
+    def _field_names(item) -> list:
+        if isinstance(item, dict):
+            return list(item)
+        if hasattr(item, "_fields"):          # namedtuples e models/linhas.py
+            return list(item._fields)
+        return [k for k in vars(item) if not k.startswith("_")]
+
+    def _columnar(self, rows) -> tuple:
+        """(campos, colunas de valores, colunas de texto) de `rows`, formatados uma vez."""
+        if not rows:
+            return self._fields, {f: [] for f in self._fields}, [[] for _ in self.COLUMNS]
+        fields = self._field_names(rows[0])
+        if isinstance(rows[0], dict):
+            get = dict.get
+        else:
+            def get(item, attr):
+                return getattr(item, attr, None)
+
+        cols = {}
+        for f in fields:
+            values = list(map(get, rows, itertools.repeat(f)))
+            if f in self.INTERNED:
+                values = [sys.intern(v) if type(v) is str else v for v in values]
+            cols[f] = values
+        display = []
+        for _, attr in self.COLUMNS:
+            # colunas calculadas (ex.: a propriedade `valor`) vêm direto da linha
+            values = cols[attr] if attr in cols else list(map(get, rows, itertools.repeat(attr)))
+            display.append(self._display_column(values))
+        return fields, cols, display
+
+    def _display_column(self, values) -> list:
+        """Coluna de `_display` para os valores de uma coluna exibida: já os textos."""
+        return _format_column(values)
+
+    def _reset_to(self, columnar):
+        self._fields, self._cols, self._display = columnar
+        self._count = len(next(iter(self._display), []))
+
+    def _insert_from(self, first, columnar, start, stop):
+        """Insere as linhas [start, stop) de `columnar` na posição `first`."""
+        _, cols, display = columnar
+        for f in self._fields:
+            self._cols[f][first:first] = cols[f][start:stop]
+        for mine, theirs in zip(self._display, display):
+            mine[first:first] = theirs[start:stop]
+        self._count += stop - start
+
+    def _remove(self, first, last):
+        for values in self._cols.values():
+            del values[first:last + 1]
+        for values in self._display:
+            del values[first:last + 1]
+        self._count -= last - first + 1
+
+    def _values(self, cols, n) -> tuple:
+        return tuple(cols[f][n] for f in self._fields)
+
+    def set_rows(self, rows):
+        """
+        Substitui o conteúdo por uma lista fixa (sem paginação). As linhas
+        são comparadas por id com as atuais e só as diferenças são
+        sinalizadas à view, preservando seleção e rolagem.
+        """
+        if self._fetcher is not None:
+            # descarta páginas ainda em voo da carga paginada
+            self._fetcher = None
+            self._generation += 1
+        self._exhausted = True
+        self._loading = False
+        self._apply_rows(rows or [])
+
+    def _apply_rows(self, new_rows):
+        """
+        Leva o conteúdo até `new_rows` com o mínimo de sinais: remoções,
+        inserções e dataChanged só nas linhas que mudaram. As linhas que
+        formam a maior subsequência já na ordem nova ficam no lugar; as
+        demais que mudaram de posição são removidas e reinseridas.
+        """
+        new = self._columnar(new_rows)
+        fields, new_cols, new_display = new
+        new_ids = new_cols.get("id", [None] * len(new_rows))
+        new_pos = {row_id: n for n, row_id in enumerate(new_ids)}
+        if (None in new_pos or len(new_pos) != len(new_ids)
+                or (self._count and fields != self._fields)):
+            # sem id único (ou com outros campos) não há como casar as linhas
+            self.beginResetModel()
+            self._reset_to(new)
+            self.endResetModel()
+            return
+        if not self._count:
+            self._fields = fields
+            self._cols = {f: [] for f in fields}
+
+        old_ids = list(self._cols.get("id", []))
+        kept = _longest_increasing([(o, new_pos[i]) for o, i in enumerate(old_ids) if i in new_pos])
+
+        # 1) remoções (de baixo para cima, para os índices não andarem)
+        removed = [o for o in range(len(old_ids)) if o not in kept]
+        for first, last in reversed(_ranges(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._remove(first, last)
+            self.endRemoveRows()
+
+        # 2) inserções (de cima para baixo: tudo antes de `first` já está no lugar)
+        kept_new = {new_pos[old_ids[o]] for o in kept}
+        for first, last in _ranges([n for n in range(len(new_ids)) if n not in kept_new]):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._insert_from(first, new, first, last + 1)
+            self.endInsertRows()
+
+        # 3) linhas mantidas cujo conteúdo mudou
+        changed = []
+        for n in sorted(kept_new):
+            if self._values(self._cols, n) != self._values(new_cols, n):
+                changed.append(n)
+                for f in self._fields:
+                    self._cols[f][n] = new_cols[f][n]
+                for mine, theirs in zip(self._display, new_display):
+                    mine[n] = theirs[n]
+        last_col = len(self.COLUMNS) - 1
+        for first, last in _ranges(changed):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_col))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        attr = self.COLUMNS[column][1]
+        desc = order == Qt.DescendingOrder
+        self.sort_requested.emit(attr, desc)
+        if self._fetcher is not None:
+            # a ordenação é feita no banco (ORDER BY)
+            return
+
+        # resultado fixo (ex.: busca): ordena em memória, permutando as colunas
+        values = self._cols.get(attr, self._display[column])
+        order_idx = sorted(range(self._count), key=lambda n: "" if values[n] is None else values[n],
+                           reverse=desc)
+        self.beginResetModel()
+        self._cols = {f: [v[n] for n in order_idx] for f, v in self._cols.items()}
+        self._display = [[v[n] for n in order_idx] for v in self._display]
+        self.endResetModel()
+
+    # ---------------------------
+    # Paginação sob demanda
+    # ---------------------------
+    def set_fetcher(self, fetcher, key_func):
+        """
+        Passa a carregar as linhas em páginas: `fetcher(after, limit)` devolve
+        a próxima página e `key_func(linha)` a chave usada em `after`.
+        Só a primeira página é buscada aqui; as demais vêm via fetchMore.
+        """
+        self.beginResetModel()
+        self._reset_to(([], {}, [[] for _ in self.COLUMNS]))
+        self._fetcher = fetcher
+        self._key_func = key_func
+        self._after = None
+        self._exhausted = False
+        self._loading = False
+        self._generation += 1
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    @property
+    def paged(self) -> bool:
+        return self._fetcher is not None
+
+    def refresh(self):
+        """
+        Rebusca (em uma consulta) as linhas já carregadas no modo paginado e
+        aplica só as diferenças, sem reset: seleção e rolagem são mantidas.
+        """
+        if self._fetcher is None:
+            return
+        limit = max(self._count, self.PAGE_SIZE)
+        # uma página em voo já não casa com o que vai ficar na tela
+        self._generation += 1
+        generation = self._generation
+
+        def apply(rows):
+            if generation != self._generation:
+                return
+            self._loading = False
+            self._exhausted = len(rows) < limit
+            self._after = self._key_func(rows[-1]) if rows else None
+            self._apply_rows(rows)
+
+        def on_error(ex):
+            if generation == self._generation:
+                self._loading = False
+                self.load_failed.emit(ex)
+
+        if self._runner is None:
+            apply(self._fetcher(None, limit))
+            return
+        self._loading = True
+        self._runner.submit(self._fetcher, None, limit,
+                            on_result=apply, on_error=on_error,
+                            key=("os_page", id(self)))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._fetcher is not None and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        after = self._after if self._count else None
+        if self._runner is None:
+            self._append_page(self._fetcher(after, self.PAGE_SIZE))
+            return
+
+        # páginas de uma carga anterior (antes de um reset) são descartadas
+        generation = self._generation
+
+        def on_result(page):
+            if generation == self._generation:
+                self._loading = False
+                self._append_page(page)
+
+        def on_error(ex):
+            if generation == self._generation:
+                self._loading = False
+                self._exhausted = True
+                self.load_failed.emit(ex)
+
+        self._loading = True
+        self._runner.submit(self._fetcher, after, self.PAGE_SIZE,
+                            on_result=on_result, on_error=on_error,
+                            key=("os_page", id(self)))
+
+    def _append_page(self, page):
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+        new = self._columnar(page)
+        first = self._count
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        if not first:
+            self._fields = new[0]
+            self._cols = {f: [] for f in new[0]}
+        self._insert_from(first, new, 0, len(page))
+        self.endInsertRows()
+        self._after = self._key_func(page[-1])
+
+
+def _format_column(values) -> list:
+    """Textos de uma coluna; colunas de texto (a maioria) só trocam None por ""."""
+    if all(type(v) is str for v in values):
+        return values[:]
+    return [v if type(v) is str else _format(v) for v in values]
+
+
+def _format(val) -> str:
+    """Texto exibido de um valor (feito uma vez por célula)."""
+    if val is None:
+        return ""
+    if type(val) is str:
+        return val
+    if isinstance(val, datetime.datetime):
+        # "AAAA-MM-DD HH:MM"; bem mais rápido que strftime em muitas linhas
+        return val.isoformat(" ", "minutes")[:16]
+    if isinstance(val, float):
+        return f"{val:.2f}"
+    return str(val)
+
+
+def _ranges(indices):
+    """[1, 2, 3, 7, 8] -> [(1, 3), (7, 8)] (índices em ordem crescente)."""
+    ranges = []
+    for i in indices:
+        if ranges and ranges[-1][1] == i - 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return [tuple(r) for r in ranges]
+
+
+def _longest_increasing(pairs):
+    """
+    Dos pares (índice antigo, posição nova), devolve o conjunto de índices
+    antigos da maior subsequência com posição nova crescente (O(n log n)).
+    """
+    tails = []      # tails[k]: fim (índice em pairs) da melhor sequência de tamanho k+1
+    tail_pos = []   # posição nova de cada tails[k], para a busca binária
+    prev = [-1] * len(pairs)
+    for i, (_, pos) in enumerate(pairs):
+        k = bisect.bisect_left(tail_pos, pos)
+        if k > 0:
+            prev[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_pos.append(pos)
+        else:
+            tails[k] = i
+            tail_pos[k] = pos
+    kept = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        kept.add(pairs[i][0])
+        i = prev[i]
+    return kept
+
+
+class HistoricoTableModel(OSTableModel):
+    """
+    Entradas de listar_historico_os (fotos já remontadas), com os campos que
+    mudaram em cada uma destacados e o valor anterior na dica.
+
+    Ao contrário da grade de OS, `_display` guarda os valores crus: cada
+    célula é formatada em data() na primeira vez que aparece, e o texto
+    substitui o valor.
+    """
+    COLUMNS = [
+        ("Data/Hora", "data"),
+        ("Usuário", "usuario"),
+        ("Ação", "acao"),
+        ("Status", "status"),
+        ("Prioridade", "prioridade"),
+        ("Mecânico", "mecanico"),
+        ("Valor (R$)", "valor"),
+        ("Descrição", "descricao"),
+    ]
+
+    PAGE_SIZE = 100
+
+    # coluna exibida -> campo em `alteracoes`, quando diferem
+    CAMPOS_ALTERACAO = {"valor": "valor_centavos"}
+
+    _DESTAQUE = QColor("#facc15")
+
+    _FOREGROUND_ROLE = int(Qt.ForegroundRole)
+    _FONT_ROLE = int(Qt.FontRole)
+    _DESTAQUE_ROLES = (_FOREGROUND_ROLE, _FONT_ROLE, int(Qt.ToolTipRole))
+
+    def _display_column(self, values) -> list:
+        return list(values)
+
+    def data(self, index, role=_DISPLAY_ROLE):
+        if role == _DISPLAY_ROLE:
+            if not index.isValid():
+                return None
+            column = self._display[index.column()]
+            text = column[index.row()]
+            if type(text) is not str:
+                text = column[index.row()] = _format(text)
+            return text
+        if role not in self._DESTAQUE_ROLES:
+            return super().data(index, role)
+        if not index.isValid():
+            return None
+        row = index.row()
+        attr = self.COLUMNS[index.column()][1]
+        campo = self.CAMPOS_ALTERACAO.get(attr, attr)
+        alteracoes = self._cols["alteracoes"][row] or {}
+        if self._cols["acao"][row] == "CRIACAO" or campo not in alteracoes:
+            return None
+
+        if role == self._FOREGROUND_ROLE:
+            return self._DESTAQUE
+        if role == self._FONT_ROLE:
+            font = QFont()
+            font.setBold(True)
+            return font
+        antigo = alteracoes[campo][0]
+        if campo == "valor_centavos" and antigo is not None:
+            antigo = f"{antigo / 100:.2f}"
+        return f"Antes: {'' if antigo is None else antigo}"
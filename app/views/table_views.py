@@ -0,0 +1,111 @@
+# app/views/table_views.py
+"""
+QTableView da grade de OS com um modo para muitas linhas.
+
+Até LIMIAR_LINHAS linhas, as colunas se ajustam ao conteúdo
+(ResizeToContents). Acima disso, o Qt mediria todas as linhas a cada reset
+ou página nova, então a view passa ao modo de tabela grande:
+  - linhas de altura fixa, sem quebra de texto;
+  - colunas com as larguras salvas pelo usuário ou, na falta delas, medidas
+    em uma amostra de linhas;
+  - textos longos (descrição) cortados com "…" (o texto inteiro fica na dica).
+O modo volta ao normal quando uma nova carga fica abaixo da metade do limiar.
+"""
+from PySide6.QtCore import QSettings, Qt
+from PySide6.QtWidgets import QHeaderView, QTableView
+
+
+def _settings() -> QSettings:
+    return QSettings("AutoManager", "AutoManager")
+
+
+class OSTableView(QTableView):
+    # acima disso, modo de tabela grande
+    LIMIAR_LINHAS = 1000
+    # linhas medidas para calcular as larguras
+    AMOSTRA = 200
+    LARGURA_MAX = 360
+    MARGEM = 24
+
+    def __init__(self, chave_config: str = "os_grade", parent=None):
+        super().__init__(parent)
+        # larguras ajustadas pelo usuário no modo grande ficam em QSettings
+        self._chave = f"{chave_config}/larguras"
+        self._grande = False
+        self._aplicando = False
+        self.horizontalHeader().setStretchLastSection(True)
+        self.horizontalHeader().sectionResized.connect(self._on_section_resized)
+        self._modo_normal()
+
+    @property
+    def modo_grande(self) -> bool:
+        return self._grande
+
+    def setModel(self, model):
+        super().setModel(model)
+        for sinal in (model.modelReset, model.rowsInserted, model.rowsRemoved):
+            sinal.connect(self._atualizar_modo)
+        self._atualizar_modo()
+
+    def _atualizar_modo(self, *_):
+        n = self.model().rowCount()
+        if not self._grande and n > self.LIMIAR_LINHAS:
+            self._modo_grande()
+        elif self._grande and n <= self.LIMIAR_LINHAS // 2:
+            self._modo_normal()
+
+    def _modo_normal(self):
+        self._grande = False
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.setWordWrap(True)
+
+    def _modo_grande(self):
+        self._grande = True
+        larguras = self._larguras_salvas() or self._larguras_da_amostra()
+        header = self.horizontalHeader()
+        self._aplicando = True
+        try:
+            header.setSectionResizeMode(QHeaderView.Interactive)
+            for col, largura in enumerate(larguras):
+                header.resizeSection(col, largura)
+        finally:
+            self._aplicando = False
+        vertical = self.verticalHeader()
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(self.fontMetrics().height() + 8)
+        self.setWordWrap(False)
+        self.setTextElideMode(Qt.ElideRight)
+
+    def _larguras_salvas(self) -> list[int] | None:
+        valor = _settings().value(self._chave)
+        if not valor:
+            return None
+        try:
+            larguras = [int(v) for v in valor]
+        except (TypeError, ValueError):
+            return None
+        return larguras if len(larguras) == self.model().columnCount() else None
+
+    def _larguras_da_amostra(self) -> list[int]:
+        """Larguras pelo maior texto de até AMOSTRA linhas espaçadas e do título."""
+        model = self.model()
+        n = model.rowCount()
+        linhas = range(0, n, max(n // self.AMOSTRA, 1))
+        fm = self.fontMetrics()
+        fm_titulo = self.horizontalHeader().fontMetrics()
+        larguras = []
+        for col in range(model.columnCount()):
+            titulo = model.headerData(col, Qt.Horizontal) or ""
+            # espaço para a seta de ordenação no título
+            maior = fm_titulo.horizontalAdvance(titulo) + 16
+            for row in linhas:
+                maior = max(maior, fm.horizontalAdvance(model.data(model.index(row, col)) or ""))
+            larguras.append(min(maior + self.MARGEM, self.LARGURA_MAX))
+        return larguras
+
+    def _on_section_resized(self, *_):
+        if not self._grande or self._aplicando:
+            return
+        header = self.horizontalHeader()
+        _settings().setValue(self._chave, [header.sectionSize(c) for c in range(header.count())])
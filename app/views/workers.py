@@ -0,0 +1,172 @@
+# app/views/workers.py
+"""
+Execução de chamadas aos controllers fora da thread da interface.
+
+Cada tarefa roda em uma thread do QThreadPool global. Os controllers já abrem
+uma Session própria por chamada (`with get_session()`), então cada tarefa usa
+sessões exclusivas e nada do SQLAlchemy é compartilhado entre threads.
+Resultados, erros e progresso voltam para a thread da interface via sinais.
+"""
+import inspect
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class TaskSignals(QObject):
+    """
+    Ponte entre a thread de trabalho e a da interface.
+
+    É criado na thread da interface; como os sinais estão conectados a slots
+    deste próprio objeto, o Qt entrega as emissões (feitas na thread de
+    trabalho) de forma enfileirada, e os callbacks rodam na thread da GUI.
+    """
+    _result = Signal(object)
+    _error = Signal(object)
+    _progress = Signal(int, int)
+    _finished = Signal()
+
+    def __init__(self, task, on_result=None, on_error=None,
+                 on_progress=None, on_finished=None):
+        super().__init__()
+        self._task = task
+        self._on_result = on_result
+        self._on_error = on_error
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._result.connect(self._deliver_result)
+        self._error.connect(self._deliver_error)
+        self._progress.connect(self._deliver_progress)
+        self._finished.connect(self._deliver_finished)
+
+    @Slot(object)
+    def _deliver_result(self, value):
+        if self._on_result and not self._task.is_cancelled:
+            self._on_result(value)
+
+    @Slot(object)
+    def _deliver_error(self, ex):
+        if self._on_error and not self._task.is_cancelled:
+            self._on_error(ex)
+
+    @Slot(int, int)
+    def _deliver_progress(self, done, total):
+        if self._on_progress and not self._task.is_cancelled:
+            self._on_progress(done, total)
+
+    @Slot()
+    def _deliver_finished(self):
+        # sempre entregue, mesmo se cancelada: o runner precisa dar baixa
+        if self._on_finished:
+            self._on_finished()
+
+
+class Task(QRunnable):
+    """
+    Executa `fn(*args, **kwargs)` em uma thread do pool.
+
+    Se `fn` aceitar os parâmetros `progress_cb` e/ou `is_cancelled`, eles são
+    injetados: `progress_cb(feitos, total)` emite progresso e `is_cancelled()`
+    permite que trabalhos longos parem cedo quando a tarefa for cancelada.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self._cancelled = False
+        self.signals = None  # definido pelo TaskRunner
+
+        try:
+            params = inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            params = {}
+        if "progress_cb" in params:
+            self.kwargs.setdefault("progress_cb", self._emit_progress)
+        if "is_cancelled" in params:
+            self.kwargs.setdefault("is_cancelled", lambda: self._cancelled)
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self):
+        """Descarta o resultado; se ainda não começou, nem chega a rodar."""
+        self._cancelled = True
+
+    def _emit_progress(self, done, total):
+        self.signals._progress.emit(int(done), int(total))
+
+    def run(self):
+        try:
+            if self._cancelled:
+                return
+            try:
+                value = self.fn(*self.args, **self.kwargs)
+            except Exception as ex:
+                self.signals._error.emit(ex)
+            else:
+                self.signals._result.emit(value)
+        finally:
+            self.signals._finished.emit()
+
+
+class TaskRunner(QObject):
+    """
+    Despacha tarefas para o QThreadPool e mantém o estado "ocupado" da view.
+
+    `busy_changed(bool)` é emitido quando a primeira tarefa começa e quando a
+    última termina, para a view exibir/ocultar seu indicador de carregamento.
+    Tarefas submetidas com o mesmo `key` se substituem: a anterior é cancelada
+    (útil para recargas de lista disparadas em sequência).
+    """
+    busy_changed = Signal(bool)
+
+    def __init__(self, parent=None, pool: QThreadPool | None = None):
+        super().__init__(parent)
+        self._pool = pool or QThreadPool.globalInstance()
+        self._active = set()
+        self._keyed = {}
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._active)
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None,
+               on_finished=None, key=None, **kwargs) -> Task:
+        task = Task(fn, *args, **kwargs)
+        task.setAutoDelete(False)
+
+        def finished():
+            self._active.discard(task)
+            if key is not None and self._keyed.get(key) is task:
+                del self._keyed[key]
+            if on_finished and not task.is_cancelled:
+                on_finished()
+            if not self._active:
+                self.busy_changed.emit(False)
+
+        task.signals = TaskSignals(task, on_result=on_result, on_error=on_error,
+                                   on_progress=on_progress, on_finished=finished)
+
+        if key is not None:
+            previous = self._keyed.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._keyed[key] = task
+
+        was_idle = not self._active
+        self._active.add(task)
+        if was_idle:
+            self.busy_changed.emit(True)
+        self._pool.start(task)
+        return task
+
+    def cancel(self, key):
+        task = self._keyed.get(key)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self):
+        for task in list(self._active):
+            task.cancel()